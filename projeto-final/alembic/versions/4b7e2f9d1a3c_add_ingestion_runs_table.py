@@ -0,0 +1,103 @@
+"""add_ingestion_runs_table
+
+Revision ID: 4b7e2f9d1a3c
+Revises: c8d1025aa756
+Create Date: 2026-10-17 20:05:12.418230
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4b7e2f9d1a3c"
+down_revision: Union[str, Sequence[str], None] = "c8d1025aa756"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Creates the ingestion_runs ledger table."""
+    op.create_table(
+        "ingestion_runs",
+        sa.Column(
+            "id",
+            UUID(as_uuid=True),
+            primary_key=True,
+            server_default=sa.text("gen_random_uuid()"),
+            nullable=False,
+            comment="Unique UUID identifier for the ingestion run",
+        ),
+        sa.Column(
+            "sha256",
+            sa.String(length=64),
+            nullable=False,
+            comment="SHA-256 of the ingested file content",
+        ),
+        sa.Column(
+            "file_kind",
+            sa.String(length=10),
+            nullable=False,
+            comment="Kind of ingested file (zip or csv)",
+        ),
+        sa.Column(
+            "file_name",
+            sa.String(length=255),
+            nullable=False,
+            comment="Name of the ingested file",
+        ),
+        sa.Column(
+            "table_name",
+            sa.String(length=255),
+            nullable=True,
+            comment="Target table of a CSV file (empty for ZIP files)",
+        ),
+        sa.Column(
+            "row_count",
+            sa.Integer,
+            nullable=True,
+            comment="Number of rows read from the file",
+        ),
+        sa.Column(
+            "inserted_count",
+            sa.Integer,
+            nullable=True,
+            comment="Number of rows inserted",
+        ),
+        sa.Column(
+            "skipped_count",
+            sa.Integer,
+            nullable=True,
+            comment="Number of rows skipped as duplicates",
+        ),
+        sa.Column(
+            "status",
+            sa.String(length=20),
+            nullable=False,
+            comment="Status of the last ingestion run",
+        ),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+            comment="Timestamp when the record was created",
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+            comment="Timestamp when the record was last updated",
+        ),
+        sa.UniqueConstraint("sha256", name="uq_ingestion_run_sha256"),
+    )
+
+
+def downgrade() -> None:
+    """Drops the ingestion_runs table."""
+    op.drop_table("ingestion_runs")
@@ -0,0 +1,129 @@
+"""add_analytical_indexes
+
+Revision ID: 7d3a9c5e2b14
+Revises: 4b7e2f9d1a3c
+Create Date: 2026-10-17 20:25:41.902113
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7d3a9c5e2b14"
+down_revision: Union[str, Sequence[str], None] = "4b7e2f9d1a3c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Creates the indexes used by the dashboard filters, group-bys and joins."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        _drop_invalid_index("ix_invoices_issue_date_brin", "invoices")
+        op.create_index(
+            "ix_invoices_issue_date_brin",
+            "invoices",
+            ["issue_date"],
+            postgresql_using="brin",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        _drop_invalid_index("ix_invoices_emitter_uf_issue_date", "invoices")
+        op.create_index(
+            "ix_invoices_emitter_uf_issue_date",
+            "invoices",
+            ["emitter_uf", "issue_date"],
+            postgresql_include=["total_invoice_value"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        _drop_invalid_index("ix_invoice_items_issue_date_brin", "invoice_items")
+        op.create_index(
+            "ix_invoice_items_issue_date_brin",
+            "invoice_items",
+            ["issue_date"],
+            postgresql_using="brin",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        _drop_invalid_index("ix_invoice_items_emitter_uf_issue_date", "invoice_items")
+        op.create_index(
+            "ix_invoice_items_emitter_uf_issue_date",
+            "invoice_items",
+            ["emitter_uf", "issue_date"],
+            postgresql_include=["quantity", "total_value"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        _drop_invalid_index("ix_invoice_items_ncm_sh_code_issue_date", "invoice_items")
+        op.create_index(
+            "ix_invoice_items_ncm_sh_code_issue_date",
+            "invoice_items",
+            ["ncm_sh_code", "issue_date"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        _drop_invalid_index("ix_invoice_items_cfop_issue_date", "invoice_items")
+        op.create_index(
+            "ix_invoice_items_cfop_issue_date",
+            "invoice_items",
+            ["cfop", "issue_date"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        _drop_invalid_index("ix_invoice_items_access_key_covering", "invoice_items")
+        op.create_index(
+            "ix_invoice_items_access_key_covering",
+            "invoice_items",
+            ["access_key"],
+            postgresql_include=["quantity", "total_value"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def _drop_invalid_index(index_name: str, table_name: str) -> None:
+    # An interrupted CREATE INDEX CONCURRENTLY leaves an INVALID index behind,
+    # which IF NOT EXISTS would keep, so it is dropped and built again.
+    is_invalid = (
+        op.get_bind()
+        .execute(
+            sa.text(
+                "SELECT NOT indisvalid FROM pg_index "
+                "WHERE indexrelid = to_regclass(:index_name)"
+            ),
+            {"index_name": index_name},
+        )
+        .scalar()
+    )
+    if is_invalid:
+        op.drop_index(
+            index_name,
+            table_name=table_name,
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Drops the analytical indexes."""
+    with op.get_context().autocommit_block():
+        for index_name, table_name in [
+            ("ix_invoice_items_access_key_covering", "invoice_items"),
+            ("ix_invoice_items_cfop_issue_date", "invoice_items"),
+            ("ix_invoice_items_ncm_sh_code_issue_date", "invoice_items"),
+            ("ix_invoice_items_emitter_uf_issue_date", "invoice_items"),
+            ("ix_invoice_items_issue_date_brin", "invoice_items"),
+            ("ix_invoices_emitter_uf_issue_date", "invoices"),
+            ("ix_invoices_issue_date_brin", "invoices"),
+        ]:
+            op.drop_index(
+                index_name,
+                table_name=table_name,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
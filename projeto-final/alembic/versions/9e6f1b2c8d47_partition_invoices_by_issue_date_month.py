@@ -0,0 +1,271 @@
+"""partition_invoices_by_issue_date_month
+
+Revision ID: 9e6f1b2c8d47
+Revises: 7d3a9c5e2b14
+Create Date: 2026-10-17 20:41:07.315924
+
+"""
+
+from typing import List, Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+from src.core.logging import logger
+
+# revision identifiers, used by Alembic.
+revision: str = "9e6f1b2c8d47"
+down_revision: Union[str, Sequence[str], None] = "7d3a9c5e2b14"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ANALYTICAL_INDEX_NAMES = [
+    "ix_invoices_issue_date_brin",
+    "ix_invoices_emitter_uf_issue_date",
+    "ix_invoice_items_issue_date_brin",
+    "ix_invoice_items_emitter_uf_issue_date",
+    "ix_invoice_items_ncm_sh_code_issue_date",
+    "ix_invoice_items_cfop_issue_date",
+    "ix_invoice_items_access_key_covering",
+]
+
+
+def get_column_names(table_name: str) -> List[str]:
+    return [
+        column["name"] for column in sa.inspect(op.get_bind()).get_columns(table_name)
+    ]
+
+
+def count_rows(query: str) -> int:
+    return op.get_bind().execute(sa.text(query)).scalar_one()
+
+
+def drop_constraints(table_name: str) -> None:
+    # Constraint and index names are unique per schema, so the renamed tables
+    # release them for the tables that replace them.
+    op.execute(
+        f"""
+        DO $$
+        DECLARE constraint_name text;
+        BEGIN
+            FOR constraint_name IN
+                SELECT conname FROM pg_catalog.pg_constraint
+                WHERE conrelid = '{table_name}'::regclass
+                ORDER BY contype <> 'f'
+            LOOP
+                EXECUTE format('ALTER TABLE {table_name} DROP CONSTRAINT %I', constraint_name);
+            END LOOP;
+        END $$;
+        """
+    )
+
+
+def create_month_partitions(table_name: str, source: str) -> None:
+    op.execute(
+        f"""
+        DO $$
+        DECLARE month_start date;
+        BEGIN
+            FOR month_start IN
+                SELECT DISTINCT CAST(date_trunc('month', issue_date) AS date)
+                FROM {source}
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE IF NOT EXISTS %I PARTITION OF {table_name} FOR VALUES FROM (%L) TO (%L)',
+                    '{table_name}_' || to_char(month_start, '"y"YYYY"m"MM'),
+                    month_start,
+                    CAST(month_start + interval '1 month' AS date)
+                );
+            END LOOP;
+        END $$;
+        """
+    )
+
+
+def create_analytical_indexes() -> None:
+    op.create_index(
+        "ix_invoices_issue_date_brin",
+        "invoices",
+        ["issue_date"],
+        postgresql_using="brin",
+    )
+    op.create_index(
+        "ix_invoices_emitter_uf_issue_date",
+        "invoices",
+        ["emitter_uf", "issue_date"],
+        postgresql_include=["total_invoice_value"],
+    )
+    op.create_index(
+        "ix_invoice_items_issue_date_brin",
+        "invoice_items",
+        ["issue_date"],
+        postgresql_using="brin",
+    )
+    op.create_index(
+        "ix_invoice_items_emitter_uf_issue_date",
+        "invoice_items",
+        ["emitter_uf", "issue_date"],
+        postgresql_include=["quantity", "total_value"],
+    )
+    op.create_index(
+        "ix_invoice_items_ncm_sh_code_issue_date",
+        "invoice_items",
+        ["ncm_sh_code", "issue_date"],
+    )
+    op.create_index(
+        "ix_invoice_items_cfop_issue_date",
+        "invoice_items",
+        ["cfop", "issue_date"],
+    )
+
+
+def upgrade() -> None:
+    """Replaces invoices and invoice_items with tables range-partitioned by issue_date month."""
+    # Items are copied under the issue date of their invoice, so an item without
+    # one could not be placed and the migration stops instead of dropping it.
+    orphan_item_count = count_rows(
+        "SELECT COUNT(*) FROM invoice_items AS s WHERE NOT EXISTS "
+        "(SELECT 1 FROM invoices AS p WHERE p.access_key = s.access_key)"
+    )
+    if orphan_item_count:
+        raise RuntimeError(
+            f"{orphan_item_count} invoice_items rows have no invoice with their "
+            "access_key. Remove or fix them before partitioning."
+        )
+    redated_item_count = count_rows(
+        "SELECT COUNT(*) FROM invoice_items AS s "
+        "JOIN invoices AS p ON p.access_key = s.access_key "
+        "WHERE s.issue_date IS DISTINCT FROM p.issue_date"
+    )
+    if redated_item_count:
+        logger.warning(
+            f"{redated_item_count} invoice_items rows take the issue_date of their "
+            "invoice, which differs from their own."
+        )
+
+    op.rename_table("invoice_items", "invoice_items_unpartitioned")
+    op.rename_table("invoices", "invoices_unpartitioned")
+    drop_constraints("invoice_items_unpartitioned")
+    drop_constraints("invoices_unpartitioned")
+    for index_name in ANALYTICAL_INDEX_NAMES:
+        op.execute(f"DROP INDEX IF EXISTS {index_name}")
+
+    for table_name in ["invoices", "invoice_items"]:
+        op.execute(
+            f"CREATE TABLE {table_name} "
+            f"(LIKE {table_name}_unpartitioned INCLUDING DEFAULTS INCLUDING COMMENTS) "
+            "PARTITION BY RANGE (issue_date)"
+        )
+    create_month_partitions(table_name="invoices", source="invoices_unpartitioned")
+    # Item partitions follow the months of the invoices the items are copied under.
+    create_month_partitions(
+        table_name="invoice_items",
+        source=(
+            "invoices_unpartitioned WHERE access_key IN "
+            "(SELECT access_key FROM invoice_items_unpartitioned)"
+        ),
+    )
+
+    op.execute("INSERT INTO invoices SELECT * FROM invoices_unpartitioned")
+    # Items take the issue date of their invoice, which the foreign key now covers.
+    item_column_names = get_column_names("invoice_items_unpartitioned")
+    op.execute(
+        f"INSERT INTO invoice_items ({', '.join(item_column_names)}) "
+        "SELECT "
+        + ", ".join(
+            "p.issue_date" if name == "issue_date" else f"s.{name}"
+            for name in item_column_names
+        )
+        + " FROM invoice_items_unpartitioned AS s "
+        "JOIN invoices AS p ON p.access_key = s.access_key"
+    )
+    # Constraints and indexes are built once the rows are loaded. The partition key
+    # must be part of every primary key and unique constraint, so invoice_items now
+    # references invoices through (access_key, issue_date).
+    op.create_primary_key("invoices_pkey", "invoices", ["id", "issue_date"])
+    op.create_unique_constraint(
+        "uq_invoice_access_key_issue_date", "invoices", ["access_key", "issue_date"]
+    )
+    op.create_primary_key("invoice_items_pkey", "invoice_items", ["id", "issue_date"])
+    op.create_unique_constraint(
+        "uq_invoice_item_access_key_product_number",
+        "invoice_items",
+        ["access_key", "product_number", "issue_date"],
+    )
+    op.create_foreign_key(
+        "invoice_items_access_key_issue_date_fkey",
+        "invoice_items",
+        "invoices",
+        ["access_key", "issue_date"],
+        ["access_key", "issue_date"],
+        ondelete="CASCADE",
+    )
+    create_analytical_indexes()
+    op.create_index(
+        "ix_invoice_items_access_key_covering",
+        "invoice_items",
+        ["access_key", "issue_date"],
+        postgresql_include=["quantity", "total_value"],
+    )
+
+    op.drop_table("invoice_items_unpartitioned")
+    op.drop_table("invoices_unpartitioned")
+    op.execute("ANALYZE invoices")
+    op.execute("ANALYZE invoice_items")
+
+
+def downgrade() -> None:
+    """Restores the unpartitioned invoices and invoice_items tables."""
+    # The unpartitioned tables key invoices by access_key alone, which an access_key
+    # loaded under several issue dates would violate.
+    duplicate_access_key_count = count_rows(
+        "SELECT COUNT(*) FROM (SELECT access_key FROM invoices "
+        "GROUP BY access_key HAVING COUNT(*) > 1) AS duplicates"
+    )
+    if duplicate_access_key_count:
+        raise RuntimeError(
+            f"{duplicate_access_key_count} access keys have invoices on more than one "
+            "issue_date. Keep one invoice per access key before downgrading."
+        )
+
+    op.rename_table("invoice_items", "invoice_items_partitioned")
+    op.rename_table("invoices", "invoices_partitioned")
+    drop_constraints("invoice_items_partitioned")
+    drop_constraints("invoices_partitioned")
+    op.execute("DROP INDEX IF EXISTS ix_invoice_items_access_key_covering")
+    for index_name in ANALYTICAL_INDEX_NAMES:
+        op.execute(f"DROP INDEX IF EXISTS {index_name}")
+
+    for table_name in ["invoices", "invoice_items"]:
+        op.execute(
+            f"CREATE TABLE {table_name} "
+            f"(LIKE {table_name}_partitioned INCLUDING DEFAULTS INCLUDING COMMENTS)"
+        )
+        op.execute(f"INSERT INTO {table_name} SELECT * FROM {table_name}_partitioned")
+
+    op.create_primary_key("invoices_pkey", "invoices", ["id", "access_key"])
+    op.create_unique_constraint("invoices_access_key_key", "invoices", ["access_key"])
+    op.create_primary_key("invoice_items_pkey", "invoice_items", ["id"])
+    op.create_unique_constraint(
+        "uq_invoice_item_access_key_product_number",
+        "invoice_items",
+        ["access_key", "product_number"],
+    )
+    op.create_foreign_key(
+        "invoice_items_access_key_fkey",
+        "invoice_items",
+        "invoices",
+        ["access_key"],
+        ["access_key"],
+        ondelete="CASCADE",
+    )
+    create_analytical_indexes()
+    op.create_index(
+        "ix_invoice_items_access_key_covering",
+        "invoice_items",
+        ["access_key"],
+        postgresql_include=["quantity", "total_value"],
+    )
+
+    op.drop_table("invoice_items_partitioned")
+    op.drop_table("invoices_partitioned")
@@ -0,0 +1,203 @@
+"""add_monthly_rollup_tables
+
+Revision ID: a1c4e7f9b305
+Revises: 9e6f1b2c8d47
+Create Date: 2026-10-17 21:12:36.804517
+
+"""
+
+from typing import List, Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a1c4e7f9b305"
+down_revision: Union[str, Sequence[str], None] = "9e6f1b2c8d47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def get_common_columns() -> List[sa.Column]:
+    return [
+        sa.Column(
+            "id",
+            UUID(as_uuid=True),
+            primary_key=True,
+            server_default=sa.text("gen_random_uuid()"),
+            nullable=False,
+            comment="Unique UUID identifier for the rollup row",
+        ),
+        sa.Column(
+            "year",
+            sa.Integer,
+            nullable=False,
+            comment="Year of the invoice issue date",
+        ),
+        sa.Column(
+            "month",
+            sa.Integer,
+            nullable=False,
+            comment="Month of the invoice issue date",
+        ),
+    ]
+
+
+def get_item_aggregate_columns() -> List[sa.Column]:
+    return [
+        sa.Column(
+            "item_count",
+            sa.BigInteger,
+            nullable=False,
+            comment="Number of invoice items",
+        ),
+        sa.Column(
+            "item_quantity_sum",
+            sa.Numeric(24, 4),
+            nullable=False,
+            comment="Sum of the invoice item quantities",
+        ),
+        sa.Column(
+            "item_total_value_sum",
+            sa.Numeric(20, 2),
+            nullable=False,
+            comment="Sum of the invoice item total values",
+        ),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+            comment="Timestamp when the record was created",
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+            comment="Timestamp when the record was last updated",
+        ),
+    ]
+
+
+def upgrade() -> None:
+    """Creates the monthly rollup tables and fills them from the loaded invoices."""
+    op.create_table(
+        "invoice_uf_monthly_rollups",
+        *get_common_columns(),
+        sa.Column(
+            "emitter_uf",
+            sa.String(length=2),
+            nullable=False,
+            comment="Emitter state (UF EMITENTE)",
+        ),
+        sa.Column(
+            "invoice_count",
+            sa.BigInteger,
+            nullable=False,
+            comment="Number of invoices",
+        ),
+        sa.Column(
+            "invoice_total_value_sum",
+            sa.Numeric(20, 2),
+            nullable=False,
+            comment="Sum of the total invoice values (divide by invoice_count for the average)",
+        ),
+        *get_item_aggregate_columns(),
+        sa.UniqueConstraint(
+            "year", "month", "emitter_uf", name="uq_invoice_uf_monthly_rollup_key"
+        ),
+    )
+    op.create_table(
+        "invoice_product_monthly_rollups",
+        *get_common_columns(),
+        sa.Column(
+            "ncm_sh_code",
+            sa.String(length=8),
+            nullable=False,
+            comment="NCM/SH code (CÓDIGO NCM/SH)",
+        ),
+        sa.Column(
+            "product_service_description",
+            sa.String(length=255),
+            nullable=False,
+            comment="Product/Service description (DESCRIÇÃO DO PRODUTO/SERVIÇO)",
+        ),
+        *get_item_aggregate_columns(),
+        sa.UniqueConstraint(
+            "year",
+            "month",
+            "ncm_sh_code",
+            "product_service_description",
+            name="uq_invoice_product_monthly_rollup_key",
+        ),
+    )
+
+    # Later loads keep the rollups up to date for the months they touch.
+    op.execute(
+        """
+        INSERT INTO invoice_uf_monthly_rollups (
+            year, month, emitter_uf, invoice_count, invoice_total_value_sum,
+            item_count, item_quantity_sum, item_total_value_sum
+        )
+        SELECT
+            COALESCE(i.year, it.year),
+            COALESCE(i.month, it.month),
+            COALESCE(i.emitter_uf, it.emitter_uf),
+            COALESCE(i.invoice_count, 0),
+            COALESCE(i.invoice_total_value_sum, 0),
+            COALESCE(it.item_count, 0),
+            COALESCE(it.item_quantity_sum, 0),
+            COALESCE(it.item_total_value_sum, 0)
+        FROM (
+            SELECT
+                CAST(EXTRACT(YEAR FROM issue_date) AS integer) AS year,
+                CAST(EXTRACT(MONTH FROM issue_date) AS integer) AS month,
+                emitter_uf,
+                COUNT(*) AS invoice_count,
+                SUM(total_invoice_value) AS invoice_total_value_sum
+            FROM invoices
+            GROUP BY 1, 2, 3
+        ) AS i
+        FULL OUTER JOIN (
+            SELECT
+                CAST(EXTRACT(YEAR FROM issue_date) AS integer) AS year,
+                CAST(EXTRACT(MONTH FROM issue_date) AS integer) AS month,
+                emitter_uf,
+                COUNT(*) AS item_count,
+                SUM(quantity) AS item_quantity_sum,
+                SUM(total_value) AS item_total_value_sum
+            FROM invoice_items
+            GROUP BY 1, 2, 3
+        ) AS it
+            ON it.year = i.year
+            AND it.month = i.month
+            AND it.emitter_uf = i.emitter_uf
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO invoice_product_monthly_rollups (
+            year, month, ncm_sh_code, product_service_description,
+            item_count, item_quantity_sum, item_total_value_sum
+        )
+        SELECT
+            CAST(EXTRACT(YEAR FROM issue_date) AS integer),
+            CAST(EXTRACT(MONTH FROM issue_date) AS integer),
+            ncm_sh_code,
+            product_service_description,
+            COUNT(*),
+            SUM(quantity),
+            SUM(total_value)
+        FROM invoice_items
+        GROUP BY 1, 2, 3, 4
+        """
+    )
+
+
+def downgrade() -> None:
+    """Drops the monthly rollup tables."""
+    op.drop_table("invoice_product_monthly_rollups")
+    op.drop_table("invoice_uf_monthly_rollups")
@@ -0,0 +1,175 @@
+import argparse
+import statistics
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+
+from sqlalchemy import Connection, text
+
+from src.core.logging import logger
+from src.infra.db.models.invoice_item_model import InvoiceItemModel
+from src.infra.db.models.invoice_model import InvoiceModel
+from src.infra.db.postgresql import PostgreSQL
+from src.settings.postgresql_db_settings import (
+    PostgreSQLDBSettings,
+)
+
+# Metrics of the BaseDashboardTab subclasses of the data analysis page computed from
+# the invoice tables, keyed by TAB_ID, filtered on the selected year as a range so
+# the indexes can serve it.
+DASHBOARD_QUERY_BY_TAB_ID = {
+    "INVOICE_COUNT_UF": """
+        SELECT emitter_uf, COUNT(*) AS num_invoices
+        FROM invoices
+        WHERE issue_date >= :start_date AND issue_date < :end_date
+        GROUP BY emitter_uf
+    """,
+    "INVOICE_ITEM_COUNT_UF": """
+        SELECT emitter_uf, COUNT(*) AS item_count
+        FROM invoice_items
+        WHERE issue_date >= :start_date AND issue_date < :end_date
+        GROUP BY emitter_uf
+    """,
+    "INVOICE_ITEM_QUANTITY_UF": """
+        SELECT emitter_uf, SUM(quantity) AS total_quantity
+        FROM invoice_items
+        WHERE issue_date >= :start_date AND issue_date < :end_date
+        GROUP BY emitter_uf
+    """,
+    "INVOICE_ITEM_BY_PRODUCT": """
+        SELECT product_service_description, SUM(total_value) AS item_total_value_sum
+        FROM invoice_items
+        WHERE issue_date >= :start_date AND issue_date < :end_date
+        GROUP BY product_service_description
+        ORDER BY item_total_value_sum DESC
+        LIMIT 10
+    """,
+    "PRODUCT_COUNT": """
+        SELECT product_service_description, COUNT(*) AS product_count
+        FROM invoice_items
+        WHERE issue_date >= :start_date AND issue_date < :end_date
+        GROUP BY product_service_description
+        ORDER BY product_count DESC
+        LIMIT 10
+    """,
+    "INVOICE_AVG_VALUE_UF": """
+        SELECT emitter_uf, AVG(total_invoice_value) AS avg_invoice_value
+        FROM invoices
+        WHERE issue_date >= :start_date AND issue_date < :end_date
+        GROUP BY emitter_uf
+    """,
+    "INVOICE_TOTAL_VALUE_UF": """
+        SELECT emitter_uf, SUM(total_invoice_value) AS total_value_sum
+        FROM invoices
+        WHERE issue_date >= :start_date AND issue_date < :end_date
+        GROUP BY emitter_uf
+    """,
+    "INVOICE_ITEM_TOTAL_VALUE_UF": """
+        SELECT emitter_uf, SUM(total_value) AS item_total_value_sum
+        FROM invoice_items
+        WHERE issue_date >= :start_date AND issue_date < :end_date
+        GROUP BY emitter_uf
+    """,
+}
+
+
+def get_analytical_index_names() -> List[str]:
+    return [
+        index.name
+        for model in (InvoiceModel, InvoiceItemModel)
+        for index in model.__table__.indexes
+    ]
+
+
+def get_scan_node_types(plan: Dict[str, Any]) -> List[str]:
+    node_types = []
+    if "Scan" in plan["Node Type"]:
+        index_name = plan.get("Index Name")
+        node_types.append(
+            f"{plan['Node Type']} ({index_name})" if index_name else plan["Node Type"]
+        )
+    for sub_plan in plan.get("Plans", []):
+        node_types.extend(get_scan_node_types(sub_plan))
+    return node_types
+
+
+def run_dashboard_queries(
+    connection: Connection, params: Dict[str, Any], repeat: int
+) -> Dict[str, Dict[str, Any]]:
+    results = {}
+    for tab_id, query in DASHBOARD_QUERY_BY_TAB_ID.items():
+        elapsed_times = []
+        for _ in range(repeat):
+            start_time = time.perf_counter()
+            connection.execute(text(query), params).fetchall()
+            elapsed_times.append(time.perf_counter() - start_time)
+        plan = connection.execute(
+            text(f"EXPLAIN (FORMAT JSON) {query}"), params
+        ).scalar()
+        results[tab_id] = {
+            "median_ms": statistics.median(elapsed_times) * 1000,
+            "scans": get_scan_node_types(plan[0]["Plan"]),
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Benchmark the dashboard metric queries with and without the analytical "
+            "indexes. The indexes are dropped inside a transaction that is rolled "
+            "back, which locks both tables meanwhile, so run it against a "
+            "benchmark database."
+        )
+    )
+    parser.add_argument(
+        "--year",
+        type=int,
+        default=0,
+        help="Year filtered by the queries (0 uses the latest year in invoices).",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    postgresql = PostgreSQL(postgresql_db_settings=PostgreSQLDBSettings())
+    with postgresql.sync_engine.connect() as connection:
+        year = args.year or int(
+            connection.execute(
+                text("SELECT EXTRACT(YEAR FROM MAX(issue_date)) FROM invoices")
+            ).scalar()
+            or datetime.now().year
+        )
+        params = {
+            "start_date": datetime(year, 1, 1),
+            "end_date": datetime(year + 1, 1, 1),
+        }
+        connection.rollback()
+
+        logger.info(f"Running dashboard queries for {year} without the indexes...")
+        with connection.begin() as transaction:
+            for index_name in get_analytical_index_names():
+                connection.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+            before_results = run_dashboard_queries(
+                connection=connection, params=params, repeat=args.repeat
+            )
+            transaction.rollback()
+
+        logger.info(f"Running dashboard queries for {year} with the indexes...")
+        with connection.begin() as transaction:
+            after_results = run_dashboard_queries(
+                connection=connection, params=params, repeat=args.repeat
+            )
+            transaction.rollback()
+
+    for tab_id in DASHBOARD_QUERY_BY_TAB_ID:
+        before = before_results[tab_id]
+        after = after_results[tab_id]
+        logger.info(
+            f"{tab_id}: {before['median_ms']:.1f} ms -> {after['median_ms']:.1f} ms "
+            f"({before['median_ms'] / max(after['median_ms'], 1e-9):,.1f}x) | "
+            f"before: {', '.join(before['scans'])} | after: {', '.join(after['scans'])}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import argparse
+import asyncio
+from datetime import date, datetime
+
+from src.core.logging import logger
+from src.infra.db.ingestion_ledger import IngestionLedger
+from src.infra.db.models.invoice_item_model import InvoiceItemModel
+from src.infra.db.partition_manager import PartitionManager
+from src.infra.db.postgresql import PostgreSQL
+from src.infra.db.rollup_manager import RollupManager
+from src.settings.postgresql_db_settings import (
+    PostgreSQLDBSettings,
+)
+
+
+def parse_month(value: str) -> date:
+    return datetime.strptime(value, "%Y%m").date()
+
+
+async def refresh_rollups(postgresql: PostgreSQL, month: date) -> None:
+    # invoice_items feeds every rollup table.
+    async with postgresql.async_session() as async_session:
+        await RollupManager().refresh_months(
+            async_session=async_session,
+            table_name=InvoiceItemModel.get_table_name(),
+            months=[month],
+        )
+        await async_session.commit()
+    # A running app keeps serving its cached dashboard metrics until their TTL.
+    logger.info(
+        f"Rollups refreshed for {month:%Y-%m}. Running apps pick them up once "
+        "their query cache entries expire."
+    )
+
+
+async def forget_ingested_files(postgresql: PostgreSQL, month: date) -> None:
+    # The month's source files can then be uploaded again to reload it.
+    await IngestionLedger(postgresql=postgresql).forget_month(month=month)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Manage the monthly partitions of invoices and invoice_items."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("list", help="List the partitions of each table.")
+    detach_parser = subparsers.add_parser(
+        "detach",
+        help="Detach a month from every table, keeping it as <partition>_detached.",
+    )
+    detach_parser.add_argument("--month", type=parse_month, required=True)
+    detach_parser.add_argument(
+        "--drop", action="store_true", help="Drop the detached tables."
+    )
+    create_staging_parser = subparsers.add_parser(
+        "create-staging",
+        help="Create empty <partition>_staging tables to reload a month into.",
+    )
+    create_staging_parser.add_argument("--month", type=parse_month, required=True)
+    swap_parser = subparsers.add_parser(
+        "swap", help="Replace a month with its loaded staging tables."
+    )
+    swap_parser.add_argument("--month", type=parse_month, required=True)
+    args = parser.parse_args()
+
+    postgresql = PostgreSQL(postgresql_db_settings=PostgreSQLDBSettings())
+    partition_manager = PartitionManager(postgresql=postgresql)
+    try:
+        if args.command == "list":
+            for table_name, partition_names in (
+                await partition_manager.get_partitions()
+            ).items():
+                logger.info(f"{table_name}: {', '.join(partition_names) or '-'}")
+        elif args.command == "detach":
+            detached_table_names = await partition_manager.detach_month(
+                month=args.month, drop=args.drop
+            )
+            logger.info(f"Detached partitions: {detached_table_names}")
+            await refresh_rollups(postgresql=postgresql, month=args.month)
+            await forget_ingested_files(postgresql=postgresql, month=args.month)
+        elif args.command == "create-staging":
+            staging_table_names = await partition_manager.create_month_staging_tables(
+                month=args.month
+            )
+            logger.info(f"Staging tables created: {staging_table_names}")
+        elif args.command == "swap":
+            await partition_manager.swap_month(month=args.month)
+            await refresh_rollups(postgresql=postgresql, month=args.month)
+            await forget_ingested_files(postgresql=postgresql, month=args.month)
+    finally:
+        await postgresql.close()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except Exception as error:
+        message = f"Failed to manage partitions: {error}"
+        logger.error(message)
+        raise
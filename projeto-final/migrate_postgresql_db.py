@@ -1,6 +1,7 @@
 import asyncio
 import os
 
+from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
 from sqlalchemy import text
 
 from src.core.logging import logger
@@ -34,6 +35,16 @@ async def main() -> None:
         message = f"Failed to migrate Alembic: {error}"
         logger.error(message)
 
+    logger.info("Checkpointer setup has started...")
+    try:
+        checkpointer = AsyncPostgresSaver(conn=await postgresql.get_checkpointer_pool())
+        await checkpointer.setup()
+        logger.info("Checkpointer setup complete.")
+    except Exception as error:
+        message = f"Failed to set up checkpointer: {error}"
+        logger.error(message)
+        raise
+
     logger.info("Database connection closure has started...")
     try:
         await postgresql.close()
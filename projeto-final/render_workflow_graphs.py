@@ -0,0 +1,32 @@
+import os
+
+from src.core.container.container import Container
+from src.core.container.container_factory import build_container
+from src.core.logging import logger
+
+
+def main() -> None:
+    container: Container = build_container()
+    streamlit_app_settings = container.streamlit_app_settings()
+    os.makedirs(streamlit_app_settings.data_output_workflow_dir_path, exist_ok=True)
+
+    for workflow in [container.invoice_mgmt_workflow()]:
+        logger.info(f"Rendering graph {workflow.name}...")
+        compiled_graph = workflow.workflow.compile()
+        logger.info(f"Nodes in graph: {compiled_graph.nodes.keys()}")
+        logger.info(compiled_graph.get_graph().draw_ascii())
+        output_file_path = os.path.join(
+            streamlit_app_settings.data_output_workflow_dir_path,
+            f"{workflow.name}.png",
+        )
+        compiled_graph.get_graph().draw_mermaid_png(output_file_path=output_file_path)
+        logger.info(f"Graph {workflow.name} rendered to {output_file_path}.")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as error:
+        message = f"Failed to render workflow graphs: {error}"
+        logger.error(message)
+        raise
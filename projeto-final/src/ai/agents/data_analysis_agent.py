@@ -13,6 +13,7 @@ class DataAnalysisAgent(BaseAgent):
         INSTRUCTIONS:
         - If the user's request involves analyzing data of `invoice` or `invoice items`, check data from the database tables `invoices` and `invoice_items`.
             1. Your **FIRST ACTIONS MUST ALWAYS BE** use the `get_detailed_table_schemas_tool` to retrieve column **descriptions (comments)** which are CRITICAL for identifying the correct column names to accomplish with your task.
+            2. For monthly or yearly aggregates by emitter UF or by product (counts, sums, averages and quantities), prefer the rollup tables `invoice_uf_monthly_rollups` and `invoice_product_monthly_rollups`, computing averages as the sum divided by the count.
         - If the user's request involves generating bar plots (e.g., bar chart), use `generate_bar_plot_tool` to plot the graphs.
         - If the user's request involves generating distribution plots (e.g., histograms), use `generate_distribution_plot_tool` to plot the graphs.
 
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Optional, Tuple
 
 import pandas as pd
 from pydantic import BaseModel
@@ -21,11 +21,35 @@ class BaseIngestionConfigModel(BaseModel):
             value = value.replace(".", "").replace(",", ".")
         return float(value)
 
+    @staticmethod
+    def _parse_br_datetime_series(values: pd.Series) -> Tuple[pd.Series, pd.Series]:
+        parsed_values = pd.to_datetime(
+            values, format="%d/%m/%Y %H:%M:%S", errors="coerce"
+        )
+        return parsed_values, parsed_values.isna() & values.notna()
+
+    @staticmethod
+    def _parse_br_float_series(values: pd.Series) -> Tuple[pd.Series, pd.Series]:
+        if pd.api.types.is_numeric_dtype(values):
+            return values.astype(float), pd.Series(False, index=values.index)
+        normalized_values = (
+            values.astype("string")
+            .str.strip()
+            .str.replace(".", "", regex=False)
+            .str.replace(",", ".", regex=False)
+        )
+        parsed_values = pd.to_numeric(normalized_values, errors="coerce").astype(float)
+        return parsed_values, parsed_values.isna() & values.notna()
+
 
 # Nested model for csv_columns_to_model_fields
 class ColumnMappingModel(BaseModel):
     field: str
+    # Scalar converter applied value by value (kept for backward compatibility).
     converter: Optional[Callable[[str], Any]] = None
+    # Batch converter applied to the whole column, returning the converted values
+    # and the mask of rows whose values could not be converted.
+    batch_converter: Optional[Callable[[pd.Series], Tuple[pd.Series, pd.Series]]] = None
 
 
 # Ensure ColumnMappingModel is defined before BaseIngestionConfigModel resolves forward references
@@ -13,12 +13,13 @@ class InvoiceIngestionConfigModel(BaseIngestionConfigModel):
         "NÚMERO": ColumnMappingModel(field="number"),
         "NATUREZA DA OPERAÇÃO": ColumnMappingModel(field="operation_nature"),
         "DATA EMISSÃO": ColumnMappingModel(
-            field="issue_date", converter=BaseIngestionConfigModel._parse_br_datetime
+            field="issue_date",
+            batch_converter=BaseIngestionConfigModel._parse_br_datetime_series,
         ),
         "EVENTO MAIS RECENTE": ColumnMappingModel(field="latest_event"),
         "DATA/HORA EVENTO MAIS RECENTE": ColumnMappingModel(
             field="latest_event_datetime",
-            converter=BaseIngestionConfigModel._parse_br_datetime,
+            batch_converter=BaseIngestionConfigModel._parse_br_datetime_series,
         ),
         "CPF/CNPJ Emitente": ColumnMappingModel(field="emitter_cnpj_cpf"),
         "RAZÃO SOCIAL EMITENTE": ColumnMappingModel(field="emitter_corporate_name"),
@@ -36,7 +37,7 @@ class InvoiceIngestionConfigModel(BaseIngestionConfigModel):
         "PRESENÇA DO COMPRADOR": ColumnMappingModel(field="buyer_presence"),
         "VALOR NOTA FISCAL": ColumnMappingModel(
             field="total_invoice_value",
-            converter=BaseIngestionConfigModel._parse_br_float,
+            batch_converter=BaseIngestionConfigModel._parse_br_float_series,
         ),
     }
     table_name: str = "invoices"
@@ -13,7 +13,8 @@ class InvoiceItemIngestionConfigModel(BaseIngestionConfigModel):
         "NÚMERO": ColumnMappingModel(field="number"),
         "NATUREZA DA OPERAÇÃO": ColumnMappingModel(field="operation_nature"),
         "DATA EMISSÃO": ColumnMappingModel(
-            field="issue_date", converter=BaseIngestionConfigModel._parse_br_datetime
+            field="issue_date",
+            batch_converter=BaseIngestionConfigModel._parse_br_datetime_series,
         ),
         "CPF/CNPJ Emitente": ColumnMappingModel(field="emitter_cnpj_cpf"),
         "RAZÃO SOCIAL EMITENTE": ColumnMappingModel(field="emitter_corporate_name"),
@@ -37,14 +38,17 @@ class InvoiceItemIngestionConfigModel(BaseIngestionConfigModel):
         "NCM/SH (TIPO DE PRODUTO)": ColumnMappingModel(field="ncm_sh_product_type"),
         "CFOP": ColumnMappingModel(field="cfop"),
         "QUANTIDADE": ColumnMappingModel(
-            field="quantity", converter=BaseIngestionConfigModel._parse_br_float
+            field="quantity",
+            batch_converter=BaseIngestionConfigModel._parse_br_float_series,
         ),
         "UNIDADE": ColumnMappingModel(field="unit"),
         "VALOR UNITÁRIO": ColumnMappingModel(
-            field="unit_value", converter=BaseIngestionConfigModel._parse_br_float
+            field="unit_value",
+            batch_converter=BaseIngestionConfigModel._parse_br_float_series,
         ),
         "VALOR TOTAL": ColumnMappingModel(
-            field="total_value", converter=BaseIngestionConfigModel._parse_br_float
+            field="total_value",
+            batch_converter=BaseIngestionConfigModel._parse_br_float_series,
         ),
     }
     table_name: str = "invoice_items"
@@ -0,0 +1,166 @@
+import asyncio
+import os
+import uuid
+import zipfile
+from typing import Any, Dict, List
+
+from langchain_core.messages import ToolMessage
+from langchain_core.tools import BaseTool, ToolException
+
+from src.ai.tools.insert_records_into_database_tool import (
+    InsertRecordsIntoDatabaseTool,
+)
+from src.ai.tools.map_csvs_to_ingestion_args_tool import (
+    MapCSVsToIngestionArgsTool,
+)
+from src.ai.tools.unzip_zip_file_tool import (
+    UnzipZipFileTool,
+)
+from src.core.logging import logger
+from src.infra.db.ingestion_ledger import IngestionLedger
+from src.settings.streamlit_app_settings import (
+    StreamlitAppSettings,
+)
+
+
+class InvoiceIngestionPipeline:
+    """Runs the unzip, mapping and insertion tools directly, with no LLM calls."""
+
+    def __init__(
+        self,
+        streamlit_app_settings: StreamlitAppSettings,
+        unzip_zip_file_tool: UnzipZipFileTool,
+        map_csvs_to_ingestion_args_tool: MapCSVsToIngestionArgsTool,
+        insert_records_into_database_tool: InsertRecordsIntoDatabaseTool,
+        ingestion_ledger: IngestionLedger,
+    ):
+        self.name = "invoice_ingestion_pipeline"
+        self.streamlit_app_settings = streamlit_app_settings
+        self.unzip_zip_file_tool = unzip_zip_file_tool
+        self.map_csvs_to_ingestion_args_tool = map_csvs_to_ingestion_args_tool
+        self.insert_records_into_database_tool = insert_records_into_database_tool
+        self.ingestion_ledger = ingestion_ledger
+
+    @staticmethod
+    async def compute_sha256(zip_file_path: str) -> str:
+        # Computed once per ZIP file and handed to every step that needs it.
+        return await asyncio.to_thread(
+            IngestionLedger.compute_sha256, file_path=zip_file_path
+        )
+
+    async def is_ingested(self, zip_sha256: str) -> bool:
+        return await self.ingestion_ledger.is_completed(sha256=zip_sha256)
+
+    async def decompress(
+        self, zip_file_path: str, zip_sha256: str | None = None
+    ) -> List[str]:
+        return await self.__invoke_tool(
+            tool=self.unzip_zip_file_tool,
+            args={
+                "source_dir_path": zip_file_path,
+                "destination_dir_path": self.streamlit_app_settings.data_output_upload_extracted_dir_path,
+                "zip_sha256": zip_sha256,
+            },
+        )
+
+    async def map(
+        self, source_path: str, zip_sha256: str | None = None
+    ) -> List[Dict[str, str]]:
+        # Source files are hashed before mapping, so the ones the ledger already
+        # holds are never mapped again.
+        source_sha256_by_file_path = await asyncio.to_thread(
+            self.__compute_source_sha256s, source_path, zip_sha256
+        )
+        completed_sha256s = await self.ingestion_ledger.get_completed_sha256s(
+            sha256s=source_sha256_by_file_path.values()
+        )
+        return await self.__invoke_tool(
+            tool=self.map_csvs_to_ingestion_args_tool,
+            args={
+                "source_dir_path": source_path,
+                "destination_dir_path": self.streamlit_app_settings.data_output_ingestion_dir_path,
+                "source_sha256_by_file_path": source_sha256_by_file_path,
+                "skipped_file_paths": [
+                    file_path
+                    for file_path, sha256 in source_sha256_by_file_path.items()
+                    if file_path != source_path and sha256 in completed_sha256s
+                ],
+            },
+        )
+
+    async def insert(
+        self, ingestion_args_list: List[Dict[str, str]]
+    ) -> Dict[str, Dict[str, int]]:
+        return await self.__invoke_tool(
+            tool=self.insert_records_into_database_tool,
+            args={"ingestion_args_list": ingestion_args_list},
+        )
+
+    async def run(self, zip_file_path: str) -> Dict[str, Dict[str, int]]:
+        logger.info(f"Running {self.name} for {zip_file_path}...")
+        zip_sha256 = await self.compute_sha256(zip_file_path=zip_file_path)
+        if await self.is_ingested(zip_sha256=zip_sha256):
+            logger.info(f"Skipping {zip_file_path}: it was already ingested.")
+            return {}
+        if self.streamlit_app_settings.ingestion_stream_zip_members:
+            source_path = zip_file_path
+        else:
+            await self.decompress(zip_file_path=zip_file_path, zip_sha256=zip_sha256)
+            source_path = (
+                self.streamlit_app_settings.data_output_upload_extracted_dir_path
+            )
+        ingestion_args_list = await self.map(
+            source_path=source_path, zip_sha256=zip_sha256
+        )
+        count_map = await self.insert(ingestion_args_list=ingestion_args_list)
+        logger.info(f"{self.name} completed: {count_map}")
+        return count_map
+
+    @staticmethod
+    def __compute_source_sha256s(
+        source_path: str, zip_sha256: str | None = None
+    ) -> Dict[str, str]:
+        if os.path.isfile(source_path) and zipfile.is_zipfile(source_path):
+            with zipfile.ZipFile(source_path, "r") as zip_ref:
+                file_paths = [
+                    name for name in zip_ref.namelist() if name.endswith(".csv")
+                ]
+            return {
+                source_path: zip_sha256
+                or IngestionLedger.compute_sha256(file_path=source_path),
+                **{
+                    file_path: IngestionLedger.compute_sha256(
+                        file_path=file_path, zip_file_path=source_path
+                    )
+                    for file_path in file_paths
+                },
+            }
+
+        if not os.path.isdir(source_path):
+            return {}
+        return {
+            file_path: IngestionLedger.compute_sha256(file_path=file_path)
+            for file_path in (
+                os.path.join(source_path, file_name)
+                for file_name in os.listdir(source_path)
+                if file_name.endswith(".csv")
+            )
+            if os.path.isfile(file_path)
+        }
+
+    @staticmethod
+    async def __invoke_tool(tool: BaseTool, args: Dict[str, Any]) -> Any:
+        # Invoking with a tool call returns the ToolMessage, which carries the artifact.
+        tool_message = await tool.ainvoke(
+            {
+                "type": "tool_call",
+                "id": str(uuid.uuid4()),
+                "name": tool.name,
+                "args": args,
+            }
+        )
+        if not isinstance(tool_message, ToolMessage) or tool_message.status == "error":
+            message = f"Error running {tool.name}: {getattr(tool_message, 'content', tool_message)}"
+            logger.error(message)
+            raise ToolException(message)
+        return tool_message.artifact
@@ -1,5 +1,6 @@
+from typing import Optional
+
 from langchain_community.tools.sql_database.tool import (
-    InfoSQLDatabaseTool,
     ListSQLDatabaseTool,
     QuerySQLCheckerTool,
 )
@@ -10,19 +11,36 @@ from pydantic import BaseModel, ConfigDict
 from src.ai.tools.async_query_sql_database_tool import (
     AsyncQuerySQLDatabaseTool,
 )
+from src.ai.tools.cached_info_sql_database_tool import (
+    CachedInfoSQLDatabaseTool,
+)
+from src.core.cache import QueryResultCache
 from src.infra.db.postgresql import PostgreSQL
+from src.infra.db.schema_catalog import SchemaCatalog
+from src.settings.streamlit_app_settings import (
+    StreamlitAppSettings,
+)
 
 
 class AsyncSQLDatabaseToolkit(BaseModel):
     postgresql: PostgreSQL
     chat_model: BaseChatModel
+    streamlit_app_settings: StreamlitAppSettings
+    schema_catalog: SchemaCatalog
+    query_result_cache: Optional[QueryResultCache] = None
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
     def get_tools(self) -> list[BaseTool]:
         return [
-            AsyncQuerySQLDatabaseTool(postgresql=self.postgresql),
-            InfoSQLDatabaseTool(db=self.postgresql),
+            AsyncQuerySQLDatabaseTool(
+                postgresql=self.postgresql,
+                streamlit_app_settings=self.streamlit_app_settings,
+                query_result_cache=self.query_result_cache,
+            ),
+            CachedInfoSQLDatabaseTool(
+                db=self.postgresql, schema_catalog=self.schema_catalog
+            ),
             ListSQLDatabaseTool(db=self.postgresql),
             QuerySQLCheckerTool(db=self.postgresql, llm=self.chat_model),
         ]
@@ -1,25 +1,234 @@
+import decimal
+import json
+import os
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
 from langchain_community.tools.sql_database.tool import QuerySQLDatabaseTool
 from langchain_core.tools import ToolException
 from sqlalchemy import text
 
+from src.core.cache import QueryResultCache
 from src.core.logging import logger
 from src.infra.db.postgresql import PostgreSQL
+from src.settings.streamlit_app_settings import (
+    StreamlitAppSettings,
+)
 
 
 class AsyncQuerySQLDatabaseTool(QuerySQLDatabaseTool):
-    def __init__(self, postgresql: PostgreSQL):
-        super().__init__(db=postgresql)
+    streamlit_app_settings: StreamlitAppSettings
+    query_result_cache: Optional[QueryResultCache] = None
+    response_format: str = "content_and_artifact"
+
+    def __init__(
+        self,
+        postgresql: PostgreSQL,
+        streamlit_app_settings: StreamlitAppSettings,
+        query_result_cache: Optional[QueryResultCache] = None,
+    ):
+        super().__init__(
+            db=postgresql,
+            streamlit_app_settings=streamlit_app_settings,
+            query_result_cache=query_result_cache,
+        )
         self.name = "async_query_sql_database_tool"
         self.db = postgresql
+        self.streamlit_app_settings = streamlit_app_settings
+        self.query_result_cache = query_result_cache
+
+    def _run(self, query: str, *args: Any, **kwargs: Any) -> Tuple[str, Dict[str, Any]]:
+        return super()._run(query, *args, **kwargs), {}
 
-    async def _arun(self, query: str) -> str:
+    async def _arun(self, query: str) -> Tuple[str, Dict[str, Any]]:
         logger.info(f"Calling {self.name}...")
+        is_cacheable = (
+            self.query_result_cache is not None and QueryResultCache.is_cacheable(query)
+        )
+        if is_cacheable:
+            # The version is read before the query so a concurrent ingestion commit
+            # keeps its result out of the cache.
+            data_version = self.query_result_cache.get_data_version()
+            result = self.query_result_cache.get(query)
+            if result is not None and not self.__touch_result_file(result[1]):
+                result = None
+            logger.info(
+                f"Query result cache {'hit' if result is not None else 'miss'}: {self.query_result_cache.get_metrics()}"
+            )
+            if result is not None:
+                return result
+
         try:
-            async with self.db.async_session() as async_session:
-                result = await async_session.execute(text(query))
-                return str([dict(row) for row in result.mappings().all()])
+            content, artifact = await self.__stream_query(query)
 
         except Exception as error:
             message = f"Error executing SQL query: {str(error)}"
             logger.error(message)
             raise ToolException(message)
+
+        if is_cacheable:
+            self.query_result_cache.set(
+                query=query,
+                result=(content, artifact),
+                data_version=data_version,
+                num_bytes=len(content.encode("utf-8")),
+            )
+        return content, artifact
+
+    async def __stream_query(self, query: str) -> Tuple[str, Dict[str, Any]]:
+        max_rows = self.streamlit_app_settings.query_max_rows
+        max_chars = self.streamlit_app_settings.query_max_chars
+        sample_rows: List[Dict[str, Any]] = []
+        sample_chars = 2
+        row_count = 0
+        is_truncated = False
+        file_path = os.path.join(
+            self.streamlit_app_settings.data_output_query_dir_path,
+            f"{uuid.uuid4()}.parquet",
+        )
+        parquet_writer: Optional[pq.ParquetWriter] = None
+        pending_tables: List[pa.Table] = []
+
+        try:
+            async with self.db.async_session(read_only=True) as async_session:
+                await async_session.execute(
+                    text(
+                        f"SET LOCAL statement_timeout = {int(self.streamlit_app_settings.query_statement_timeout_ms)}"
+                    )
+                )
+                # A server-side cursor fetches the rows in bounded partitions.
+                result = await async_session.stream(text(query))
+                columns = list(result.keys())
+                async for partition in result.mappings().partitions(
+                    self.streamlit_app_settings.query_fetch_size
+                ):
+                    rows = [dict(row) for row in partition]
+                    for row in rows:
+                        row_chars = len(str(row)) + 2
+                        if (
+                            is_truncated
+                            or len(sample_rows) >= max_rows
+                            or sample_chars + row_chars > max_chars
+                        ):
+                            is_truncated = True
+                            break
+                        sample_rows.append(row)
+                        sample_chars += row_chars
+                    row_count += len(rows)
+
+                    # Rows are only spilled to Parquet once the result outgrows the sample.
+                    pending_tables.append(
+                        self.__to_arrow_table(rows=rows, columns=columns)
+                    )
+                    if not is_truncated:
+                        continue
+                    if parquet_writer is None:
+                        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                        self.__remove_stale_result_files()
+                        parquet_writer = pq.ParquetWriter(
+                            file_path, pending_tables[0].schema
+                        )
+                    for table in pending_tables:
+                        parquet_writer.write_table(table.cast(parquet_writer.schema))
+                    pending_tables = []
+        finally:
+            if parquet_writer is not None:
+                parquet_writer.close()
+
+        if not is_truncated:
+            return str(sample_rows), {"row_count": row_count, "columns": columns}
+
+        logger.info(
+            f"Query returned {row_count} rows; the full result was saved to {file_path}."
+        )
+        content = (
+            f"The query returned {row_count} rows with the columns {columns}. "
+            f"Only the first {len(sample_rows)} rows are shown; refine the query "
+            f"(e.g. with aggregates, filters or LIMIT) to see other rows: {str(sample_rows)}"
+        )
+        artifact = {"row_count": row_count, "columns": columns, "file_path": file_path}
+        return content, artifact
+
+    @staticmethod
+    def __touch_result_file(artifact: Dict[str, Any]) -> bool:
+        # A cached result whose spilled file was already removed is run again;
+        # otherwise the file is marked as recently used.
+        file_path = artifact.get("file_path")
+        if not file_path:
+            return True
+        try:
+            os.utime(file_path)
+            return True
+        except OSError:
+            return False
+
+    def __remove_stale_result_files(self) -> None:
+        # Spilled results expire after the configured TTL, and only the most recently
+        # used ones are kept beyond the configured count.
+        dir_path = self.streamlit_app_settings.data_output_query_dir_path
+        modified_at_by_file_path: Dict[str, float] = {}
+        for file_name in os.listdir(dir_path):
+            file_path = os.path.join(dir_path, file_name)
+            if file_name.endswith(".parquet"):
+                try:
+                    modified_at_by_file_path[file_path] = os.path.getmtime(file_path)
+                except OSError:
+                    continue
+
+        expires_before = (
+            time.time() - self.streamlit_app_settings.query_result_file_ttl_seconds
+        )
+        # One slot is left for the file about to be written.
+        max_count = max(self.streamlit_app_settings.query_result_file_max_count - 1, 0)
+        for position, file_path in enumerate(
+            sorted(
+                modified_at_by_file_path,
+                key=modified_at_by_file_path.get,
+                reverse=True,
+            )
+        ):
+            if (
+                position < max_count
+                and modified_at_by_file_path[file_path] >= expires_before
+            ):
+                continue
+            try:
+                os.remove(file_path)
+                logger.info(f"Removed stale query result file {file_path}.")
+            except OSError as error:
+                logger.warning(
+                    f"Failed to remove query result file {file_path}: {error}"
+                )
+
+    @staticmethod
+    def __to_arrow_table(rows: List[Dict[str, Any]], columns: List[str]) -> pa.Table:
+        def to_arrow_value(value: Any) -> Any:
+            if isinstance(value, decimal.Decimal):
+                return float(value)
+            if isinstance(value, uuid.UUID):
+                return str(value)
+            if isinstance(value, (dict, list)):
+                return json.dumps(value, default=str)
+            return value
+
+        table = pa.Table.from_pydict(
+            {
+                column: [to_arrow_value(row[column]) for row in rows]
+                for column in columns
+            }
+        )
+        # Columns that are only NULL in the first partition are stored as strings,
+        # since later partitions cannot be cast to the null type.
+        return table.cast(
+            pa.schema(
+                [
+                    field.with_type(pa.string())
+                    if pa.types.is_null(field.type)
+                    else field
+                    for field in table.schema
+                ]
+            )
+        )
@@ -0,0 +1,19 @@
+from typing import Optional
+
+from langchain_community.tools.sql_database.tool import InfoSQLDatabaseTool
+from langchain_core.callbacks import CallbackManagerForToolRun
+
+from src.infra.db.schema_catalog import SchemaCatalog
+
+
+class CachedInfoSQLDatabaseTool(InfoSQLDatabaseTool):
+    schema_catalog: SchemaCatalog
+
+    def _run(
+        self,
+        table_names: str,
+        run_manager: Optional[CallbackManagerForToolRun] = None,
+    ) -> str:
+        return self.schema_catalog.get_table_info_no_throw(
+            table_names=[t.strip() for t in table_names.split(",")]
+        )
@@ -1,4 +1,6 @@
+import asyncio
 import json
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, Tuple, Type
 
 import altair as alt
@@ -9,6 +11,8 @@ from pydantic import BaseModel, Field
 from src.core.logging import logger
 from src.infra.db.postgresql import PostgreSQL
 
+TOP_CATEGORIES_LIMIT = 20
+
 
 class GenerateBarPlotToolInput(BaseModel):
     sql_query: str = Field(
@@ -28,81 +32,142 @@ class GenerateBarPlotTool(BaseTool):
         "categories in a specified column. Use this tool for **categorical** or **ordinal** data only."
     )
     postgresql: PostgreSQL
+    thread_pool_executor: ThreadPoolExecutor
     args_schema: Type[BaseModel] = GenerateBarPlotToolInput
     response_format: str = "content_and_artifact"
 
-    def __init__(self, postgresql: PostgreSQL):
-        super().__init__(postgresql=postgresql)
+    def __init__(
+        self, postgresql: PostgreSQL, thread_pool_executor: ThreadPoolExecutor
+    ):
+        super().__init__(
+            postgresql=postgresql, thread_pool_executor=thread_pool_executor
+        )
         self.postgresql = postgresql
+        self.thread_pool_executor = thread_pool_executor
 
     def _run(self, sql_query: str, column_name: str) -> Tuple[str, Dict[str, Any]]:
         logger.info(
             f"Calling {self.name} with sql_query={sql_query}, column_name={column_name}..."
         )
         try:
-            if not sql_query or not sql_query.lower().startswith("select"):
-                raise ValueError("Query must start with 'SELECT' and cannot be empty.")
-
-            df = pd.read_sql(sql_query, self.postgresql.sync_engine)
-
-            if df is None or df.empty:
-                raise ValueError("DataFrame is None or empty. Query returned no data.")
-
-            if column_name not in df.columns:
-                raise ValueError(f"Column '{column_name}' not found in DataFrame.")
-
-            col_data = df[column_name].dropna()
-
-            if pd.api.types.is_numeric_dtype(col_data):
-                raise ValueError(
-                    f"Column '{column_name}' is numeric. Use 'generate_distribution_plot_tool' "
-                    "for its distribution instead of a bar chart."
-                )
-
-            counts_df = col_data.value_counts().reset_index().head(20)
-            counts_df.columns = [column_name, "count"]
-
-            altair_type = "N"
-
-            chart = (
-                alt.Chart(counts_df)
-                .mark_bar(opacity=0.8, color="#4682b4")
-                .encode(
-                    x=alt.X(
-                        f"{column_name}:{altair_type}", title=column_name, sort="-y"
-                    ),
-                    y=alt.Y("count:Q", title="Frequência (Contagem)"),
-                    tooltip=[
-                        alt.Tooltip(f"{column_name}:{altair_type}", title=column_name),
-                        alt.Tooltip("count:Q", title="Contagem"),
-                    ],
-                )
-                .properties(
-                    title=f"Frequência das Principais Categorias em {column_name}",
-                    width=400,
-                    height=300,
-                )
+            self.__validate_sql_query(sql_query)
+            columns_query, counts_query = self.__build_queries(
+                sql_query=sql_query, column_name=column_name
             )
+            columns_df = pd.read_sql(columns_query, self.postgresql.read_sync_engine)
+            self.__validate_column(columns_df=columns_df, column_name=column_name)
+            counts_df = pd.read_sql(counts_query, self.postgresql.read_sync_engine)
+            return self.__build_plot(counts_df=counts_df, column_name=column_name)
 
-            total_records = len(df)
-            top_categories_count = len(counts_df)
+        except Exception as error:
+            message = f"Bar plot not generated: {type(error).__name__} - {str(error)}"
+            logger.error(message)
+            raise ToolException(message)
 
-            content = (
-                f"Gráfico de barras gerado. Exibindo a frequência das top {top_categories_count} categorias "
-                f"para a coluna '{column_name}' (de um total de {total_records} registros)."
+    async def _arun(
+        self, sql_query: str, column_name: str
+    ) -> Tuple[str, Dict[str, Any]]:
+        logger.info(
+            f"Calling {self.name} with sql_query={sql_query}, column_name={column_name}..."
+        )
+        try:
+            self.__validate_sql_query(sql_query)
+            columns_query, counts_query = self.__build_queries(
+                sql_query=sql_query, column_name=column_name
+            )
+            columns_df = await self.postgresql.read_sql_async(columns_query)
+            self.__validate_column(columns_df=columns_df, column_name=column_name)
+            counts_df = await self.postgresql.read_sql_async(counts_query)
+            # Building the Altair spec is CPU-bound, so it runs off the event loop.
+            return await asyncio.get_running_loop().run_in_executor(
+                self.thread_pool_executor, self.__build_plot, counts_df, column_name
             )
-
-            artifact = json.loads(chart.to_json())
-
-            logger.info(f"Bar plot generated for {column_name}")
-            return content, artifact
 
         except Exception as error:
             message = f"Bar plot not generated: {type(error).__name__} - {str(error)}"
             logger.error(message)
             raise ToolException(message)
 
-    async def _arun(
-        self, sql_query: str, column_name: str
+    @staticmethod
+    def __validate_sql_query(sql_query: str) -> None:
+        if not sql_query or not sql_query.lower().startswith("select"):
+            raise ValueError("Query must start with 'SELECT' and cannot be empty.")
+
+    @staticmethod
+    def __validate_column(columns_df: pd.DataFrame, column_name: str) -> None:
+        if column_name not in columns_df.columns:
+            raise ValueError(f"Column '{column_name}' not found in DataFrame.")
+
+    def __build_queries(self, sql_query: str, column_name: str) -> Tuple[str, str]:
+        subquery = sql_query.strip().rstrip(";")
+        column = self.postgresql.read_sync_engine.dialect.identifier_preparer.quote(
+            column_name
+        )
+        columns_query = f"SELECT * FROM ({subquery}) AS subquery LIMIT 0"
+        # The NULL group is kept (and sorted last) so the total row count comes
+        # back even when every value of the column is NULL.
+        counts_query = f"""
+            SELECT
+                {column} AS category,
+                COUNT(*) AS category_count,
+                CAST(SUM(COUNT(*)) OVER () AS BIGINT) AS total_records
+            FROM ({subquery}) AS subquery
+            GROUP BY {column}
+            ORDER BY {column} IS NULL, category_count DESC, {column}
+            LIMIT {TOP_CATEGORIES_LIMIT + 1}
+        """
+        return columns_query, counts_query
+
+    @staticmethod
+    def __build_plot(
+        counts_df: pd.DataFrame, column_name: str
     ) -> Tuple[str, Dict[str, Any]]:
-        return self._run(sql_query=sql_query, column_name=column_name)
+        if counts_df is None or counts_df.empty:
+            raise ValueError("DataFrame is None or empty. Query returned no data.")
+
+        total_records = int(counts_df["total_records"].iloc[0])
+        counts_df = counts_df.dropna(subset=["category"]).head(TOP_CATEGORIES_LIMIT)
+        counts_df = pd.DataFrame(
+            {
+                column_name: counts_df["category"].to_numpy(),
+                "count": counts_df["category_count"].to_numpy(),
+            }
+        )
+
+        if pd.api.types.is_numeric_dtype(counts_df[column_name]):
+            raise ValueError(
+                f"Column '{column_name}' is numeric. Use 'generate_distribution_plot_tool' "
+                "for its distribution instead of a bar chart."
+            )
+
+        altair_type = "N"
+
+        chart = (
+            alt.Chart(counts_df)
+            .mark_bar(opacity=0.8, color="#4682b4")
+            .encode(
+                x=alt.X(f"{column_name}:{altair_type}", title=column_name, sort="-y"),
+                y=alt.Y("count:Q", title="Frequência (Contagem)"),
+                tooltip=[
+                    alt.Tooltip(f"{column_name}:{altair_type}", title=column_name),
+                    alt.Tooltip("count:Q", title="Contagem"),
+                ],
+            )
+            .properties(
+                title=f"Frequência das Principais Categorias em {column_name}",
+                width=400,
+                height=300,
+            )
+        )
+
+        top_categories_count = len(counts_df)
+
+        content = (
+            f"Gráfico de barras gerado. Exibindo a frequência das top {top_categories_count} categorias "
+            f"para a coluna '{column_name}' (de um total de {total_records} registros)."
+        )
+
+        artifact = json.loads(chart.to_json())
+
+        logger.info(f"Bar plot generated for {column_name}")
+        return content, artifact
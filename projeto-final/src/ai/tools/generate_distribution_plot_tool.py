@@ -1,4 +1,6 @@
+import asyncio
 import json
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, Tuple, Type
 
 import altair as alt
@@ -10,6 +12,8 @@ from pydantic import BaseModel, Field
 from src.core.logging import logger
 from src.infra.db.postgresql import PostgreSQL
 
+NUM_BINS = 20
+
 
 class GenerateDistributionPlotToolInput(BaseModel):
     sql_query: str = Field(
@@ -26,12 +30,18 @@ class GenerateDistributionPlotTool(BaseTool):
     name: str = "generate_distribution_plot_tool"
     description: str = "Generates a distribution plot (histogram) for a specified column in the injected DataFrame 'df'. Can split the distribution by another column. This tool is optimized for large datasets."
     postgresql: PostgreSQL
+    thread_pool_executor: ThreadPoolExecutor
     args_schema: Type[BaseModel] = GenerateDistributionPlotToolInput
     response_format: str = "content_and_artifact"
 
-    def __init__(self, postgresql: PostgreSQL):
-        super().__init__(postgresql=postgresql)
+    def __init__(
+        self, postgresql: PostgreSQL, thread_pool_executor: ThreadPoolExecutor
+    ):
+        super().__init__(
+            postgresql=postgresql, thread_pool_executor=thread_pool_executor
+        )
         self.postgresql = postgresql
+        self.thread_pool_executor = thread_pool_executor
 
     def _run(
         self, sql_query: str, column_name: str, split_by: str | None = None
@@ -40,108 +50,252 @@ class GenerateDistributionPlotTool(BaseTool):
             f"Calling {self.name} with sql_query={sql_query}, column_name={column_name} and split_by={split_by}..."
         )
         try:
-            if not sql_query or not sql_query.lower().startswith("select"):
-                raise ValueError("Query must start with 'SELECT' and cannot be empty.")
-
-            df = pd.read_sql(sql_query, self.postgresql.sync_engine)
-
-            if df is None or df.empty:
-                raise ValueError("DataFrame is None or empty")
-            if column_name not in df.columns:
-                raise ValueError(f"Column '{column_name}' not found in DataFrame")
-            if split_by and split_by not in df.columns:
-                raise ValueError(f"Split column '{split_by}' not found in DataFrame")
-
-            num_bins = 20
-            col_data = df[column_name].dropna()
-            min_val, max_val = col_data.min(), col_data.max()
-            bin_edges = np.linspace(min_val, max_val, num_bins + 1)
-
-            hist_df = None
-            if split_by:
-                agg_data = []
-                for group_name, group_df in df.groupby(split_by):
-                    counts, _ = np.histogram(
-                        group_df[column_name].dropna(), bins=bin_edges
-                    )
-                    group_hist = pd.DataFrame(
-                        {
-                            "bin_start": bin_edges[:-1],
-                            "bin_end": bin_edges[1:],
-                            "count": counts,
-                            split_by: group_name,
-                        }
-                    )
-                    agg_data.append(group_hist)
-                hist_df = pd.concat(agg_data, ignore_index=True)
-            else:
-                counts, _ = np.histogram(col_data, bins=bin_edges)
-                hist_df = pd.DataFrame(
+            self.__validate_sql_query(sql_query)
+            subquery = sql_query.strip().rstrip(";")
+            columns_df = pd.read_sql(
+                self.__build_columns_query(subquery), self.postgresql.read_sync_engine
+            )
+            self.__validate_columns(
+                columns_df=columns_df, column_name=column_name, split_by=split_by
+            )
+            stats_df = pd.read_sql(
+                self.__build_stats_query(subquery, column_name),
+                self.postgresql.read_sync_engine,
+            )
+            bins_df = pd.read_sql(
+                self.__build_bins_query(subquery, column_name, split_by, stats_df),
+                self.postgresql.read_sync_engine,
+            )
+            return self.__build_plot(
+                stats_df=stats_df,
+                bins_df=bins_df,
+                column_name=column_name,
+                split_by=split_by,
+            )
+
+        except Exception as error:
+            message = f"Distribution plot not generated: {type(error).__name__} - {str(error)}"
+            logger.error(message)
+            raise ToolException(message)
+
+    async def _arun(
+        self, sql_query: str, column_name: str, split_by: str | None = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        logger.info(
+            f"Calling {self.name} with sql_query={sql_query}, column_name={column_name} and split_by={split_by}..."
+        )
+        try:
+            self.__validate_sql_query(sql_query)
+            subquery = sql_query.strip().rstrip(";")
+            columns_df = await self.postgresql.read_sql_async(
+                self.__build_columns_query(subquery)
+            )
+            self.__validate_columns(
+                columns_df=columns_df, column_name=column_name, split_by=split_by
+            )
+            stats_df = await self.postgresql.read_sql_async(
+                self.__build_stats_query(subquery, column_name)
+            )
+            bins_df = await self.postgresql.read_sql_async(
+                self.__build_bins_query(subquery, column_name, split_by, stats_df)
+            )
+            # Building the Altair spec is CPU-bound, so it runs off the event loop.
+            return await asyncio.get_running_loop().run_in_executor(
+                self.thread_pool_executor,
+                self.__build_plot,
+                stats_df,
+                bins_df,
+                column_name,
+                split_by,
+            )
+
+        except Exception as error:
+            message = f"Distribution plot not generated: {type(error).__name__} - {str(error)}"
+            logger.error(message)
+            raise ToolException(message)
+
+    @staticmethod
+    def __validate_sql_query(sql_query: str) -> None:
+        if not sql_query or not sql_query.lower().startswith("select"):
+            raise ValueError("Query must start with 'SELECT' and cannot be empty.")
+
+    @staticmethod
+    def __validate_columns(
+        columns_df: pd.DataFrame, column_name: str, split_by: str | None
+    ) -> None:
+        if column_name not in columns_df.columns:
+            raise ValueError(f"Column '{column_name}' not found in DataFrame")
+        if split_by and split_by not in columns_df.columns:
+            raise ValueError(f"Split column '{split_by}' not found in DataFrame")
+
+    def __quote(self, column_name: str) -> str:
+        return self.postgresql.read_sync_engine.dialect.identifier_preparer.quote(
+            column_name
+        )
+
+    @staticmethod
+    def __build_columns_query(subquery: str) -> str:
+        return f"SELECT * FROM ({subquery}) AS subquery LIMIT 0"
+
+    def __build_stats_query(self, subquery: str, column_name: str) -> str:
+        value = f"CAST({self.__quote(column_name)} AS DOUBLE PRECISION)"
+        return f"""
+            SELECT
+                COUNT(*) AS total_records,
+                COUNT({value}) AS value_count,
+                MIN({value}) AS min_value,
+                MAX({value}) AS max_value,
+                AVG({value}) AS mean_value
+            FROM ({subquery}) AS subquery
+        """
+
+    def __build_bins_query(
+        self,
+        subquery: str,
+        column_name: str,
+        split_by: str | None,
+        stats_df: pd.DataFrame,
+    ) -> str:
+        stats = stats_df.iloc[0]
+        if stats["total_records"] == 0:
+            raise ValueError("DataFrame is None or empty")
+        if stats["value_count"] == 0:
+            raise ValueError(f"Column '{column_name}' has no non-null values")
+
+        min_value = float(stats["min_value"])
+        max_value = float(stats["max_value"])
+        mean_value = float(stats["mean_value"])
+        # Matches np.histogram, whose last bin also includes the maximum value.
+        if min_value == max_value:
+            bucket = f"CASE WHEN value IS NULL THEN NULL ELSE {NUM_BINS} END"
+        else:
+            bucket = f"LEAST(WIDTH_BUCKET(value, {min_value!r}, {max_value!r}, {NUM_BINS}), {NUM_BINS})"
+        split_value = self.__quote(split_by) if split_by else "NULL"
+        # Central moment sums are computed per bin and added up by the client
+        # for the skewness.
+        return f"""
+            SELECT
+                split_value,
+                {bucket} AS bucket,
+                COUNT(value) AS bin_count,
+                SUM(POWER(value - {mean_value!r}, 2)) AS m2_sum,
+                SUM(POWER(value - {mean_value!r}, 3)) AS m3_sum
+            FROM (
+                SELECT
+                    {split_value} AS split_value,
+                    CAST({self.__quote(column_name)} AS DOUBLE PRECISION) AS value
+                FROM ({subquery}) AS subquery
+            ) AS source
+            GROUP BY split_value, bucket
+        """
+
+    @staticmethod
+    def __get_skewness(value_count: int, m2_sum: float, m3_sum: float) -> float:
+        # Same estimator as pandas.Series.skew.
+        if value_count < 3:
+            return np.nan
+        if abs(m2_sum) < 1e-14:
+            return 0.0
+        return (value_count * (value_count - 1) ** 0.5 / (value_count - 2)) * (
+            m3_sum / m2_sum**1.5
+        )
+
+    @classmethod
+    def __build_plot(
+        cls,
+        stats_df: pd.DataFrame,
+        bins_df: pd.DataFrame,
+        column_name: str,
+        split_by: str | None,
+    ) -> Tuple[str, Dict[str, Any]]:
+        stats = stats_df.iloc[0]
+        bin_edges = np.linspace(
+            float(stats["min_value"]), float(stats["max_value"]), NUM_BINS + 1
+        )
+
+        valued_bins_df = bins_df.dropna(subset=["bucket"])
+        if split_by:
+            agg_data = []
+            group_names = sorted(bins_df["split_value"].dropna().unique())
+            for group_name in group_names:
+                group_bins_df = valued_bins_df[
+                    valued_bins_df["split_value"] == group_name
+                ]
+                group_hist = pd.DataFrame(
                     {
                         "bin_start": bin_edges[:-1],
                         "bin_end": bin_edges[1:],
-                        "count": counts,
+                        "count": cls.__get_bin_counts(group_bins_df),
+                        split_by: group_name,
                     }
                 )
-
-            chart = (
-                alt.Chart(hist_df)
-                .mark_bar(opacity=0.7)
-                .encode(
-                    x=alt.X(
-                        "bin_start:Q",
-                        title=f"{column_name}",
-                        axis=alt.Axis(format="~s"),
-                    ),
-                    x2=alt.X2("bin_end:Q"),
-                    y=alt.Y("count:Q", title="Contador de Registros"),
-                    color=(
-                        alt.Color(f"{split_by}:N", title=split_by)
-                        if split_by
-                        else alt.value("#4682b4")
-                    ),
-                    tooltip=(
-                        [
-                            alt.Tooltip(
-                                "bin_start:Q", title=f"Start of {column_name} bin"
-                            ),
-                            alt.Tooltip("bin_end:Q", title=f"End of {column_name} bin"),
-                            alt.Tooltip("count:Q", title="Count of Records"),
-                            alt.Tooltip(f"{split_by}:N", title=split_by),
-                        ]
-                        if split_by
-                        else [
-                            alt.Tooltip(
-                                "bin_start:Q", title=f"Start of {column_name} bin"
-                            ),
-                            alt.Tooltip("bin_end:Q", title=f"End of {column_name} bin"),
-                            alt.Tooltip("count:Q", title="Count of Records"),
-                        ]
-                    ),
-                )
-                .properties(
-                    title=f"Distribuição de {column_name}{' pela ' + split_by if split_by else ''}",
-                    width=400,
-                    height=300,
-                )
+                agg_data.append(group_hist)
+            hist_df = pd.concat(agg_data, ignore_index=True)
+        else:
+            hist_df = pd.DataFrame(
+                {
+                    "bin_start": bin_edges[:-1],
+                    "bin_end": bin_edges[1:],
+                    "count": cls.__get_bin_counts(valued_bins_df),
+                }
             )
 
-            skewness = df[column_name].skew()
-            content = f"Distribuição de {column_name}{' separado por ' + split_by if split_by else ''}. Assimetria: {skewness:.2f}"
+        chart = (
+            alt.Chart(hist_df)
+            .mark_bar(opacity=0.7)
+            .encode(
+                x=alt.X(
+                    "bin_start:Q",
+                    title=f"{column_name}",
+                    axis=alt.Axis(format="~s"),
+                ),
+                x2=alt.X2("bin_end:Q"),
+                y=alt.Y("count:Q", title="Contador de Registros"),
+                color=(
+                    alt.Color(f"{split_by}:N", title=split_by)
+                    if split_by
+                    else alt.value("#4682b4")
+                ),
+                tooltip=(
+                    [
+                        alt.Tooltip("bin_start:Q", title=f"Start of {column_name} bin"),
+                        alt.Tooltip("bin_end:Q", title=f"End of {column_name} bin"),
+                        alt.Tooltip("count:Q", title="Count of Records"),
+                        alt.Tooltip(f"{split_by}:N", title=split_by),
+                    ]
+                    if split_by
+                    else [
+                        alt.Tooltip("bin_start:Q", title=f"Start of {column_name} bin"),
+                        alt.Tooltip("bin_end:Q", title=f"End of {column_name} bin"),
+                        alt.Tooltip("count:Q", title="Count of Records"),
+                    ]
+                ),
+            )
+            .properties(
+                title=f"Distribuição de {column_name}{' pela ' + split_by if split_by else ''}",
+                width=400,
+                height=300,
+            )
+        )
 
-            artifact = json.loads(chart.to_json())
+        skewness = cls.__get_skewness(
+            value_count=int(stats["value_count"]),
+            m2_sum=float(valued_bins_df["m2_sum"].sum()),
+            m3_sum=float(valued_bins_df["m3_sum"].sum()),
+        )
+        content = f"Distribuição de {column_name}{' separado por ' + split_by if split_by else ''}. Assimetria: {skewness:.2f}"
 
-            logger.info(f"Distribution plot generated for {column_name}")
-            return content, artifact
+        artifact = json.loads(chart.to_json())
 
-        except Exception as error:
-            message = f"Distribution plot not generated: {type(error).__name__} - {str(error)}"
-            logger.error(message)
-            raise ToolException(message)
+        logger.info(f"Distribution plot generated for {column_name}")
+        return content, artifact
 
-    async def _arun(
-        self, sql_query: str, column_name: str, split_by: str | None = None
-    ) -> Tuple[str, Dict[str, Any]]:
-        return self._run(
-            sql_query=sql_query, column_name=column_name, split_by=split_by
+    @staticmethod
+    def __get_bin_counts(bins_df: pd.DataFrame) -> np.ndarray:
+        counts = np.zeros(NUM_BINS, dtype=np.int64)
+        np.add.at(
+            counts,
+            bins_df["bucket"].to_numpy(dtype=np.int64) - 1,
+            bins_df["bin_count"].to_numpy(dtype=np.int64),
         )
+        return counts
@@ -2,11 +2,11 @@ from typing import Any, Dict, List, Tuple, Type
 
 from langchain_core.tools import BaseTool, ToolException
 from pydantic import BaseModel, Field
-from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
 
 from src.core.logging import logger
 from src.infra.db.postgresql import PostgreSQL
+from src.infra.db.schema_catalog import SchemaCatalog
 
 
 class GetDetailedTableSchemasToolInput(BaseModel):
@@ -24,12 +24,14 @@ class GetDetailedTableSchemasTool(BaseTool):
         "This is essential for accurately mapping complex user questions to the correct columns."
     )
     postgresql: PostgreSQL
+    schema_catalog: SchemaCatalog
     args_schema: Type[BaseModel] = GetDetailedTableSchemasToolInput
     response_format: str = "content_and_artifact"
 
-    def __init__(self, postgresql: PostgreSQL):
-        super().__init__(postgresql=postgresql)
+    def __init__(self, postgresql: PostgreSQL, schema_catalog: SchemaCatalog):
+        super().__init__(postgresql=postgresql, schema_catalog=schema_catalog)
         self.postgresql = postgresql
+        self.schema_catalog = schema_catalog
 
     async def _arun(
         self,
@@ -40,85 +42,13 @@ class GetDetailedTableSchemasTool(BaseTool):
         if not table_names:
             raise ToolException("Table names list cannot be empty.")
 
-        query = f"""
-            SELECT
-                c.table_name,
-                c.column_name,
-                c.data_type,
-                (
-                    SELECT pg_catalog.obj_description(
-                        (
-                            SELECT oid FROM pg_catalog.pg_class WHERE relname = c.table_name
-                        ),
-                        'pg_class'
-                    )
-                ) AS table_comment,
-                pgd.description AS column_comment
-            FROM
-                information_schema.columns c
-            LEFT JOIN
-                pg_catalog.pg_statio_all_tables AS st ON st.relname = c.table_name
-            LEFT JOIN
-                pg_catalog.pg_description pgd
-                ON pgd.objoid = st.relid AND pgd.objsubid = c.ordinal_position
-            WHERE
-                c.table_schema = 'public' 
-                AND c.table_name IN ({", ".join(f"'{t}'" for t in table_names)})
-            ORDER BY
-                c.table_name, c.ordinal_position;
-        """
-
-        schema_data: Dict[str, Any] = {}
-
         try:
-            async with self.postgresql.async_engine.connect() as conn:
-                result = await conn.execute(text(query))
-                rows = result.fetchall()
-
-                if not rows:
-                    content = f"Warning: No schema information found for tables: {', '.join(table_names)}."
-                    return content, {}
-
-                for row in rows:
-                    (
-                        table_name,
-                        column_name,
-                        data_type,
-                        table_comment,
-                        column_comment,
-                    ) = row
-
-                    if table_name not in schema_data:
-                        schema_data[table_name] = {
-                            "table_comment": table_comment if table_comment else "N/A",
-                            "columns": [],
-                        }
-
-                    schema_data[table_name]["columns"].append(
-                        {
-                            "column_name": column_name,
-                            "data_type": data_type,
-                            "comment": column_comment if column_comment else "N/A",
-                        }
-                    )
-
-                formatted_schema_list = []
-                for table, data in schema_data.items():
-                    col_details = []
-                    for col in data["columns"]:
-                        col_details.append(
-                            f"  - `{col['column_name']}` ({col['data_type']}): {col['comment']}"
-                        )
-
-                    formatted_schema_list.append(
-                        f"### Table: {table}\n"
-                        f"**Table Description:** {data['table_comment']}\n"
-                        f"**Columns:**\n" + "\n".join(col_details)
-                    )
-
-                content = "Detailed Schema Recovered:\n\n" + "\n\n".join(
-                    formatted_schema_list
-                )
+            content, schema_data = await self.schema_catalog.get_detailed_table_schemas(
+                table_names=table_names
+            )
+            if not schema_data:
+                content = f"Warning: No schema information found for tables: {', '.join(table_names)}."
+                return content, {}
 
         except SQLAlchemyError as error:
             message = f"Database Error during schema retrieval: {error.__class__.__name__}: {error}"
@@ -1,24 +1,55 @@
-from typing import Any, Dict, List, Tuple, Type
+import asyncio
+import os
+import re
+import uuid
+from datetime import date
+from typing import Any, AsyncIterator, Dict, List, Tuple, Type
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from langchain_core.tools import BaseTool, ToolException
 from pydantic import BaseModel, Field
+from sqlalchemy import (
+    UniqueConstraint,
+    insert,
+    select,
+    text,
+    tuple_,
+)
 from sqlalchemy.exc import (
     IntegrityError,
     SQLAlchemyError,
 )
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.cache import QueryResultCache
 from src.core.logging import logger
+from src.core.profiling import PeakRSSSampler
+from src.infra.db.ingestion_ledger import IngestionLedger
 from src.infra.db.models.base_model import (
     BaseModel as SQLAlchemyBaseModel,
 )
+from src.infra.db.models.ingestion_run_model import IngestionRunStatus
+from src.infra.db.partition_manager import PartitionManager
 from src.infra.db.postgresql import PostgreSQL
+from src.infra.db.rollup_manager import RollupManager
+from src.infra.db.row_builder import RowBuilder
+from src.settings.streamlit_app_settings import (
+    StreamlitAppSettings,
+)
+
+# SQLSTATE of an insert whose parent record does not exist.
+FOREIGN_KEY_VIOLATION = "23503"
 
 
 class InsertRecordsIntoDatabaseInput(BaseModel):
     ingestion_args_list: List[Dict[str, str]] = Field(
         ...,
-        description="List of ingestion arguments, where each dict contains 'table_name' and 'file_path'.",
+        description=(
+            "List of ingestion arguments, where each dict contains 'table_name' and "
+            "'file_path' (plus the source file hashes produced by the mapping step)."
+        ),
     )
 
 
@@ -26,11 +57,17 @@ class InsertRecordsIntoDatabaseTool(BaseTool):
     name: str = "insert_records_into_database_tool"
     description: str = (
         "Insert ingestion args (containing file path and table name) into Postgres "
-        "database using SQLAlchemy ORM. Skips duplicate records but fails on other errors."
+        "database using bulk COPY loads, loading files concurrently. Skips duplicate "
+        "records but fails on other errors."
     )
     postgresql: PostgreSQL
     sqlalchemy_model_by_table_name: Dict[str, Type[SQLAlchemyBaseModel]]
     ingestion_config_dict: Dict[int, Dict[str, Any]]
+    streamlit_app_settings: StreamlitAppSettings
+    ingestion_ledger: IngestionLedger
+    query_result_cache: QueryResultCache
+    partition_manager: PartitionManager
+    rollup_manager: RollupManager
     args_schema: Type[BaseModel] = InsertRecordsIntoDatabaseInput
     response_format: str = "content_and_artifact"
 
@@ -39,91 +76,122 @@ class InsertRecordsIntoDatabaseTool(BaseTool):
         postgresql: PostgreSQL,
         sqlalchemy_model_by_table_name: Dict[str, Type[SQLAlchemyBaseModel]],
         ingestion_config_dict: Dict[int, Dict[str, Any]],
+        streamlit_app_settings: StreamlitAppSettings,
+        ingestion_ledger: IngestionLedger,
+        query_result_cache: QueryResultCache,
+        partition_manager: PartitionManager,
+        rollup_manager: RollupManager,
     ):
         super().__init__(
             postgresql=postgresql,
             sqlalchemy_model_by_table_name=sqlalchemy_model_by_table_name,
             ingestion_config_dict=ingestion_config_dict,
+            streamlit_app_settings=streamlit_app_settings,
+            ingestion_ledger=ingestion_ledger,
+            query_result_cache=query_result_cache,
+            partition_manager=partition_manager,
+            rollup_manager=rollup_manager,
         )
         self.postgresql = postgresql
         self.sqlalchemy_model_by_table_name = sqlalchemy_model_by_table_name
         self.ingestion_config_dict = ingestion_config_dict
+        self.streamlit_app_settings = streamlit_app_settings
+        self.ingestion_ledger = ingestion_ledger
+        self.query_result_cache = query_result_cache
+        self.partition_manager = partition_manager
+        self.rollup_manager = rollup_manager
 
     async def _arun(
         self,
         ingestion_args_list: List[Dict[str, str]],
-    ) -> Tuple[str, Dict[str, int]]:
+    ) -> Tuple[str, Dict[str, Dict[str, int]]]:
         logger.info(f"Calling {self.name}...")
 
-        count_map: Dict[str, int] = {}
+        count_map: Dict[str, Dict[str, int]] = {}
         total_inserted_count: int = 0
+        total_skipped_count: int = 0
+        total_orphan_count: int = 0
+        total_already_ingested_file_count: int = 0
+        rss_sampler = PeakRSSSampler().start()
 
         try:
-            async with self.postgresql.async_session() as async_session:
-                for index, ingestion_args in enumerate(ingestion_args_list):
-                    table_name = ingestion_args["table_name"]
-                    file_path = ingestion_args["file_path"]
-
-                    if table_name not in self.sqlalchemy_model_by_table_name:
-                        message = f"Error: Invalid table name '{table_name}' found in ingestion arguments."
-                        logger.error(message)
-                        raise ToolException(message)
-
-                    model_class = self.sqlalchemy_model_by_table_name[table_name]
-                    if table_name not in count_map:
-                        count_map[table_name] = 0
-
-                    df: pd.DataFrame = pd.DataFrame()
-
-                    try:
-                        df = pd.read_csv(
-                            file_path,
-                            dtype=self.ingestion_config_dict[index][
-                                "model_fields_to_dtypes"
-                            ],
-                        )
-                    except (FileNotFoundError, UnicodeDecodeError, Exception) as error:
-                        message = f"Error reading file {file_path}: {error.__class__.__name__}: {error}"
-                        logger.error(message)
-                        raise ToolException(message) from error
-
-                    for _, row in df.iterrows():
-                        try:
-                            model_data = {}
-                            for doc_field_info in self.ingestion_config_dict[index][
-                                "csv_columns_to_model_fields"
-                            ].values():
-                                field_name = doc_field_info["field"]
-                                value = row.get(field_name)
-                                if value is pd.NA or pd.isna(value):
-                                    value = None
-                                model_data[field_name] = value
-
-                            model = model_class.from_data(data=model_data)
-                            async_session.add(model)
-                            await (
-                                async_session.flush()
-                            )  # Tenta enviar para o DB para pegar IntegrityError cedo
-                            count_map[table_name] += 1
-                            total_inserted_count += 1
-
-                        except IntegrityError:
-                            await async_session.rollback()
-                            logger.warning(
-                                f"Warning: Duplicate record skipped in table '{table_name}'. Continuing."
-                            )
-                            continue
-
-                        except (SQLAlchemyError, Exception) as error:
-                            await async_session.rollback()
-                            message = f"Critical Error processing record for {table_name}: {error.__class__.__name__}: {error}"
-                            logger.error(message)
-                            raise ToolException(message) from error
-
-                await async_session.commit()
-                logger.info(
-                    f"Success: All {total_inserted_count} records committed across all tables."
+            for ingestion_args in ingestion_args_list:
+                if (
+                    ingestion_args["table_name"]
+                    not in self.sqlalchemy_model_by_table_name
+                ):
+                    message = f"Error: Invalid table name '{ingestion_args['table_name']}' found in ingestion arguments."
+                    logger.error(message)
+                    raise ToolException(message)
+
+            for ingestion_args in ingestion_args_list:
+                count_map.setdefault(
+                    ingestion_args["table_name"],
+                    {
+                        "inserted_count": 0,
+                        "skipped_count": 0,
+                        "orphan_count": 0,
+                        "already_ingested_file_count": 0,
+                    },
+                )
+
+            completed_sha256s = await self.ingestion_ledger.get_completed_sha256s(
+                sha256s=[
+                    ingestion_args["source_sha256"]
+                    for ingestion_args in ingestion_args_list
+                    if ingestion_args.get("source_sha256")
+                ]
+            )
+            pending_ingestion_args_list: List[Dict[str, str]] = []
+            for ingestion_args in ingestion_args_list:
+                if ingestion_args.get("source_sha256") in completed_sha256s:
+                    logger.info(
+                        f"Skipping {ingestion_args['file_path']}: its source file was already ingested."
+                    )
+                    count_map[ingestion_args["table_name"]][
+                        "already_ingested_file_count"
+                    ] += 1
+                    total_already_ingested_file_count += 1
+                else:
+                    pending_ingestion_args_list.append(ingestion_args)
+
+            try:
+                load_counts = await self.__load_files(
+                    ingestion_args_list=pending_ingestion_args_list
+                )
+            except Exception:
+                await self.__record_zip_runs(
+                    ingestion_args_list=ingestion_args_list,
+                    load_counts_by_position={},
+                    status=IngestionRunStatus.FAILED,
                 )
+                raise
+
+            await self.__record_zip_runs(
+                ingestion_args_list=pending_ingestion_args_list,
+                load_counts_by_position=dict(enumerate(load_counts)),
+                status=IngestionRunStatus.COMPLETED,
+            )
+
+            for ingestion_args, (inserted_count, skipped_count, orphan_count) in zip(
+                pending_ingestion_args_list, load_counts
+            ):
+                table_name = ingestion_args["table_name"]
+                count_map[table_name]["inserted_count"] += inserted_count
+                count_map[table_name]["skipped_count"] += skipped_count
+                count_map[table_name]["orphan_count"] += orphan_count
+                total_inserted_count += inserted_count
+                total_skipped_count += skipped_count
+                total_orphan_count += orphan_count
+
+            logger.info(
+                f"Success: All {total_inserted_count} records committed across all tables."
+            )
+            rss_sampler.stop()
+            logger.info(
+                f"Record insertion peak RSS during the run: {rss_sampler.format_peak_rss()}."
+            )
+            logger.info(f"PostgreSQL pool stats: {self.postgresql.get_pool_stats()}")
 
         except ToolException:
             raise
@@ -133,10 +201,20 @@ class InsertRecordsIntoDatabaseTool(BaseTool):
             logger.error(message)
             raise ToolException(message) from error
 
+        finally:
+            rss_sampler.stop()
+
         if total_inserted_count == 0:
             content = "Warning: No new records were inserted into the database. All were skipped (duplicates or empty data)."
         else:
-            content = f"Successfully inserted {total_inserted_count} new records into the database across {len(count_map)} tables."
+            content = (
+                f"Successfully inserted {total_inserted_count} new records into the database across {len(count_map)} tables "
+                f"({total_skipped_count} duplicate records skipped)."
+            )
+        if total_orphan_count:
+            content += f" Warning: {total_orphan_count} records were not inserted because their parent record does not exist. Their files are loaded again on the next upload."
+        if total_already_ingested_file_count:
+            content += f" {total_already_ingested_file_count} files were skipped because they were already ingested."
 
         artifact = count_map
 
@@ -145,7 +223,578 @@ class InsertRecordsIntoDatabaseTool(BaseTool):
     def _run(
         self,
         ingestion_args_list: List[Dict[str, str]],
-    ) -> Tuple[str, Dict[str, int]]:
+    ) -> Tuple[str, Dict[str, Dict[str, int]]]:
         message = "Warning: Synchronous execution is not supported. Use _arun instead."
         logger.warning(message)
         raise NotImplementedError(message)
+
+    async def __load_files(
+        self, ingestion_args_list: List[Dict[str, str]]
+    ) -> List[Tuple[int, int, int]]:
+        parent_positions_list = self.__get_parent_positions_list(
+            ingestion_args_list=ingestion_args_list
+        )
+        semaphore = asyncio.Semaphore(
+            self.streamlit_app_settings.ingestion_max_concurrent_loads
+        )
+        tasks: List[asyncio.Task] = []
+
+        async def load_file(position: int) -> Tuple[int, int, int]:
+            table_name = ingestion_args_list[position]["table_name"]
+            file_path = ingestion_args_list[position]["file_path"]
+            parent_tasks = [tasks[parent] for parent in parent_positions_list[position]]
+            if parent_tasks:
+                await asyncio.gather(*parent_tasks)
+
+            # Every file is loaded and committed over its own pooled connection,
+            # together with its ledger entry.
+            async with semaphore:
+                try:
+                    months = await self.__ensure_partitions(
+                        table_name=table_name, file_path=file_path
+                    )
+                    async with self.postgresql.async_session() as async_session:
+                        (
+                            inserted_count,
+                            skipped_count,
+                            orphan_count,
+                        ) = await self.insert_chunks(
+                            async_session=async_session,
+                            table_name=table_name,
+                            chunks=self.__aiter_file_chunks(
+                                table_name=table_name, file_path=file_path
+                            ),
+                        )
+                        await self.rollup_manager.refresh_months(
+                            async_session=async_session,
+                            table_name=table_name,
+                            months=months,
+                        )
+                        await self.__record_file_run(
+                            async_session=async_session,
+                            ingestion_args=ingestion_args_list[position],
+                            status=(
+                                IngestionRunStatus.PARTIAL
+                                if orphan_count
+                                else IngestionRunStatus.COMPLETED
+                            ),
+                            inserted_count=inserted_count,
+                            skipped_count=skipped_count,
+                            orphan_count=orphan_count,
+                        )
+                        await async_session.commit()
+                    # Results cached before the replica shows this load would
+                    # otherwise outlive the version bump.
+                    if not await self.__wait_for_read_replica():
+                        logger.warning(
+                            f"Read replica has not replayed the load of {file_path} yet; "
+                            "cached query results may be stale until they expire."
+                        )
+                    self.query_result_cache.bump_data_version()
+                except Exception:
+                    async with self.postgresql.async_session() as async_session:
+                        await self.__record_file_run(
+                            async_session=async_session,
+                            ingestion_args=ingestion_args_list[position],
+                            status=IngestionRunStatus.FAILED,
+                        )
+                        await async_session.commit()
+                    raise
+
+            logger.info(
+                f"Loaded {file_path} into '{table_name}': {inserted_count} inserted, {skipped_count} skipped, {orphan_count} without parent."
+            )
+            return inserted_count, skipped_count, orphan_count
+
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                for position in range(len(ingestion_args_list)):
+                    tasks.append(task_group.create_task(load_file(position)))
+        except ExceptionGroup as error_group:
+            raise error_group.exceptions[0]
+
+        return [task.result() for task in tasks]
+
+    async def __wait_for_read_replica(self) -> bool:
+        # The load is already committed, so a replica check failure must not fail it.
+        try:
+            return await self.postgresql.wait_for_read_replica()
+        except Exception as error:
+            logger.warning(f"Failed to check the read replica lag: {error}")
+            return False
+
+    async def __record_file_run(
+        self,
+        async_session: AsyncSession,
+        ingestion_args: Dict[str, str],
+        status: IngestionRunStatus,
+        inserted_count: int | None = None,
+        skipped_count: int | None = None,
+        orphan_count: int | None = None,
+    ) -> None:
+        if not ingestion_args.get("source_sha256"):
+            return
+
+        await self.ingestion_ledger.record_run(
+            async_session=async_session,
+            sha256=ingestion_args["source_sha256"],
+            file_kind="csv",
+            file_name=ingestion_args.get(
+                "source_file_name", os.path.basename(ingestion_args["file_path"])
+            ),
+            status=status,
+            table_name=ingestion_args["table_name"],
+            row_count=(
+                inserted_count + skipped_count + (orphan_count or 0)
+                if inserted_count is not None and skipped_count is not None
+                else None
+            ),
+            inserted_count=inserted_count,
+            skipped_count=skipped_count,
+        )
+
+    async def __record_zip_runs(
+        self,
+        ingestion_args_list: List[Dict[str, str]],
+        load_counts_by_position: Dict[int, Tuple[int, int, int]],
+        status: IngestionRunStatus,
+    ) -> None:
+        zip_runs: Dict[str, Dict[str, Any]] = {}
+        for position, ingestion_args in enumerate(ingestion_args_list):
+            if not ingestion_args.get("zip_sha256"):
+                continue
+            zip_run = zip_runs.setdefault(
+                ingestion_args["zip_sha256"],
+                {
+                    "file_name": ingestion_args.get("zip_file_name", ""),
+                    "inserted_count": 0,
+                    "skipped_count": 0,
+                    "orphan_count": 0,
+                },
+            )
+            inserted_count, skipped_count, orphan_count = load_counts_by_position.get(
+                position, (0, 0, 0)
+            )
+            zip_run["inserted_count"] += inserted_count
+            zip_run["skipped_count"] += skipped_count
+            zip_run["orphan_count"] += orphan_count
+
+        if not zip_runs:
+            return
+
+        async with self.postgresql.async_session() as async_session:
+            for zip_sha256, zip_run in zip_runs.items():
+                is_completed = status == IngestionRunStatus.COMPLETED
+                await self.ingestion_ledger.record_run(
+                    async_session=async_session,
+                    sha256=zip_sha256,
+                    file_kind="zip",
+                    file_name=zip_run["file_name"],
+                    status=(
+                        IngestionRunStatus.PARTIAL
+                        if is_completed and zip_run["orphan_count"]
+                        else status
+                    ),
+                    row_count=(
+                        zip_run["inserted_count"]
+                        + zip_run["skipped_count"]
+                        + zip_run["orphan_count"]
+                        if is_completed
+                        else None
+                    ),
+                    inserted_count=zip_run["inserted_count"] if is_completed else None,
+                    skipped_count=zip_run["skipped_count"] if is_completed else None,
+                )
+            await async_session.commit()
+
+    async def __ensure_partitions(self, table_name: str, file_path: str) -> List[date]:
+        # Returns the months touched by the file, whose rollups the load refreshes.
+        model_class = self.sqlalchemy_model_by_table_name[table_name]
+        partition_column_name = PartitionManager.get_partition_column_name(model_class)
+        if partition_column_name is None:
+            return []
+
+        try:
+            if file_path.endswith(".parquet"):
+                values = (
+                    await asyncio.to_thread(
+                        pq.read_table, file_path, columns=[partition_column_name]
+                    )
+                )[partition_column_name]
+            else:
+                df = await asyncio.to_thread(
+                    pd.read_csv, file_path, usecols=[partition_column_name]
+                )
+                values = pa.array(
+                    pd.to_datetime(df[partition_column_name], format="ISO8601")
+                )
+            # A row without a partition key fits no month partition.
+            if values.null_count:
+                raise ValueError(
+                    f"{values.null_count} rows have no '{partition_column_name}'"
+                )
+            months = PartitionManager.get_months(values)
+            await self.partition_manager.ensure_month_partitions(
+                table_name=table_name, months=months
+            )
+            return months
+
+        except (
+            FileNotFoundError,
+            ValueError,
+            pd.errors.ParserError,
+            pa.ArrowException,
+            SQLAlchemyError,
+        ) as error:
+            message = f"Error creating partitions of '{table_name}' for {file_path}: {error.__class__.__name__}: {error}"
+            logger.error(message)
+            raise ToolException(message) from error
+
+    def __get_parent_positions_list(
+        self, ingestion_args_list: List[Dict[str, str]]
+    ) -> List[List[int]]:
+        # A child file (e.g. invoice items) waits for the parent files it references
+        # through foreign keys. Files share a month through their YYYYMM name prefix,
+        # so a child only waits for the parents of its own month when they exist.
+        months = [
+            self.__get_file_month(file_path=ingestion_args["file_path"])
+            for ingestion_args in ingestion_args_list
+        ]
+        parent_positions_list: List[List[int]] = []
+
+        for position, ingestion_args in enumerate(ingestion_args_list):
+            table_name = ingestion_args["table_name"]
+            model_class = self.sqlalchemy_model_by_table_name[table_name]
+            parent_table_names = {
+                fk.column.table.name for fk in model_class.__table__.foreign_keys
+            } - {table_name}
+            parent_positions = [
+                parent
+                for parent, parent_ingestion_args in enumerate(ingestion_args_list)
+                if parent_ingestion_args["table_name"] in parent_table_names
+            ]
+            same_month_parent_positions = [
+                parent
+                for parent in parent_positions
+                if months[position] is not None and months[parent] == months[position]
+            ]
+            parent_positions_list.append(
+                same_month_parent_positions or parent_positions
+            )
+
+        return parent_positions_list
+
+    @staticmethod
+    def __get_file_month(file_path: str) -> str | None:
+        matched = re.match(r"(\d{6})_", os.path.basename(file_path))
+        return matched.group(1) if matched else None
+
+    async def insert_chunks(
+        self,
+        async_session: AsyncSession,
+        table_name: str,
+        chunks: AsyncIterator[pa.Table],
+    ) -> Tuple[int, int, int]:
+        model_class = self.sqlalchemy_model_by_table_name[table_name]
+        ingestion_config = self.__get_ingestion_config(table_name)
+        model_fields = [
+            doc_field_info["field"]
+            for doc_field_info in ingestion_config[
+                "csv_columns_to_model_fields"
+            ].values()
+        ]
+        inserted_count: int = 0
+        skipped_count: int = 0
+        orphan_count: int = 0
+
+        # Rows are built straight from the Arrow chunks, without ORM instances.
+        row_builder = RowBuilder.get(model_class, tuple(model_fields))
+
+        async for table in chunks:
+            if self.streamlit_app_settings.ingestion_load_strategy == "copy":
+                (
+                    chunk_inserted_count,
+                    chunk_skipped_count,
+                    chunk_orphan_count,
+                ) = await self.__copy_records(
+                    async_session=async_session,
+                    model_class=model_class,
+                    model_fields=model_fields,
+                    records=row_builder.build_tuples(table),
+                )
+            else:
+                (
+                    chunk_inserted_count,
+                    chunk_skipped_count,
+                    chunk_orphan_count,
+                ) = await self.__add_records(
+                    async_session=async_session,
+                    model_class=model_class,
+                    records_data=row_builder.build_dicts(table),
+                )
+
+            inserted_count += chunk_inserted_count
+            skipped_count += chunk_skipped_count
+            orphan_count += chunk_orphan_count
+
+        return inserted_count, skipped_count, orphan_count
+
+    async def __aiter_file_chunks(
+        self, table_name: str, file_path: str
+    ) -> AsyncIterator[pa.Table]:
+        chunk_size = (
+            self.streamlit_app_settings.ingestion_chunk_size
+            if self.streamlit_app_settings.ingestion_streaming_enabled
+            else None
+        )
+
+        try:
+            if file_path.endswith(".parquet"):
+                parquet_file = pq.ParquetFile(file_path, memory_map=True)
+                if not chunk_size:
+                    yield await asyncio.to_thread(parquet_file.read)
+                    return
+
+                batches = parquet_file.iter_batches(batch_size=chunk_size)
+                while True:
+                    batch = await asyncio.to_thread(next, batches, None)
+                    if batch is None:
+                        break
+                    yield pa.Table.from_batches([batch])
+                return
+
+            # Mapped CSV files are still accepted, but need a full text parse.
+            model_class = self.sqlalchemy_model_by_table_name[table_name]
+            ingestion_config = self.__get_ingestion_config(table_name)
+            model_fields = [
+                doc_field_info["field"]
+                for doc_field_info in ingestion_config[
+                    "csv_columns_to_model_fields"
+                ].values()
+            ]
+            reader = await asyncio.to_thread(
+                pd.read_csv,
+                file_path,
+                dtype=ingestion_config["model_fields_to_dtypes"],
+                chunksize=chunk_size,
+            )
+            if not chunk_size:
+                yield model_class.to_arrow_table(df=reader, field_names=model_fields)
+                return
+
+            with reader:
+                while True:
+                    df = await asyncio.to_thread(next, reader, None)
+                    if df is None:
+                        break
+                    yield model_class.to_arrow_table(df=df, field_names=model_fields)
+
+        except (
+            FileNotFoundError,
+            UnicodeDecodeError,
+            pd.errors.ParserError,
+            pa.ArrowException,
+        ) as error:
+            message = (
+                f"Error reading file {file_path}: {error.__class__.__name__}: {error}"
+            )
+            logger.error(message)
+            raise ToolException(message) from error
+
+    def __get_ingestion_config(self, table_name: str) -> Dict[str, Any]:
+        for ingestion_config in self.ingestion_config_dict.values():
+            if ingestion_config["table_name"] == table_name:
+                return ingestion_config
+        message = f"Error: No ingestion configuration found for table '{table_name}'."
+        logger.error(message)
+        raise ToolException(message)
+
+    async def __add_records(
+        self,
+        async_session: AsyncSession,
+        model_class: Type[SQLAlchemyBaseModel],
+        records_data: List[Dict[str, Any]],
+    ) -> Tuple[int, int, int]:
+        batch_size = self.streamlit_app_settings.ingestion_insert_batch_size
+        inserted_count: int = 0
+        skipped_count: int = 0
+        orphan_count: int = 0
+
+        for start in range(0, len(records_data), batch_size):
+            batch_data = records_data[start : start + batch_size]
+            new_batch_data = await self.__filter_duplicate_records(
+                async_session=async_session,
+                model_class=model_class,
+                batch_data=batch_data,
+            )
+            (
+                batch_inserted_count,
+                batch_skipped_count,
+                batch_orphan_count,
+            ) = await self.__add_batch(
+                async_session=async_session,
+                model_class=model_class,
+                batch_data=new_batch_data,
+            )
+            inserted_count += batch_inserted_count
+            skipped_count += batch_skipped_count + len(batch_data) - len(new_batch_data)
+            orphan_count += batch_orphan_count
+
+        return inserted_count, skipped_count, orphan_count
+
+    @staticmethod
+    async def __filter_duplicate_records(
+        async_session: AsyncSession,
+        model_class: Type[SQLAlchemyBaseModel],
+        batch_data: List[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        # Drops the rows already stored (or repeated within the batch) for any of
+        # the unique constraints, so mostly-duplicate loads seldom need bisection.
+        table = model_class.__table__
+        unique_column_names_list = [
+            [column.name for column in constraint.columns]
+            for constraint in table.constraints
+            if isinstance(constraint, UniqueConstraint)
+        ]
+        keep_flags = [True] * len(batch_data)
+
+        try:
+            for unique_column_names in unique_column_names_list:
+                keys = [
+                    tuple(model_data.get(name) for name in unique_column_names)
+                    for model_data in batch_data
+                ]
+                columns = [table.columns[name] for name in unique_column_names]
+                result = await async_session.execute(
+                    select(*columns).where(tuple_(*columns).in_(set(keys)))
+                )
+                seen_keys = {tuple(row) for row in result.all()}
+
+                for position, key in enumerate(keys):
+                    if key in seen_keys:
+                        keep_flags[position] = False
+                    seen_keys.add(key)
+
+        except SQLAlchemyError as error:
+            message = f"Critical Error checking duplicate records for {model_class.get_table_name()}: {error.__class__.__name__}: {error}"
+            logger.error(message)
+            raise ToolException(message) from error
+
+        return [model_data for model_data, keep in zip(batch_data, keep_flags) if keep]
+
+    async def __add_batch(
+        self,
+        async_session: AsyncSession,
+        model_class: Type[SQLAlchemyBaseModel],
+        batch_data: List[Dict[str, Any]],
+    ) -> Tuple[int, int, int]:
+        if not batch_data:
+            return 0, 0, 0
+
+        try:
+            async with async_session.begin_nested():
+                await async_session.execute(insert(model_class.__table__), batch_data)
+
+        except IntegrityError as error:
+            # The savepoint was rolled back, so split the batch until each duplicate
+            # or row without parent is isolated; batches that succeed are never sent
+            # again.
+            if len(batch_data) == 1:
+                if getattr(error.orig, "sqlstate", None) == FOREIGN_KEY_VIOLATION:
+                    return 0, 0, 1
+                return 0, 1, 0
+            middle = len(batch_data) // 2
+            left_counts = await self.__add_batch(
+                async_session=async_session,
+                model_class=model_class,
+                batch_data=batch_data[:middle],
+            )
+            right_counts = await self.__add_batch(
+                async_session=async_session,
+                model_class=model_class,
+                batch_data=batch_data[middle:],
+            )
+            return tuple(
+                left_count + right_count
+                for left_count, right_count in zip(left_counts, right_counts)
+            )
+
+        except (SQLAlchemyError, Exception) as error:
+            await async_session.rollback()
+            message = f"Critical Error processing records for {model_class.get_table_name()}: {error.__class__.__name__}: {error}"
+            logger.error(message)
+            raise ToolException(message) from error
+
+        return len(batch_data), 0, 0
+
+    async def __copy_records(
+        self,
+        async_session: AsyncSession,
+        model_class: Type[SQLAlchemyBaseModel],
+        model_fields: List[str],
+        records: List[Tuple[Any, ...]],
+    ) -> Tuple[int, int, int]:
+        if not records:
+            return 0, 0, 0
+
+        table = model_class.__table__
+        table_name = model_class.get_table_name()
+        staging_table_name = f"{table_name}_staging_{uuid.uuid4().hex[:8]}"
+        column_list = ", ".join(model_fields)
+        staged_column_list = ", ".join(f"s.{field}" for field in model_fields)
+
+        # Rows whose parent record does not exist are counted apart from duplicates.
+        parent_conditions = [
+            f"EXISTS (SELECT 1 FROM {fk_constraint.referred_table.name} AS p WHERE "
+            + " AND ".join(
+                f"p.{fk.column.name} = s.{fk.parent.name}"
+                for fk in fk_constraint.elements
+            )
+            + ")"
+            for fk_constraint in table.foreign_key_constraints
+        ]
+        parent_condition = " AND ".join(parent_conditions) or "TRUE"
+
+        try:
+            await async_session.execute(
+                text(
+                    f"CREATE UNLOGGED TABLE {staging_table_name} AS "
+                    f"SELECT {column_list} FROM {table_name} WITH NO DATA"
+                )
+            )
+            await self.postgresql.copy_records_to_table(
+                async_session=async_session,
+                table_name=staging_table_name,
+                columns=model_fields,
+                records=records,
+            )
+            orphan_count = (
+                await async_session.execute(
+                    text(
+                        f"SELECT COUNT(*) FROM {staging_table_name} AS s "
+                        f"WHERE NOT ({parent_condition})"
+                    )
+                )
+            ).scalar_one()
+            result = await async_session.execute(
+                text(
+                    f"INSERT INTO {table_name} (id, {column_list}) "
+                    f"SELECT gen_random_uuid(), {staged_column_list} "
+                    f"FROM {staging_table_name} AS s WHERE {parent_condition} "
+                    "ON CONFLICT DO NOTHING"
+                )
+            )
+            await async_session.execute(text(f"DROP TABLE {staging_table_name}"))
+
+        except (SQLAlchemyError, Exception) as error:
+            await async_session.rollback()
+            message = f"Critical Error bulk loading records for {table_name}: {error.__class__.__name__}: {error}"
+            logger.error(message)
+            raise ToolException(message) from error
+
+        inserted_count = result.rowcount
+        return (
+            inserted_count,
+            len(records) - inserted_count - orphan_count,
+            orphan_count,
+        )
@@ -1,23 +1,59 @@
+import asyncio
+import json
 import os
 import re
-from typing import Any, Dict, List, Tuple, Type
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Sequence,
+    Tuple,
+    Type,
+)
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from langchain_core.tools import BaseTool, ToolException
 from pydantic import BaseModel, Field
 
 from src.core.logging import logger
+from src.core.profiling import PeakRSSSampler, get_peak_rss_mb
+from src.infra.db.ingestion_ledger import IngestionLedger
+from src.infra.db.models.base_model import (
+    BaseModel as SQLAlchemyBaseModel,
+)
+from src.infra.db.partition_manager import PartitionManager
+from src.settings.streamlit_app_settings import (
+    StreamlitAppSettings,
+)
 
 
 class MapCSVsToIngestionArgsInput(BaseModel):
     source_dir_path: str = Field(
         ...,
-        description="Path to the source directory containing the extracted CSV files.",
+        description=(
+            "Path to the source directory containing the extracted CSV files, "
+            "or to the ZIP file whose CSV files are read without extraction."
+        ),
     )
     destination_dir_path: str = Field(
         ...,
         description="Path to the destination directory where mapped files will be saved.",
     )
+    source_sha256_by_file_path: Dict[str, str] = Field(
+        default_factory=dict,
+        description="SHA-256 of the source files computed beforehand, reused instead of hashing them again.",
+    )
+    skipped_file_paths: List[str] = Field(
+        default_factory=list,
+        description="Source CSV files already ingested, which are left out of the mapping.",
+    )
 
 
 class MapCSVsToIngestionArgsTool(BaseTool):
@@ -27,42 +63,91 @@ class MapCSVsToIngestionArgsTool(BaseTool):
         "and saves the mapped files to a destination directory, returning the ingestion arguments."
     )
     ingestion_config_dict: dict[int, dict[str, Any]]
+    sqlalchemy_model_by_table_name: Dict[str, Type[SQLAlchemyBaseModel]]
+    streamlit_app_settings: StreamlitAppSettings
     args_schema: Type[BaseModel] = MapCSVsToIngestionArgsInput
     response_format: str = "content_and_artifact"
 
     def __init__(
         self,
         ingestion_config_dict: dict[int, dict[str, Any]],
+        sqlalchemy_model_by_table_name: Dict[str, Type[SQLAlchemyBaseModel]],
+        streamlit_app_settings: StreamlitAppSettings,
     ):
         super().__init__(
             ingestion_config_dict=ingestion_config_dict,
+            sqlalchemy_model_by_table_name=sqlalchemy_model_by_table_name,
+            streamlit_app_settings=streamlit_app_settings,
         )
         self.ingestion_config_dict = ingestion_config_dict
+        self.sqlalchemy_model_by_table_name = sqlalchemy_model_by_table_name
+        self.streamlit_app_settings = streamlit_app_settings
 
     def _run(
-        self, source_dir_path: str, destination_dir_path: str
+        self,
+        source_dir_path: str,
+        destination_dir_path: str,
+        source_sha256_by_file_path: Dict[str, str] | None = None,
+        skipped_file_paths: List[str] | None = None,
     ) -> Tuple[str, List[Dict[str, str]]]:
         logger.info(f"Calling {self.name}...")
+        source_sha256_by_file_path = source_sha256_by_file_path or {}
+        skipped_file_paths = set(skipped_file_paths or [])
         ingestion_args: List[Dict[str, str]] = []
+        total_rejected: int = 0
+        rss_sampler = PeakRSSSampler().start()
 
         try:
-            if not os.path.isdir(source_dir_path):
+            zip_file_path: str | None = None
+            if os.path.isfile(source_dir_path) and zipfile.is_zipfile(source_dir_path):
+                zip_file_path = source_dir_path
+                with zipfile.ZipFile(zip_file_path, "r") as zip_ref:
+                    zip_infos = [
+                        zip_info
+                        for zip_info in zip_ref.infolist()
+                        if zip_info.filename.endswith(".csv") and not zip_info.is_dir()
+                    ]
+                csv_file_paths = [zip_info.filename for zip_info in zip_infos]
+                zip_member_signatures = {
+                    zip_info.filename: {
+                        "crc": zip_info.CRC,
+                        "file_size": zip_info.file_size,
+                    }
+                    for zip_info in zip_infos
+                }
+                source_zip = {
+                    "zip_sha256": source_sha256_by_file_path.get(zip_file_path)
+                    or IngestionLedger.compute_sha256(file_path=zip_file_path),
+                    "zip_file_name": os.path.basename(zip_file_path),
+                }
+            elif os.path.isdir(source_dir_path):
+                csv_file_paths = [
+                    os.path.join(source_dir_path, f)
+                    for f in os.listdir(source_dir_path)
+                    if f.endswith(".csv")
+                    and os.path.isfile(os.path.join(source_dir_path, f))
+                ]
+                source_zip = self.__read_hidden_json(
+                    file_path=os.path.join(source_dir_path, ".source_zip.json")
+                )
+            else:
                 raise ToolException(f"Source directory not found: {source_dir_path}")
 
-            csv_file_paths = [
-                os.path.join(source_dir_path, f)
-                for f in os.listdir(source_dir_path)
-                if f.endswith(".csv")
-                and os.path.isfile(os.path.join(source_dir_path, f))
-            ]
-
             if not csv_file_paths:
                 raise ToolException(
                     f"No CSV files found in the source directory: {source_dir_path}"
                 )
 
+            mapping_jobs: List[Dict[str, Any]] = []
+            num_already_ingested: int = 0
             for file_path in csv_file_paths:
                 file_name = os.path.basename(file_path)
+                if file_path in skipped_file_paths:
+                    logger.info(
+                        f"Skipping {file_path}: its source file was already ingested."
+                    )
+                    num_already_ingested += 1
+                    continue
 
                 matched = False
                 for _, ingestion_config in self.ingestion_config_dict.items():
@@ -70,69 +155,23 @@ class MapCSVsToIngestionArgsTool(BaseTool):
                         rf"\d{{6}}_{ingestion_config['file_suffix']}\.csv$", file_name
                     ):
                         matched = True
-                        df: pd.DataFrame = pd.DataFrame()
-
-                        try:
-                            df = pd.read_csv(
-                                file_path,
-                                encoding="latin1",
-                                sep=";",
-                            )
-                        except (
-                            FileNotFoundError,
-                            UnicodeDecodeError,
-                            Exception,
-                        ) as error:
-                            message = f"Error reading file {file_path}: {error.__class__.__name__}: {error}"
-                            logger.error(message)
-                            raise ToolException(message) from error
-
-                        df_concatenated: pd.DataFrame = pd.DataFrame()
-
-                        for index, row in df.iterrows():
-                            try:
-                                model_data = {}
-                                for (
-                                    csv_col,
-                                    doc_field_info,
-                                ) in ingestion_config[
-                                    "csv_columns_to_model_fields"
-                                ].items():
-                                    field_name = doc_field_info["field"]
-                                    converter = doc_field_info.get("converter")
-                                    value = row.get(csv_col)
-
-                                    if value is pd.NA or pd.isna(value):
-                                        value = None
-
-                                    if converter:
-                                        try:
-                                            value = converter(value)
-                                        except ValueError as error:
-                                            message = f"Warning: Could not convert '{value}' for field '{field_name}' in row {index + 1} of {file_path}: {error}"
-                                            logger.warning(message)
-                                            continue
-
-                                    model_data[field_name] = value
-
-                                df_concatenated = pd.concat(
-                                    [df_concatenated, pd.DataFrame([model_data])],
-                                    ignore_index=True,
-                                )
-                            except Exception as error:
-                                message = f"Warning: Failed to process row {index + 1} from {file_path}: {error}"
-                                logger.warning(message)
-                                continue
-
-                        output_file_path = os.path.join(destination_dir_path, file_name)
-                        df_concatenated.to_csv(
-                            path_or_buf=output_file_path, index=False
-                        )
-
-                        ingestion_args.append(
+                        mapping_jobs.append(
                             {
-                                "table_name": ingestion_config["table_name"],
-                                "file_path": output_file_path,
+                                "file_path": file_path,
+                                "zip_file_path": zip_file_path,
+                                "source_sha256": source_sha256_by_file_path.get(
+                                    file_path
+                                ),
+                                "ingestion_config": ingestion_config,
+                                "output_file_path": os.path.join(
+                                    destination_dir_path,
+                                    f"{os.path.splitext(file_name)[0]}.parquet",
+                                ),
+                                "debug_csv_file_path": (
+                                    os.path.join(destination_dir_path, file_name)
+                                    if self.streamlit_app_settings.ingestion_write_debug_csv
+                                    else None
+                                ),
                             }
                         )
                         break
@@ -142,8 +181,82 @@ class MapCSVsToIngestionArgsTool(BaseTool):
                         f"No ingestion configuration matched for file: {file_name}"
                     )
 
+            manifest: Dict[str, Any] = {}
+            if zip_file_path:
+                # The manifest is a hidden file, so it survives the clean-up of mapped files.
+                manifest = self.__read_hidden_json(
+                    file_path=os.path.join(destination_dir_path, ".zip_manifest.json")
+                )
+                skipped_mapping_jobs = [
+                    mapping_job
+                    for mapping_job in mapping_jobs
+                    if self.__matches_signature(
+                        manifest_entry=manifest.get(mapping_job["file_path"], {}),
+                        signature=zip_member_signatures[mapping_job["file_path"]],
+                    )
+                    and os.path.isfile(mapping_job["output_file_path"])
+                ]
+                for mapping_job in skipped_mapping_jobs:
+                    logger.info(
+                        f"Skipping {mapping_job['file_path']}: CRC and size match its earlier mapping."
+                    )
+                    ingestion_args.append(
+                        self.__build_ingestion_args(
+                            mapping_job=mapping_job,
+                            source_sha256=manifest[mapping_job["file_path"]][
+                                "source_sha256"
+                            ],
+                            source_zip=source_zip,
+                        )
+                    )
+                mapping_jobs = [
+                    mapping_job
+                    for mapping_job in mapping_jobs
+                    if mapping_job not in skipped_mapping_jobs
+                ]
+
+            for mapping_job, (num_rows, num_rejected, source_sha256) in zip(
+                mapping_jobs, self.__run_mapping_jobs(mapping_jobs=mapping_jobs)
+            ):
+                if num_rejected:
+                    logger.warning(
+                        f"Warning: Rejected {num_rejected} of {num_rows} rows from {mapping_job['file_path']} due to conversion errors or missing partition keys."
+                    )
+                    total_rejected += num_rejected
+
+                ingestion_args.append(
+                    self.__build_ingestion_args(
+                        mapping_job=mapping_job,
+                        source_sha256=source_sha256,
+                        source_zip=source_zip,
+                    )
+                )
+                if zip_file_path:
+                    manifest[mapping_job["file_path"]] = {
+                        **zip_member_signatures[mapping_job["file_path"]],
+                        "source_sha256": source_sha256,
+                    }
+
+            if zip_file_path:
+                with open(
+                    os.path.join(destination_dir_path, ".zip_manifest.json"),
+                    "w",
+                    encoding="utf-8",
+                ) as manifest_file:
+                    json.dump(manifest, manifest_file)
+
+            rss_sampler.stop()
+            logger.info(
+                f"CSV mapping peak RSS during the run: {rss_sampler.format_peak_rss()} "
+                "(largest finished worker process since startup: "
+                f"{get_peak_rss_mb(children=True):.1f} MB)."
+            )
             num_args = len(ingestion_args)
             content = f"Successfully mapped {num_args} CSV files to ingestion arguments. Ready for database insertion."
+            if total_rejected:
+                content += f" {total_rejected} rows were rejected due to conversion errors or missing partition keys."
+            if num_already_ingested:
+                content += f" {num_already_ingested} files were skipped because they were already ingested."
             artifact = ingestion_args
 
             return content, artifact
@@ -156,10 +269,259 @@ class MapCSVsToIngestionArgsTool(BaseTool):
             logger.error(message)
             raise ToolException(message) from error
 
+        finally:
+            rss_sampler.stop()
+
+    def __run_mapping_jobs(
+        self, mapping_jobs: List[Dict[str, Any]]
+    ) -> List[Tuple[int, int, str]]:
+        max_workers = min(
+            self.streamlit_app_settings.ingestion_max_workers, len(mapping_jobs)
+        )
+        if max_workers <= 1:
+            return [
+                self.write_mapped_file(**mapping_job) for mapping_job in mapping_jobs
+            ]
+
+        # Each file is mapped in its own process, so parsing and conversion of
+        # several monthly files run on separate cores instead of sharing the GIL.
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self.write_mapped_file, **mapping_job)
+                for mapping_job in mapping_jobs
+            ]
+            return [future.result() for future in futures]
+
+    @staticmethod
+    def __read_hidden_json(file_path: str) -> Dict[str, Any]:
+        if not os.path.isfile(file_path):
+            return {}
+        try:
+            with open(file_path, "r", encoding="utf-8") as json_file:
+                return json.load(json_file)
+        except (OSError, json.JSONDecodeError) as error:
+            logger.warning(f"Ignoring unreadable file {file_path}: {error}")
+            return {}
+
+    @staticmethod
+    def __matches_signature(
+        manifest_entry: Dict[str, Any], signature: Dict[str, int]
+    ) -> bool:
+        return "source_sha256" in manifest_entry and all(
+            manifest_entry.get(key) == value for key, value in signature.items()
+        )
+
+    @staticmethod
+    def __build_ingestion_args(
+        mapping_job: Dict[str, Any],
+        source_sha256: str,
+        source_zip: Dict[str, str],
+    ) -> Dict[str, str]:
+        return {
+            "table_name": mapping_job["ingestion_config"]["table_name"],
+            "file_path": mapping_job["output_file_path"],
+            "source_file_name": os.path.basename(mapping_job["file_path"]),
+            "source_sha256": source_sha256,
+            **source_zip,
+        }
+
+    def write_mapped_file(
+        self,
+        file_path: str,
+        ingestion_config: Dict[str, Any],
+        output_file_path: str,
+        debug_csv_file_path: str | None,
+        zip_file_path: str | None = None,
+        source_sha256: str | None = None,
+    ) -> Tuple[int, int, str]:
+        num_rows: int = 0
+        num_rejected: int = 0
+        parquet_writer: pq.ParquetWriter | None = None
+
+        try:
+            for chunk_index, (table, chunk_num_rejected) in enumerate(
+                self.iter_mapped_chunks(
+                    file_path=file_path,
+                    ingestion_config=ingestion_config,
+                    zip_file_path=zip_file_path,
+                )
+            ):
+                if parquet_writer is None:
+                    parquet_writer = pq.ParquetWriter(
+                        where=output_file_path, schema=table.schema
+                    )
+                parquet_writer.write_table(table)
+
+                if debug_csv_file_path:
+                    table.to_pandas().to_csv(
+                        path_or_buf=debug_csv_file_path,
+                        mode="w" if chunk_index == 0 else "a",
+                        header=chunk_index == 0,
+                        index=False,
+                    )
+
+                num_rows += table.num_rows + chunk_num_rejected
+                num_rejected += chunk_num_rejected
+
+        finally:
+            if parquet_writer is not None:
+                parquet_writer.close()
+
+        source_sha256 = source_sha256 or IngestionLedger.compute_sha256(
+            file_path=file_path, zip_file_path=zip_file_path
+        )
+
+        return num_rows, num_rejected, source_sha256
+
+    def iter_mapped_chunks(
+        self,
+        file_path: str,
+        ingestion_config: Dict[str, Any],
+        zip_file_path: str | None = None,
+    ) -> Iterator[Tuple[pa.Table, int]]:
+        # In streaming mode only one chunk of the source file is held in memory at
+        # a time; otherwise the whole file is mapped as a single chunk.
+        chunk_size = (
+            self.streamlit_app_settings.ingestion_chunk_size
+            if self.streamlit_app_settings.ingestion_streaming_enabled
+            else None
+        )
+        model_class = self.sqlalchemy_model_by_table_name[
+            ingestion_config["table_name"]
+        ]
+        csv_columns_to_model_fields = ingestion_config["csv_columns_to_model_fields"]
+        model_fields = [
+            doc_field_info["field"]
+            for doc_field_info in csv_columns_to_model_fields.values()
+        ]
+        schema = model_class.get_arrow_schema(field_names=model_fields)
+        # Rows without a partition key are rejected rather than given a made-up month.
+        partition_column_name = PartitionManager.get_partition_column_name(model_class)
+        required_fields = [partition_column_name] if partition_column_name else []
+        # Text columns are read as-is so codes such as CNPJ keep their leading zeros.
+        dtype = {
+            csv_column: str
+            for csv_column, doc_field_info in csv_columns_to_model_fields.items()
+            if pa.types.is_string(schema.field(doc_field_info["field"]).type)
+        }
+
+        try:
+            with ExitStack() as exit_stack:
+                # ZIP members are decompressed while being parsed, never written to disk.
+                source = (
+                    exit_stack.enter_context(
+                        exit_stack.enter_context(
+                            zipfile.ZipFile(zip_file_path, "r")
+                        ).open(file_path)
+                    )
+                    if zip_file_path
+                    else file_path
+                )
+                reader = pd.read_csv(
+                    source,
+                    encoding="latin1",
+                    sep=";",
+                    dtype=dtype,
+                    chunksize=chunk_size,
+                )
+                chunks = reader if chunk_size else iter([reader])
+
+                for df in chunks:
+                    df_mapped, rejected_mask = self.map_dataframe(
+                        df=df,
+                        csv_columns_to_model_fields=csv_columns_to_model_fields,
+                        required_fields=required_fields,
+                    )
+                    table = model_class.to_arrow_table(
+                        df=df_mapped, field_names=model_fields
+                    )
+                    yield table, int(rejected_mask.sum())
+
+        except (
+            FileNotFoundError,
+            UnicodeDecodeError,
+            pd.errors.ParserError,
+            pa.ArrowInvalid,
+            zipfile.BadZipFile,
+        ) as error:
+            message = (
+                f"Error reading file {file_path}: {error.__class__.__name__}: {error}"
+            )
+            logger.error(message)
+            raise ToolException(message) from error
+
+    @staticmethod
+    def map_dataframe(
+        df: pd.DataFrame,
+        csv_columns_to_model_fields: Dict[str, Dict[str, Any]],
+        required_fields: Sequence[str] = (),
+    ) -> Tuple[pd.DataFrame, pd.Series]:
+        csv_columns = list(csv_columns_to_model_fields.keys())
+        df_mapped = df.reindex(columns=csv_columns).rename(
+            columns={
+                csv_col: doc_field_info["field"]
+                for csv_col, doc_field_info in csv_columns_to_model_fields.items()
+            }
+        )
+        rejected_mask = pd.Series(False, index=df_mapped.index)
+
+        for doc_field_info in csv_columns_to_model_fields.values():
+            field_name = doc_field_info["field"]
+            batch_converter = doc_field_info.get("batch_converter")
+            converter = doc_field_info.get("converter")
+
+            if batch_converter:
+                converted_values, invalid_mask = batch_converter(df_mapped[field_name])
+            elif converter:
+                converted_values, invalid_mask = (
+                    MapCSVsToIngestionArgsTool.__convert_column(
+                        column=df_mapped[field_name], converter=converter
+                    )
+                )
+            else:
+                continue
+
+            df_mapped[field_name] = converted_values
+            rejected_mask |= invalid_mask
+
+        for field_name in required_fields:
+            rejected_mask |= df_mapped[field_name].isna()
+
+        df_mapped = df_mapped.loc[~rejected_mask].reset_index(drop=True)
+
+        return df_mapped, rejected_mask
+
+    @staticmethod
+    def __convert_column(
+        column: pd.Series, converter: Callable[[Any], Any]
+    ) -> Tuple[pd.Series, pd.Series]:
+        values = column.astype(object).where(column.notna(), None).tolist()
+        converted_values: List[Any] = [None] * len(values)
+        invalid_flags: List[bool] = [False] * len(values)
+
+        for position, value in enumerate(values):
+            try:
+                converted_values[position] = converter(value)
+            except Exception:
+                invalid_flags[position] = True
+
+        return (
+            pd.Series(converted_values, index=column.index),
+            pd.Series(invalid_flags, index=column.index),
+        )
+
     async def _arun(
-        self, source_dir_path: str, destination_dir_path: str
+        self,
+        source_dir_path: str,
+        destination_dir_path: str,
+        source_sha256_by_file_path: Dict[str, str] | None = None,
+        skipped_file_paths: List[str] | None = None,
     ) -> Tuple[str, List[str]]:
-        return self._run(
+        # Mapping runs off the shared event loop, which keeps serving other sessions.
+        return await asyncio.to_thread(
+            self._run,
             source_dir_path=source_dir_path,
             destination_dir_path=destination_dir_path,
+            source_sha256_by_file_path=source_sha256_by_file_path,
+            skipped_file_paths=skipped_file_paths,
         )
@@ -1,11 +1,15 @@
+import asyncio
+import json
 import os
 import zipfile
-from typing import List, Tuple, Type
+import zlib
+from typing import List, Optional, Tuple, Type
 
 from langchain_core.tools import BaseTool, ToolException
 from pydantic import BaseModel, Field
 
 from src.core.logging import logger
+from src.infra.db.ingestion_ledger import IngestionLedger
 
 
 class UnzipZipFileToolInput(BaseModel):
@@ -17,6 +21,10 @@ class UnzipZipFileToolInput(BaseModel):
         default=...,
         description="Path to the destination directory where CSV files be extracted.",
     )
+    zip_sha256: Optional[str] = Field(
+        default=None,
+        description="SHA-256 of the ZIP file, when already computed.",
+    )
 
 
 class UnzipZipFileTool(BaseTool):
@@ -26,7 +34,10 @@ class UnzipZipFileTool(BaseTool):
     response_format: str = "content_and_artifact"
 
     def _run(
-        self, source_dir_path: str, destination_dir_path: str
+        self,
+        source_dir_path: str,
+        destination_dir_path: str,
+        zip_sha256: Optional[str] = None,
     ) -> Tuple[str, List[str]]:
         logger.info(f"Calling {self.name}...")
         logger.info(f"source_dir_path: {source_dir_path}")
@@ -42,13 +53,36 @@ class UnzipZipFileTool(BaseTool):
                 )
 
             with zipfile.ZipFile(source_dir_path, "r") as zip_ref:
-                zip_ref.extractall(destination_dir_path)
-
-                extracted_file_paths = [
-                    os.path.join(destination_dir_path, name)
-                    for name in zip_ref.namelist()
-                    if not name.endswith("/")
-                ]
+                for zip_info in zip_ref.infolist():
+                    if zip_info.is_dir():
+                        continue
+
+                    file_path = os.path.join(destination_dir_path, zip_info.filename)
+                    if self.__is_already_extracted(
+                        file_path=file_path, zip_info=zip_info
+                    ):
+                        logger.info(
+                            f"Skipping {zip_info.filename}: CRC and size match the file already extracted."
+                        )
+                    else:
+                        zip_ref.extract(zip_info, destination_dir_path)
+
+                    extracted_file_paths.append(file_path)
+
+            # Lets the mapping step tell which ZIP file the extracted CSV files came from.
+            with open(
+                os.path.join(destination_dir_path, ".source_zip.json"),
+                "w",
+                encoding="utf-8",
+            ) as source_zip_file:
+                json.dump(
+                    {
+                        "zip_sha256": zip_sha256
+                        or IngestionLedger.compute_sha256(file_path=source_dir_path),
+                        "zip_file_name": os.path.basename(source_dir_path),
+                    },
+                    source_zip_file,
+                )
 
             csv_file_paths = [file.replace("\\", "/") for file in extracted_file_paths]
 
@@ -67,10 +101,30 @@ class UnzipZipFileTool(BaseTool):
             logger.error(message)
             raise ToolException(message)
 
+    @staticmethod
+    def __is_already_extracted(file_path: str, zip_info: zipfile.ZipInfo) -> bool:
+        if (
+            not os.path.isfile(file_path)
+            or os.path.getsize(file_path) != zip_info.file_size
+        ):
+            return False
+
+        crc = 0
+        with open(file_path, "rb") as extracted_file:
+            while block := extracted_file.read(1024 * 1024):
+                crc = zlib.crc32(block, crc)
+        return crc == zip_info.CRC
+
     async def _arun(
-        self, source_dir_path: str, destination_dir_path: str
+        self,
+        source_dir_path: str,
+        destination_dir_path: str,
+        zip_sha256: Optional[str] = None,
     ) -> Tuple[str, List[str]]:
-        return self._run(
+        # Extraction runs off the shared event loop, which keeps serving other sessions.
+        return await asyncio.to_thread(
+            self._run,
             source_dir_path=source_dir_path,
             destination_dir_path=destination_dir_path,
+            zip_sha256=zip_sha256,
         )
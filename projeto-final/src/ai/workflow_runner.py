@@ -1,8 +1,10 @@
-import os
+import threading
 import time
+from typing import Dict
 
 from langchain_core.messages import HumanMessage
 from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+from langgraph.graph.state import CompiledStateGraph
 from openai import RateLimitError
 
 from src.ai.workflows.base_workflow import (
@@ -26,6 +28,50 @@ class WorkflowRunner:
         self.ai_settings = ai_settings
         self.streamlit_app_settings = streamlit_app_settings
         self.postgresql = postgresql
+        self.__is_checkpointer_set_up = False
+        # Graphs are compiled once per process, and their checkpointed copies share
+        # the process-wide checkpointer pool.
+        self.__lock = threading.Lock()
+        self.__compiled_graph_by_workflow_name: Dict[str, CompiledStateGraph] = {}
+        self.__checkpointed_graph_by_workflow_name: Dict[str, CompiledStateGraph] = {}
+
+    async def setup_checkpointer(self) -> None:
+        if self.__is_checkpointer_set_up:
+            return
+        checkpointer = AsyncPostgresSaver(
+            conn=await self.postgresql.get_checkpointer_pool()
+        )
+        table_exists = await self.postgresql.table_exists("checkpoints")
+
+        if not table_exists:
+            logger.info(
+                "Setting up PostgresSaver: 'checkpoints' table not found. Creating it..."
+            )
+            await checkpointer.setup()
+            logger.info("PostgresSaver setup complete.")
+        else:
+            logger.info(
+                "PostgresSaver setup skipped. 'checkpoints' table already exists."
+            )
+        self.__is_checkpointer_set_up = True
+
+    async def get_compiled_graph(self, workflow: BaseWorkflow) -> CompiledStateGraph:
+        checkpointer_pool = await self.postgresql.get_checkpointer_pool()
+        with self.__lock:
+            if workflow.name not in self.__compiled_graph_by_workflow_name:
+                self.__compiled_graph_by_workflow_name[workflow.name] = (
+                    workflow.workflow.compile()
+                )
+                logger.info(f"Graph {workflow.name} compiled successfully!")
+            if workflow.name not in self.__checkpointed_graph_by_workflow_name:
+                self.__checkpointed_graph_by_workflow_name[workflow.name] = (
+                    self.__compiled_graph_by_workflow_name[workflow.name].copy(
+                        update={
+                            "checkpointer": AsyncPostgresSaver(conn=checkpointer_pool)
+                        }
+                    )
+                )
+            return self.__checkpointed_graph_by_workflow_name[workflow.name]
 
     async def run_workflow(
         self, workflow: BaseWorkflow, input_message: str, thread_id: str
@@ -33,60 +79,37 @@ class WorkflowRunner:
         for attempt in range(self.ai_settings.llm_max_retries):
             try:
                 try:
-                    async with AsyncPostgresSaver.from_conn_string(
-                        conn_string=self.postgresql.get_conn_string()
-                    ) as checkpointer:
-                        table_exists = await self.postgresql.table_exists("checkpoints")
-
-                        if not table_exists:
-                            logger.info(
-                                "Setting up PostgresSaver: 'checkpoints' table not found. Creating it..."
-                            )
-                            await checkpointer.setup()
-                            logger.info("PostgresSaver setup complete.")
-                        else:
+                    start_time = time.perf_counter()
+                    # The checkpointer setup only runs on the first workflow of the process.
+                    await self.setup_checkpointer()
+                    compiled_graph_with_checkpointer = await self.get_compiled_graph(
+                        workflow
+                    )
+                    input_state = {"messages": [HumanMessage(content=input_message)]}
+                    first_chunk_time = None
+                    async for chunk in compiled_graph_with_checkpointer.astream(
+                        input_state,
+                        subgraphs=True,
+                        config={
+                            "configurable": {
+                                "thread_id": thread_id,
+                            },
+                            "recursion_limit": 50,
+                        },
+                    ):
+                        if first_chunk_time is None:
+                            first_chunk_time = time.perf_counter()
                             logger.info(
-                                "PostgresSaver setup skipped. 'checkpoints' table already exists."
+                                f"Workflow {workflow.name} first chunk after {first_chunk_time - start_time:.3f}s."
                             )
-
-                        compiled_graph_with_checkpointer = workflow.workflow.compile(
-                            checkpointer=checkpointer
-                        )
-                        logger.info(
-                            "Graph re-compiled with PostgresSaver checkpointer."
-                        )
-                        logger.info(f"Graph {workflow.name} compiled successfully!")
-                        logger.info(
-                            f"Nodes in graph: {compiled_graph_with_checkpointer.nodes.keys()}"
-                        )
-                        logger.info(
-                            compiled_graph_with_checkpointer.get_graph().draw_ascii()
-                        )
-                        compiled_graph_with_checkpointer.get_graph().draw_mermaid_png(
-                            output_file_path=os.path.join(
-                                f"{self.streamlit_app_settings.data_output_workflow_dir_path}",
-                                f"{workflow.name}.png",
-                            ),
-                        )
-                        input_state = {
-                            "messages": [HumanMessage(content=input_message)]
-                        }
-                        async for chunk in compiled_graph_with_checkpointer.astream(
-                            input_state,
-                            subgraphs=True,
-                            config={
-                                "configurable": {
-                                    "thread_id": thread_id,
-                                },
-                                "recursion_limit": 50,
-                            },
-                        ):
-                            pass
-                        final_state = await compiled_graph_with_checkpointer.aget_state(
-                            config={"configurable": {"thread_id": thread_id}}
-                        )
-                        result_messages = final_state.values["messages"]
-                        return {"messages": result_messages}
+                    final_state = await compiled_graph_with_checkpointer.aget_state(
+                        config={"configurable": {"thread_id": thread_id}}
+                    )
+                    result_messages = final_state.values["messages"]
+                    logger.info(
+                        f"PostgreSQL pool stats: {self.postgresql.get_pool_stats()}"
+                    )
+                    return {"messages": result_messages}
                 except Exception as e:
                     logger.error(
                         f"Failed to execute query for thread_id '{thread_id}': {e}",
@@ -0,0 +1,3 @@
+from .query_result_cache import QueryResultCache
+
+__all__ = ["QueryResultCache"]
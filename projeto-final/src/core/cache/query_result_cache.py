@@ -0,0 +1,108 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from src.core.logging import logger
+
+# Quoted literals and identifiers are kept verbatim by the SQL normalization.
+QUOTED_SQL_PATTERN = re.compile(r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\")")
+
+
+class QueryResultCache:
+    def __init__(self, max_entries: int, ttl_seconds: float, max_bytes: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.__lock = threading.Lock()
+        self.__data_version = 0
+        self.__entries: OrderedDict[Tuple[int, str], Tuple[Any, int, float]] = (
+            OrderedDict()
+        )
+        self.__num_bytes = 0
+        self.__hit_count = 0
+        self.__miss_count = 0
+        self.__eviction_count = 0
+
+    @staticmethod
+    def normalize_sql(query: str) -> str:
+        parts = QUOTED_SQL_PATTERN.split(query.strip().rstrip(";").strip())
+        return "".join(
+            part if index % 2 else re.sub(r"\s+", " ", part).lower()
+            for index, part in enumerate(parts)
+        )
+
+    @classmethod
+    def is_cacheable(cls, query: str) -> bool:
+        return cls.normalize_sql(query).startswith(("select", "with"))
+
+    def get_data_version(self) -> int:
+        with self.__lock:
+            return self.__data_version
+
+    def bump_data_version(self) -> int:
+        # Entries of older versions can no longer be hit, so they are dropped at once.
+        with self.__lock:
+            self.__data_version += 1
+            self.__eviction_count += len(self.__entries)
+            self.__entries.clear()
+            self.__num_bytes = 0
+            logger.info(
+                f"Query result cache data version bumped to {self.__data_version}."
+            )
+            return self.__data_version
+
+    def get(self, query: str) -> Optional[Any]:
+        with self.__lock:
+            key = (self.__data_version, self.normalize_sql(query))
+            entry = self.__entries.get(key)
+            if entry is None:
+                self.__miss_count += 1
+                return None
+            result, num_bytes, expires_at = entry
+            if expires_at <= time.monotonic():
+                self.__pop(key)
+                self.__miss_count += 1
+                return None
+            self.__entries.move_to_end(key)
+            self.__hit_count += 1
+            return result
+
+    def set(self, query: str, result: Any, data_version: int, num_bytes: int) -> None:
+        if self.max_entries <= 0 or num_bytes > self.max_bytes:
+            return
+        with self.__lock:
+            # A result read before an ingestion commit must not be served after it.
+            if data_version != self.__data_version:
+                return
+            key = (data_version, self.normalize_sql(query))
+            if key in self.__entries:
+                self.__pop(key)
+            self.__entries[key] = (
+                result,
+                num_bytes,
+                time.monotonic() + self.ttl_seconds,
+            )
+            self.__num_bytes += num_bytes
+            while (
+                len(self.__entries) > self.max_entries
+                or self.__num_bytes > self.max_bytes
+            ):
+                self.__pop(next(iter(self.__entries)))
+
+    def get_metrics(self) -> Dict[str, int]:
+        with self.__lock:
+            return {
+                "data_version": self.__data_version,
+                "entry_count": len(self.__entries),
+                "byte_count": self.__num_bytes,
+                "hit_count": self.__hit_count,
+                "miss_count": self.__miss_count,
+                "eviction_count": self.__eviction_count,
+            }
+
+    def __pop(self, key: Tuple[int, str]) -> None:
+        _, num_bytes, _ = self.__entries.pop(key)
+        self.__num_bytes -= num_bytes
+        self.__eviction_count += 1
@@ -1,3 +1,5 @@
+from concurrent.futures import ThreadPoolExecutor
+
 from dependency_injector import containers, providers
 
 from src.ai.agents.csv_mapping_agent import (
@@ -16,6 +18,9 @@ from src.ai.agents.unzip_file_agent import (
     UnzipFileAgent,
 )
 from src.ai.llm.llm import LLM
+from src.ai.pipelines.invoice_ingestion_pipeline import (
+    InvoiceIngestionPipeline,
+)
 from src.ai.toolkits.async_sql_database_toolkit import (
     AsyncSQLDatabaseToolkit,
 )
@@ -44,7 +49,14 @@ from src.ai.workflow_runner import WorkflowRunner
 from src.ai.workflows.invoice_mgmt_workflow import (
     InvoiceMgmtWorkflow,
 )
+from src.core.cache import QueryResultCache
+from src.core.event_loop import BackgroundEventLoop
+from src.infra.db.dashboard_metric_engine import DashboardMetricEngine
+from src.infra.db.ingestion_ledger import IngestionLedger
+from src.infra.db.partition_manager import PartitionManager
 from src.infra.db.postgresql import PostgreSQL
+from src.infra.db.rollup_manager import RollupManager
+from src.infra.db.schema_catalog import SchemaCatalog
 from src.settings.ai_settings import AISettings
 from src.settings.postgresql_db_settings import (
     PostgreSQLDBSettings,
@@ -65,10 +77,34 @@ class Container(containers.DeclarativeContainer):
     # LLM
     llm = providers.Singleton(LLM, ai_settings=ai_settings)
 
+    # Event loop
+    background_event_loop = providers.Singleton(BackgroundEventLoop)
+
     # Database
     postgresql = providers.Singleton(
         PostgreSQL, postgresql_db_settings=postgresql_db_settings
     )
+    ingestion_ledger = providers.Singleton(IngestionLedger, postgresql=postgresql)
+    partition_manager = providers.Singleton(PartitionManager, postgresql=postgresql)
+    rollup_manager = providers.Singleton(RollupManager)
+
+    # Cache
+    query_result_cache = providers.Singleton(
+        QueryResultCache,
+        max_entries=streamlit_app_settings.provided.query_cache_max_entries,
+        ttl_seconds=streamlit_app_settings.provided.query_cache_ttl_seconds,
+        max_bytes=streamlit_app_settings.provided.query_cache_max_bytes,
+    )
+    schema_catalog = providers.Singleton(
+        SchemaCatalog,
+        postgresql=postgresql,
+        query_result_cache=query_result_cache,
+    )
+    dashboard_metric_engine = providers.Singleton(
+        DashboardMetricEngine,
+        postgresql=postgresql,
+        query_result_cache=query_result_cache,
+    )
 
     # Agents
     unzip_file_agent = providers.Singleton(
@@ -93,30 +129,49 @@ class Container(containers.DeclarativeContainer):
     # Tools
     unzip_zip_file_tool = providers.Singleton(UnzipZipFileTool)
     map_csvs_to_ingestion_args_tool = providers.Singleton(
-        MapCSVsToIngestionArgsTool, ingestion_config_dict=config.ingestion_config_dict
+        MapCSVsToIngestionArgsTool,
+        ingestion_config_dict=config.ingestion_config_dict,
+        sqlalchemy_model_by_table_name=config.sqlalchemy_model_by_table_name,
+        streamlit_app_settings=streamlit_app_settings,
     )
     insert_records_into_database_tool = providers.Singleton(
         InsertRecordsIntoDatabaseTool,
         postgresql=postgresql,
         sqlalchemy_model_by_table_name=config.sqlalchemy_model_by_table_name,
         ingestion_config_dict=config.ingestion_config_dict,
+        streamlit_app_settings=streamlit_app_settings,
+        ingestion_ledger=ingestion_ledger,
+        query_result_cache=query_result_cache,
+        partition_manager=partition_manager,
+        rollup_manager=rollup_manager,
     )
     async_sql_database_toolkit = providers.Singleton(
         AsyncSQLDatabaseToolkit,
         postgresql=postgresql,
         chat_model=llm.provided.chat_model,
+        streamlit_app_settings=streamlit_app_settings,
+        schema_catalog=schema_catalog,
+        query_result_cache=query_result_cache,
     )
     get_detailed_table_schemas_tool = providers.Singleton(
         GetDetailedTableSchemasTool,
         postgresql=postgresql,
+        schema_catalog=schema_catalog,
+    )
+    plot_thread_pool_executor = providers.Singleton(
+        ThreadPoolExecutor,
+        max_workers=streamlit_app_settings.provided.plot_max_workers,
+        thread_name_prefix="plot",
     )
     generate_bar_plot_tool = providers.Singleton(
         GenerateBarPlotTool,
         postgresql=postgresql,
+        thread_pool_executor=plot_thread_pool_executor,
     )
     generate_distribution_plot_tool = providers.Singleton(
         GenerateDistributionPlotTool,
         postgresql=postgresql,
+        thread_pool_executor=plot_thread_pool_executor,
     )
 
     # Handoff tools
@@ -158,6 +213,16 @@ class Container(containers.DeclarativeContainer):
         delegate_to_data_analysis_agent_tool=delegate_to_data_analysis_agent_tool,
     )
 
+    # Pipelines
+    invoice_ingestion_pipeline = providers.Singleton(
+        InvoiceIngestionPipeline,
+        streamlit_app_settings=streamlit_app_settings,
+        unzip_zip_file_tool=unzip_zip_file_tool,
+        map_csvs_to_ingestion_args_tool=map_csvs_to_ingestion_args_tool,
+        insert_records_into_database_tool=insert_records_into_database_tool,
+        ingestion_ledger=ingestion_ledger,
+    )
+
     # Workflow runner
     workflow_runner = providers.Singleton(
         WorkflowRunner,
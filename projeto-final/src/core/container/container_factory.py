@@ -0,0 +1,30 @@
+from src.ai.models.invoice_ingestion_config_model import (
+    InvoiceIngestionConfigModel,
+)
+from src.ai.models.invoice_item_ingestion_config_model import (
+    InvoiceItemIngestionConfigModel,
+)
+from src.core.container.container import Container
+from src.infra.db.models.invoice_item_model import (
+    InvoiceItemModel as SQLAlchemyInvoiceItemModel,
+)
+from src.infra.db.models.invoice_model import (
+    InvoiceModel as SQLAlchemyInvoiceModel,
+)
+
+
+def build_container() -> Container:
+    container: Container = Container()
+    container.config.ingestion_config_dict.from_value(
+        {
+            0: InvoiceIngestionConfigModel().model_dump(),
+            1: InvoiceItemIngestionConfigModel().model_dump(),
+        }
+    )
+    container.config.sqlalchemy_model_by_table_name.from_value(
+        {
+            SQLAlchemyInvoiceModel.get_table_name(): SQLAlchemyInvoiceModel,
+            SQLAlchemyInvoiceItemModel.get_table_name(): SQLAlchemyInvoiceItemModel,
+        }
+    )
+    return container
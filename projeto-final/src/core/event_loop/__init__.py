@@ -0,0 +1,3 @@
+from .background_event_loop import BackgroundEventLoop
+
+__all__ = ["BackgroundEventLoop"]
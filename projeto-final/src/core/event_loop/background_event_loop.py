@@ -0,0 +1,45 @@
+import asyncio
+import threading
+from typing import Any, Coroutine, Optional, TypeVar
+
+from src.core.logging import logger
+
+T = TypeVar("T")
+
+
+class BackgroundEventLoop:
+    def __init__(self):
+        # asyncpg and psycopg connections are bound to the loop that opened them.
+        # Streamlit reruns scripts on fresh threads, so every coroutine of the
+        # process is run on this single long-lived loop and the async pools are
+        # really shared between interactions.
+        self.__lock = threading.Lock()
+        self.__loop: Optional[asyncio.AbstractEventLoop] = None
+        self.__thread: Optional[threading.Thread] = None
+
+    def run(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        return asyncio.run_coroutine_threadsafe(coroutine, self.__get_loop()).result()
+
+    def close(self) -> None:
+        with self.__lock:
+            loop, thread = self.__loop, self.__thread
+            self.__loop, self.__thread = None, None
+        if loop is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+        logger.info("Background event loop closed.")
+
+    def __get_loop(self) -> asyncio.AbstractEventLoop:
+        with self.__lock:
+            if self.__loop is None:
+                self.__loop = asyncio.new_event_loop()
+                self.__thread = threading.Thread(
+                    target=self.__loop.run_forever,
+                    name="background-event-loop",
+                    daemon=True,
+                )
+                self.__thread.start()
+                logger.info("Background event loop started.")
+            return self.__loop
@@ -0,0 +1,3 @@
+from .memory import PeakRSSSampler, get_current_rss_mb, get_peak_rss_mb
+
+__all__ = ["PeakRSSSampler", "get_current_rss_mb", "get_peak_rss_mb"]
@@ -0,0 +1,72 @@
+import os
+import resource
+import sys
+import threading
+from typing import Optional
+
+
+def get_peak_rss_mb(children: bool = False) -> float:
+    # The peak over the whole process lifetime, or over every finished child
+    # process, not over a single run; PeakRSSSampler measures a run.
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    peak_rss = resource.getrusage(who).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes on Linux.
+    if sys.platform == "darwin":
+        return peak_rss / (1024 * 1024)
+    return peak_rss / 1024
+
+
+def get_current_rss_mb() -> Optional[float]:
+    # Only Linux exposes the current RSS cheaply, through /proc.
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm_file:
+            resident_pages = int(statm_file.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+class PeakRSSSampler:
+    """Samples the RSS of the current process between start and stop"""
+
+    def __init__(self, interval_seconds: float = 0.05):
+        self.interval_seconds = interval_seconds
+        self.peak_rss_mb: Optional[float] = None
+        self.__stop_event = threading.Event()
+        self.__thread: Optional[threading.Thread] = None
+
+    def start(self) -> "PeakRSSSampler":
+        self.__sample()
+        self.__thread = threading.Thread(
+            target=self.__run, name="rss-sampler", daemon=True
+        )
+        self.__thread.start()
+        return self
+
+    def stop(self) -> Optional[float]:
+        if self.__thread is not None:
+            self.__stop_event.set()
+            self.__thread.join()
+            self.__thread = None
+            self.__sample()
+        return self.peak_rss_mb
+
+    def format_peak_rss(self) -> str:
+        if self.peak_rss_mb is None:
+            return "unavailable on this platform"
+        return f"{self.peak_rss_mb:.1f} MB"
+
+    def __enter__(self) -> "PeakRSSSampler":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def __run(self) -> None:
+        while not self.__stop_event.wait(self.interval_seconds):
+            self.__sample()
+
+    def __sample(self) -> None:
+        rss_mb = get_current_rss_mb()
+        if rss_mb is not None:
+            self.peak_rss_mb = max(self.peak_rss_mb or 0.0, rss_mb)
@@ -0,0 +1,109 @@
+import re
+import time
+from typing import Dict, Optional
+
+import pandas as pd
+from sqlalchemy import text
+
+from src.core.cache import QueryResultCache
+from src.core.logging import logger
+from src.infra.db.models.invoice_product_monthly_rollup_model import (
+    InvoiceProductMonthlyRollupModel,
+)
+from src.infra.db.models.invoice_uf_monthly_rollup_model import (
+    InvoiceUFMonthlyRollupModel,
+)
+from src.infra.db.postgresql import PostgreSQL
+
+
+class DashboardMetricEngine:
+    ROLLUP_TABLE_NAME_BY_GROUP_BY_COLUMN: Dict[str, str] = {
+        "emitter_uf": InvoiceUFMonthlyRollupModel.get_table_name(),
+        "ncm_sh_code": InvoiceProductMonthlyRollupModel.get_table_name(),
+        "product_service_description": InvoiceProductMonthlyRollupModel.get_table_name(),
+    }
+
+    def __init__(self, postgresql: PostgreSQL, query_result_cache: QueryResultCache):
+        self.postgresql = postgresql
+        self.query_result_cache = query_result_cache
+
+    def get_metric_queries(
+        self,
+        metric_column: str,
+        metric_expression: str,
+        group_by_column: str,
+        max_groups: Optional[int] = None,
+    ) -> Dict[str, str]:
+        if group_by_column not in self.ROLLUP_TABLE_NAME_BY_GROUP_BY_COLUMN:
+            raise ValueError(f"No rollup table is grouped by '{group_by_column}'.")
+        if not re.fullmatch(r"\w+", metric_column):
+            raise ValueError(f"Invalid metric column '{metric_column}'.")
+
+        table_name = self.ROLLUP_TABLE_NAME_BY_GROUP_BY_COLUMN[group_by_column]
+        data_by_group_query = (
+            f"SELECT {group_by_column}, {metric_expression} AS {metric_column} "
+            f"FROM {table_name} WHERE year = :year "
+            f"GROUP BY {group_by_column} ORDER BY {metric_column} DESC"
+            + (f" LIMIT {int(max_groups)}" if max_groups else "")
+        )
+        multi_year_data_query = (
+            f"SELECT year, {group_by_column}, {metric_expression} AS {metric_column} "
+            f"FROM {table_name} "
+            # A limited metric only follows its top groups of the selected year.
+            + (
+                f"WHERE {group_by_column} IN (SELECT {group_by_column} "
+                f"FROM ({data_by_group_query}) AS top_groups) "
+                if max_groups
+                else ""
+            )
+            + f"GROUP BY year, {group_by_column} ORDER BY year, {group_by_column}"
+        )
+        return {
+            "data_by_group": data_by_group_query,
+            "multi_year_data": multi_year_data_query,
+        }
+
+    def get_metric_frames(
+        self,
+        metric_column: str,
+        metric_expression: str,
+        group_by_column: str,
+        year: int,
+        max_groups: Optional[int] = None,
+    ) -> Dict[str, pd.DataFrame]:
+        queries = self.get_metric_queries(
+            metric_column=metric_column,
+            metric_expression=metric_expression,
+            group_by_column=group_by_column,
+            max_groups=max_groups,
+        )
+        # Keyed apart from the SQL tool results, which share the cache.
+        cache_key = f"/* dashboard_metric year={int(year)} */ " + " ".join(
+            queries.values()
+        )
+        data_version = self.query_result_cache.get_data_version()
+        frames = self.query_result_cache.get(cache_key)
+        # Copies keep callers from altering the frames held by the cache.
+        if frames is not None:
+            return {name: frame.copy() for name, frame in frames.items()}
+
+        start_time = time.perf_counter()
+        with self.postgresql.read_sync_engine.connect() as conn:
+            frames = {
+                name: pd.read_sql(text(query), conn, params={"year": int(year)})
+                for name, query in queries.items()
+            }
+        logger.info(
+            f"Dashboard metric '{metric_column}' by '{group_by_column}' for {year} "
+            f"computed in {time.perf_counter() - start_time:.3f}s."
+        )
+
+        self.query_result_cache.set(
+            query=cache_key,
+            result=frames,
+            data_version=data_version,
+            num_bytes=int(
+                sum(frame.memory_usage(deep=True).sum() for frame in frames.values())
+            ),
+        )
+        return {name: frame.copy() for name, frame in frames.items()}
@@ -0,0 +1,100 @@
+import hashlib
+import zipfile
+from datetime import date
+from typing import Iterable
+
+from sqlalchemy import delete, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.logging import logger
+from src.infra.db.models.ingestion_run_model import (
+    IngestionRunModel,
+    IngestionRunStatus,
+)
+from src.infra.db.postgresql import PostgreSQL
+
+
+class IngestionLedger:
+    def __init__(self, postgresql: PostgreSQL):
+        self.postgresql = postgresql
+
+    @staticmethod
+    def compute_sha256(file_path: str, zip_file_path: str | None = None) -> str:
+        sha256 = hashlib.sha256()
+        if zip_file_path:
+            with zipfile.ZipFile(zip_file_path, "r") as zip_ref:
+                with zip_ref.open(file_path) as file:
+                    while block := file.read(1024 * 1024):
+                        sha256.update(block)
+        else:
+            with open(file_path, "rb") as file:
+                while block := file.read(1024 * 1024):
+                    sha256.update(block)
+        return sha256.hexdigest()
+
+    async def get_completed_sha256s(self, sha256s: Iterable[str]) -> set[str]:
+        sha256s = set(sha256s)
+        if not sha256s:
+            return set()
+
+        async with self.postgresql.async_session() as async_session:
+            result = await async_session.execute(
+                select(IngestionRunModel.sha256).where(
+                    IngestionRunModel.sha256.in_(sha256s),
+                    IngestionRunModel.status == IngestionRunStatus.COMPLETED.value,
+                )
+            )
+            return set(result.scalars().all())
+
+    async def is_completed(self, sha256: str) -> bool:
+        return sha256 in await self.get_completed_sha256s(sha256s=[sha256])
+
+    async def forget_month(self, month: date) -> int:
+        # CSV files are named after their month. A ZIP file is not tied to its
+        # months, so every ZIP entry is dropped and only the CSV entries of other
+        # months keep their files from being loaded again.
+        async with self.postgresql.async_session() as async_session:
+            result = await async_session.execute(
+                delete(IngestionRunModel).where(
+                    or_(
+                        IngestionRunModel.file_kind == "zip",
+                        IngestionRunModel.file_name.startswith(f"{month:%Y%m}_"),
+                    )
+                )
+            )
+            await async_session.commit()
+        logger.info(f"Removed {result.rowcount} ingestion runs covering {month:%Y-%m}.")
+        return result.rowcount
+
+    @staticmethod
+    async def record_run(
+        async_session: AsyncSession,
+        sha256: str,
+        file_kind: str,
+        file_name: str,
+        status: IngestionRunStatus,
+        table_name: str | None = None,
+        row_count: int | None = None,
+        inserted_count: int | None = None,
+        skipped_count: int | None = None,
+    ) -> None:
+        values = {
+            "file_kind": file_kind,
+            "file_name": file_name,
+            "table_name": table_name,
+            "row_count": row_count,
+            "inserted_count": inserted_count,
+            "skipped_count": skipped_count,
+            "status": status.value,
+        }
+        statement = insert(IngestionRunModel).values(sha256=sha256, **values)
+        await async_session.execute(
+            statement.on_conflict_do_update(
+                index_elements=[IngestionRunModel.sha256],
+                set_={**values, "updated_at": statement.excluded.updated_at},
+            )
+        )
+        logger.info(
+            f"Recorded {status.value} ingestion run for {file_name} ({sha256})."
+        )
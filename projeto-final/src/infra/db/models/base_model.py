@@ -1,15 +1,14 @@
 import uuid
 from datetime import datetime, timezone
-from decimal import Decimal
-from enum import Enum
-from typing import Any
 
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 from sqlalchemy import (
     DateTime,
     Float,
     Integer,
     Numeric,
-    String,
     func,
 )
 from sqlalchemy.ext.asyncio import AsyncAttrs, AsyncSession
@@ -17,14 +16,6 @@ from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 from sqlalchemy.types import Uuid
 
 
-class SQLAlchemyType(Enum):
-    INTEGER = Integer
-    FLOAT = Float
-    STRING = String
-    DATETIME = DateTime
-    NUMERIC = Numeric
-
-
 class BaseModel(AsyncAttrs, DeclarativeBase):
     """Base class for SQLAlchemy models"""
 
@@ -52,37 +43,46 @@ class BaseModel(AsyncAttrs, DeclarativeBase):
         self.updated_at = datetime.now(tz=timezone.utc)
         await session.merge(self)
 
-    @staticmethod
-    def assign_value(
-        data: dict[str, Any], key: str, type_: Any
-    ) -> int | float | str | datetime | Decimal | None:
-        value = data.get(key, None)
-        if value is None:
-            match type_:
-                case SQLAlchemyType.INTEGER.value:
-                    return 0
-                case SQLAlchemyType.FLOAT.value:
-                    return 0.0
-                case SQLAlchemyType.STRING.value:
-                    return ""
-                case SQLAlchemyType.DATETIME.value:
-                    return datetime.now()
-                case SQLAlchemyType.NUMERIC.value:
-                    return Decimal("0.00")
+    @classmethod
+    def get_arrow_schema(cls, field_names: list[str]) -> pa.Schema:
+        arrow_fields: list[pa.Field] = []
+        for field_name in field_names:
+            column = cls.__table__.columns[field_name]
+            match column.type:
+                case Float():
+                    arrow_type = pa.float64()
+                case Numeric():
+                    arrow_type = pa.decimal128(
+                        column.type.precision or 38, column.type.scale or 0
+                    )
+                case Integer():
+                    arrow_type = pa.int32()
+                case DateTime():
+                    arrow_type = pa.timestamp(
+                        "us", tz="UTC" if column.type.timezone else None
+                    )
                 case _:
-                    return None
-        if type_ == SQLAlchemyType.DATETIME.value and isinstance(value, str):
-            try:
-                return datetime.fromisoformat(value)
-            except ValueError as e:
-                raise ValueError(
-                    f"Invalid datetime format for key '{key}': {value}"
-                ) from e
-        if type_ == SQLAlchemyType.NUMERIC.value and isinstance(value, str):
-            try:
-                return Decimal(value)
-            except ValueError as e:
-                raise ValueError(
-                    f"Invalid decimal format for key '{key}': {value}"
-                ) from e
-        return value
+                    arrow_type = pa.string()
+            arrow_fields.append(pa.field(field_name, arrow_type, nullable=True))
+        return pa.schema(arrow_fields)
+
+    @classmethod
+    def to_arrow_table(cls, df: pd.DataFrame, field_names: list[str]) -> pa.Table:
+        schema = cls.get_arrow_schema(field_names=field_names)
+        table = pa.Table.from_pandas(
+            df.reindex(columns=field_names), preserve_index=False
+        )
+        columns: list[pa.Array] = []
+        for arrow_field, column in zip(schema, table.columns):
+            if pa.types.is_decimal(arrow_field.type) and pa.types.is_floating(
+                column.type
+            ):
+                column = pc.round(
+                    column,
+                    ndigits=arrow_field.type.scale,
+                    round_mode="half_towards_infinity",
+                )
+            if pa.types.is_null(column.type):
+                column = pa.nulls(len(column), type=arrow_field.type)
+            columns.append(column.cast(arrow_field.type))
+        return pa.Table.from_arrays(columns, schema=schema)
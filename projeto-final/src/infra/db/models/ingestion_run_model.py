@@ -0,0 +1,53 @@
+from enum import Enum
+
+from sqlalchemy import Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.infra.db.models.base_model import (
+    BaseModel,
+)
+
+
+class IngestionRunStatus(Enum):
+    COMPLETED = "completed"
+    # Loaded, but rows without a parent record were left out, so it is retried.
+    PARTIAL = "partial"
+    FAILED = "failed"
+
+
+class IngestionRunModel(BaseModel):
+    __tablename__ = "ingestion_runs"
+    __table_args__ = (UniqueConstraint("sha256", name="uq_ingestion_run_sha256"),)
+
+    sha256: Mapped[str] = mapped_column(
+        String(64),
+        nullable=False,
+        comment="SHA-256 of the ingested file content",
+    )
+    file_kind: Mapped[str] = mapped_column(
+        String(10), nullable=False, comment="Kind of ingested file (zip or csv)"
+    )
+    file_name: Mapped[str] = mapped_column(
+        String(255), nullable=False, comment="Name of the ingested file"
+    )
+    table_name: Mapped[str | None] = mapped_column(
+        String(255),
+        nullable=True,
+        comment="Target table of a CSV file (empty for ZIP files)",
+    )
+    row_count: Mapped[int | None] = mapped_column(
+        Integer, nullable=True, comment="Number of rows read from the file"
+    )
+    inserted_count: Mapped[int | None] = mapped_column(
+        Integer, nullable=True, comment="Number of rows inserted"
+    )
+    skipped_count: Mapped[int | None] = mapped_column(
+        Integer, nullable=True, comment="Number of rows skipped as duplicates"
+    )
+    status: Mapped[str] = mapped_column(
+        String(20), nullable=False, comment="Status of the last ingestion run"
+    )
+
+    @classmethod
+    def get_table_name(cls) -> str:
+        return cls.__tablename__
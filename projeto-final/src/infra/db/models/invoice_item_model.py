@@ -1,10 +1,10 @@
 from datetime import datetime
 from decimal import Decimal
-from typing import Any
 
 from sqlalchemy import (
     DateTime,
-    ForeignKey,
+    ForeignKeyConstraint,
+    Index,
     Integer,
     Numeric,
     String,
@@ -23,18 +23,43 @@ class InvoiceItemModel(BaseModel):
     """
 
     __tablename__ = "invoice_items"
+    # Partitioned by issue_date month like invoices, which it references through
+    # the (access_key, issue_date) unique constraint.
     __table_args__ = (
+        ForeignKeyConstraint(
+            ["access_key", "issue_date"],
+            ["invoices.access_key", "invoices.issue_date"],
+            ondelete="CASCADE",
+        ),
         UniqueConstraint(
             "access_key",
             "product_number",
+            "issue_date",
             name="uq_invoice_item_access_key_product_number",
         ),
+        Index(
+            "ix_invoice_items_issue_date_brin", "issue_date", postgresql_using="brin"
+        ),
+        Index(
+            "ix_invoice_items_emitter_uf_issue_date",
+            "emitter_uf",
+            "issue_date",
+            postgresql_include=["quantity", "total_value"],
+        ),
+        Index("ix_invoice_items_ncm_sh_code_issue_date", "ncm_sh_code", "issue_date"),
+        Index("ix_invoice_items_cfop_issue_date", "cfop", "issue_date"),
+        Index(
+            "ix_invoice_items_access_key_covering",
+            "access_key",
+            "issue_date",
+            postgresql_include=["quantity", "total_value"],
+        ),
+        {"postgresql_partition_by": "RANGE (issue_date)"},
     )
 
     # Denormalized Invoice Header Fields
     access_key: Mapped[str] = mapped_column(
         String(44),
-        ForeignKey("invoices.access_key", ondelete="CASCADE"),
         nullable=False,
         comment="Invoice access key (CHAVE DE ACESSO)",
     )
@@ -54,6 +79,7 @@ class InvoiceItemModel(BaseModel):
     )
     issue_date: Mapped[datetime] = mapped_column(
         DateTime,
+        primary_key=True,
         nullable=False,
         comment="Date of issue (DATA EMISSÃO)",
     )
@@ -161,65 +187,3 @@ class InvoiceItemModel(BaseModel):
     @classmethod
     def get_table_name(cls) -> str:
         return cls.__tablename__
-
-    @classmethod
-    def from_data(cls, data: dict[str, Any]) -> "InvoiceItemModel":
-        return cls(
-            # Denormalized Invoice Header Fields
-            access_key=cls.assign_value(data=data, key="access_key", type_=String),
-            model=cls.assign_value(data=data, key="model", type_=String),
-            series=cls.assign_value(data=data, key="series", type_=Integer),
-            number=cls.assign_value(data=data, key="number", type_=Integer),
-            operation_nature=cls.assign_value(
-                data=data, key="operation_nature", type_=String
-            ),
-            issue_date=cls.assign_value(data=data, key="issue_date", type_=DateTime),
-            emitter_cnpj_cpf=cls.assign_value(
-                data=data, key="emitter_cnpj_cpf", type_=String
-            ),
-            emitter_corporate_name=cls.assign_value(
-                data=data, key="emitter_corporate_name", type_=String
-            ),
-            emitter_state_registration=cls.assign_value(
-                data=data, key="emitter_state_registration", type_=String
-            ),
-            emitter_uf=cls.assign_value(data=data, key="emitter_uf", type_=String),
-            emitter_municipality=cls.assign_value(
-                data=data, key="emitter_municipality", type_=String
-            ),
-            recipient_cnpj=cls.assign_value(
-                data=data, key="recipient_cnpj", type_=String
-            ),
-            recipient_name=cls.assign_value(
-                data=data, key="recipient_name", type_=String
-            ),
-            recipient_uf=cls.assign_value(data=data, key="recipient_uf", type_=String),
-            recipient_ie_indicator=cls.assign_value(
-                data=data, key="recipient_ie_indicator", type_=String
-            ),
-            operation_destination=cls.assign_value(
-                data=data, key="operation_destination", type_=String
-            ),
-            final_consumer=cls.assign_value(
-                data=data, key="final_consumer", type_=String
-            ),
-            buyer_presence=cls.assign_value(
-                data=data, key="buyer_presence", type_=String
-            ),
-            # Item-Specific Fields
-            product_number=cls.assign_value(
-                data=data, key="product_number", type_=String
-            ),
-            product_service_description=cls.assign_value(
-                data=data, key="product_service_description", type_=String
-            ),
-            ncm_sh_code=cls.assign_value(data=data, key="ncm_sh_code", type_=String),
-            ncm_sh_product_type=cls.assign_value(
-                data=data, key="ncm_sh_product_type", type_=String
-            ),
-            cfop=cls.assign_value(data=data, key="cfop", type_=String),
-            quantity=cls.assign_value(data=data, key="quantity", type_=Numeric),
-            unit=cls.assign_value(data=data, key="unit", type_=String),
-            unit_value=cls.assign_value(data=data, key="unit_value", type_=Numeric),
-            total_value=cls.assign_value(data=data, key="total_value", type_=Numeric),
-        )
@@ -1,8 +1,7 @@
 from datetime import datetime
 from decimal import Decimal
-from typing import Any
 
-from sqlalchemy import DateTime, Integer, Numeric, String
+from sqlalchemy import DateTime, Index, Integer, Numeric, String, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.infra.db.models.base_model import (
@@ -12,10 +11,25 @@ from src.infra.db.models.base_model import (
 
 class InvoiceModel(BaseModel):
     __tablename__ = "invoices"
+    # Partitioned by issue_date month, so the primary key and unique constraints
+    # include issue_date, as PostgreSQL requires for partitioned tables.
+    __table_args__ = (
+        UniqueConstraint(
+            "access_key", "issue_date", name="uq_invoice_access_key_issue_date"
+        ),
+        Index("ix_invoices_issue_date_brin", "issue_date", postgresql_using="brin"),
+        Index(
+            "ix_invoices_emitter_uf_issue_date",
+            "emitter_uf",
+            "issue_date",
+            postgresql_include=["total_invoice_value"],
+        ),
+        {"postgresql_partition_by": "RANGE (issue_date)"},
+    )
 
     access_key: Mapped[str] = mapped_column(
         String(44),
-        unique=True,
+        nullable=False,
         comment="Unique access key for the invoice (CHAVE DE ACESSO)",
     )
     model: Mapped[str] = mapped_column(
@@ -34,6 +48,7 @@ class InvoiceModel(BaseModel):
     )
     issue_date: Mapped[datetime] = mapped_column(
         DateTime,
+        primary_key=True,
         nullable=False,
         comment="Date of issue (DATA EMISSÃO)",
     )
@@ -112,55 +127,3 @@ class InvoiceModel(BaseModel):
     @classmethod
     def get_table_name(cls) -> str:
         return cls.__tablename__
-
-    @classmethod
-    def from_data(cls, data: dict[str, Any]) -> "InvoiceModel":
-        return cls(
-            access_key=cls.assign_value(data=data, key="access_key", type_=String),
-            model=cls.assign_value(data=data, key="model", type_=String),
-            series=cls.assign_value(data=data, key="series", type_=Integer),
-            number=cls.assign_value(data=data, key="number", type_=Integer),
-            operation_nature=cls.assign_value(
-                data=data, key="operation_nature", type_=String
-            ),
-            issue_date=cls.assign_value(data=data, key="issue_date", type_=DateTime),
-            latest_event=cls.assign_value(data=data, key="latest_event", type_=String),
-            latest_event_datetime=cls.assign_value(
-                data=data, key="latest_event_datetime", type_=DateTime
-            ),
-            emitter_cnpj_cpf=cls.assign_value(
-                data=data, key="emitter_cnpj_cpf", type_=String
-            ),
-            emitter_corporate_name=cls.assign_value(
-                data=data, key="emitter_corporate_name", type_=String
-            ),
-            emitter_state_registration=cls.assign_value(
-                data=data, key="emitter_state_registration", type_=String
-            ),
-            emitter_uf=cls.assign_value(data=data, key="emitter_uf", type_=String),
-            emitter_municipality=cls.assign_value(
-                data=data, key="emitter_municipality", type_=String
-            ),
-            recipient_cnpj=cls.assign_value(
-                data=data, key="recipient_cnpj", type_=String
-            ),
-            recipient_name=cls.assign_value(
-                data=data, key="recipient_name", type_=String
-            ),
-            recipient_uf=cls.assign_value(data=data, key="recipient_uf", type_=String),
-            recipient_ie_indicator=cls.assign_value(
-                data=data, key="recipient_ie_indicator", type_=String
-            ),
-            operation_destination=cls.assign_value(
-                data=data, key="operation_destination", type_=String
-            ),
-            final_consumer=cls.assign_value(
-                data=data, key="final_consumer", type_=String
-            ),
-            buyer_presence=cls.assign_value(
-                data=data, key="buyer_presence", type_=String
-            ),
-            total_invoice_value=cls.assign_value(
-                data=data, key="total_invoice_value", type_=Numeric
-            ),
-        )
@@ -0,0 +1,49 @@
+from decimal import Decimal
+
+from sqlalchemy import BigInteger, Integer, Numeric, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.infra.db.models.base_model import (
+    BaseModel,
+)
+
+
+class InvoiceProductMonthlyRollupModel(BaseModel):
+    __tablename__ = "invoice_product_monthly_rollups"
+    __table_args__ = (
+        UniqueConstraint(
+            "year",
+            "month",
+            "ncm_sh_code",
+            "product_service_description",
+            name="uq_invoice_product_monthly_rollup_key",
+        ),
+    )
+
+    year: Mapped[int] = mapped_column(
+        Integer, nullable=False, comment="Year of the invoice issue date"
+    )
+    month: Mapped[int] = mapped_column(
+        Integer, nullable=False, comment="Month of the invoice issue date"
+    )
+    ncm_sh_code: Mapped[str] = mapped_column(
+        String(8), nullable=False, comment="NCM/SH code (CÓDIGO NCM/SH)"
+    )
+    product_service_description: Mapped[str] = mapped_column(
+        String(255),
+        nullable=False,
+        comment="Product or service description (DESCRIÇÃO DO PRODUTO/SERVIÇO)",
+    )
+    item_count: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, comment="Number of invoice items"
+    )
+    item_quantity_sum: Mapped[Decimal] = mapped_column(
+        Numeric(24, 4), nullable=False, comment="Sum of the invoice item quantities"
+    )
+    item_total_value_sum: Mapped[Decimal] = mapped_column(
+        Numeric(20, 2), nullable=False, comment="Sum of the invoice item total values"
+    )
+
+    @classmethod
+    def get_table_name(cls) -> str:
+        return cls.__tablename__
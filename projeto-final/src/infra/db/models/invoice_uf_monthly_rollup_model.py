@@ -0,0 +1,48 @@
+from decimal import Decimal
+
+from sqlalchemy import BigInteger, Integer, Numeric, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.infra.db.models.base_model import (
+    BaseModel,
+)
+
+
+class InvoiceUFMonthlyRollupModel(BaseModel):
+    __tablename__ = "invoice_uf_monthly_rollups"
+    __table_args__ = (
+        UniqueConstraint(
+            "year", "month", "emitter_uf", name="uq_invoice_uf_monthly_rollup_key"
+        ),
+    )
+
+    year: Mapped[int] = mapped_column(
+        Integer, nullable=False, comment="Year of the invoice issue date"
+    )
+    month: Mapped[int] = mapped_column(
+        Integer, nullable=False, comment="Month of the invoice issue date"
+    )
+    emitter_uf: Mapped[str] = mapped_column(
+        String(2), nullable=False, comment="Emitter state (UF EMITENTE)"
+    )
+    invoice_count: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, comment="Number of invoices"
+    )
+    invoice_total_value_sum: Mapped[Decimal] = mapped_column(
+        Numeric(20, 2),
+        nullable=False,
+        comment="Sum of the total invoice values (divide by invoice_count for the average)",
+    )
+    item_count: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, comment="Number of invoice items"
+    )
+    item_quantity_sum: Mapped[Decimal] = mapped_column(
+        Numeric(24, 4), nullable=False, comment="Sum of the invoice item quantities"
+    )
+    item_total_value_sum: Mapped[Decimal] = mapped_column(
+        Numeric(20, 2), nullable=False, comment="Sum of the invoice item total values"
+    )
+
+    @classmethod
+    def get_table_name(cls) -> str:
+        return cls.__tablename__
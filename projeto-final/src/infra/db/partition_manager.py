@@ -0,0 +1,266 @@
+import re
+import threading
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Set, Type
+
+import pyarrow as pa
+import pyarrow.compute as pc
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from src.core.logging import logger
+from src.infra.db.models.base_model import BaseModel
+from src.infra.db.postgresql import PostgreSQL
+
+
+class PartitionManager:
+    def __init__(self, postgresql: PostgreSQL):
+        self.postgresql = postgresql
+        # Partitions known to exist, so loads only issue DDL for new months.
+        self.__lock = threading.Lock()
+        self.__known_partition_names: Set[str] = set()
+
+    @classmethod
+    def get_partition_column_name(cls, model_class: Type[BaseModel]) -> Optional[str]:
+        return cls.__parse_partition_column_name(
+            model_class.__table__.dialect_options["postgresql"]["partition_by"]
+        )
+
+    @staticmethod
+    def get_partition_name(table_name: str, month: date) -> str:
+        return f"{table_name}_y{month:%Y}m{month:%m}"
+
+    @staticmethod
+    def get_months(values: pa.Array | pa.ChunkedArray) -> List[date]:
+        months = pc.unique(pc.floor_temporal(values, unit="month")).drop_null()
+        return sorted(
+            {
+                month.date() if isinstance(month, datetime) else month
+                for month in months.to_pylist()
+            }
+        )
+
+    async def ensure_month_partitions(
+        self, table_name: str, months: Iterable[date]
+    ) -> None:
+        with self.__lock:
+            missing_months = [
+                month
+                for month in sorted(set(months))
+                if self.get_partition_name(table_name, month)
+                not in self.__known_partition_names
+            ]
+        if not missing_months:
+            return
+
+        # Creating a partition locks the parent table, so it runs in its own short
+        # transaction before the load instead of inside the load transaction.
+        async with self.postgresql.async_engine.begin() as conn:
+            await conn.execute(
+                text("SELECT pg_advisory_xact_lock(hashtext(:table_name))"),
+                {"table_name": table_name},
+            )
+            existing_partition_names = await self.__get_partition_names(
+                conn=conn, table_name=table_name
+            )
+            for month in missing_months:
+                partition_name = self.get_partition_name(table_name, month)
+                if partition_name in existing_partition_names:
+                    continue
+                await conn.execute(
+                    text(
+                        f"CREATE TABLE {partition_name} PARTITION OF {table_name} "
+                        f"FOR VALUES FROM ('{month:%Y-%m-%d}') "
+                        f"TO ('{self.__get_next_month(month):%Y-%m-%d}')"
+                    )
+                )
+                existing_partition_names.add(partition_name)
+                logger.info(f"Partition {partition_name} created.")
+
+        with self.__lock:
+            self.__known_partition_names.update(existing_partition_names)
+
+    async def get_partitions(self) -> Dict[str, List[str]]:
+        async with self.postgresql.async_engine.connect() as conn:
+            return {
+                table_name: sorted(
+                    await self.__get_partition_names(conn=conn, table_name=table_name)
+                )
+                for table_name in await self.__get_partitioned_table_names(conn=conn)
+            }
+
+    async def detach_month(self, month: date, drop: bool = False) -> List[str]:
+        # Referencing tables are detached first, as their rows pin the parent rows.
+        detached_table_names = []
+        async with self.postgresql.async_engine.begin() as conn:
+            for table_name in reversed(
+                await self.__get_partitioned_table_names(conn=conn)
+            ):
+                partition_name = self.get_partition_name(table_name, month)
+                if partition_name not in await self.__get_partition_names(
+                    conn=conn, table_name=table_name
+                ):
+                    continue
+                await conn.execute(
+                    text(f"ALTER TABLE {table_name} DETACH PARTITION {partition_name}")
+                )
+                if drop:
+                    await conn.execute(text(f"DROP TABLE {partition_name}"))
+                else:
+                    # The detached table keeps its foreign keys to the parent table,
+                    # which would block detaching the referenced month.
+                    await self.__drop_foreign_keys(conn=conn, table_name=partition_name)
+                    await conn.execute(
+                        text(
+                            f"ALTER TABLE {partition_name} "
+                            f"RENAME TO {partition_name}_detached"
+                        )
+                    )
+                detached_table_names.append(partition_name)
+                logger.info(
+                    f"Partition {partition_name} {'dropped' if drop else 'detached'}."
+                )
+
+        with self.__lock:
+            self.__known_partition_names.difference_update(detached_table_names)
+        return detached_table_names
+
+    async def create_month_staging_tables(self, month: date) -> List[str]:
+        # Empty tables shaped like the month partitions, to be loaded and then
+        # swapped in by swap_month.
+        staging_table_names = []
+        async with self.postgresql.async_engine.begin() as conn:
+            for table_name in await self.__get_partitioned_table_names(conn=conn):
+                staging_table_name = (
+                    f"{self.get_partition_name(table_name, month)}_staging"
+                )
+                partition_column_name = self.__parse_partition_column_name(
+                    await conn.scalar(
+                        text("SELECT pg_get_partkeydef(CAST(:table_name AS regclass))"),
+                        {"table_name": table_name},
+                    )
+                )
+                await conn.execute(
+                    text(
+                        f"CREATE TABLE {staging_table_name} "
+                        f"(LIKE {table_name} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+                    )
+                )
+                # Ids are generated by the application, so a manual load needs them
+                # generated here.
+                await conn.execute(
+                    text(
+                        f"ALTER TABLE {staging_table_name} "
+                        "ALTER COLUMN id SET DEFAULT gen_random_uuid()"
+                    )
+                )
+                # Lets ATTACH PARTITION skip the scan that validates the range.
+                await conn.execute(
+                    text(
+                        f"ALTER TABLE {staging_table_name} "
+                        f"ADD CONSTRAINT {staging_table_name}_range "
+                        f"CHECK ({partition_column_name} >= '{month:%Y-%m-%d}' "
+                        f"AND {partition_column_name} < "
+                        f"'{self.__get_next_month(month):%Y-%m-%d}')"
+                    )
+                )
+                staging_table_names.append(staging_table_name)
+        return staging_table_names
+
+    async def swap_month(self, month: date) -> None:
+        # Replaces the month partitions with their loaded staging tables in one
+        # transaction, so readers see either the old or the new month.
+        async with self.postgresql.async_engine.begin() as conn:
+            table_names = await self.__get_partitioned_table_names(conn=conn)
+            for table_name in reversed(table_names):
+                partition_name = self.get_partition_name(table_name, month)
+                if partition_name in await self.__get_partition_names(
+                    conn=conn, table_name=table_name
+                ):
+                    await conn.execute(
+                        text(
+                            f"ALTER TABLE {table_name} DETACH PARTITION {partition_name}"
+                        )
+                    )
+                    await conn.execute(text(f"DROP TABLE {partition_name}"))
+            for table_name in table_names:
+                partition_name = self.get_partition_name(table_name, month)
+                staging_table_name = f"{partition_name}_staging"
+                await conn.execute(
+                    text(f"ALTER TABLE {staging_table_name} RENAME TO {partition_name}")
+                )
+                await conn.execute(
+                    text(
+                        f"ALTER TABLE {table_name} ATTACH PARTITION {partition_name} "
+                        f"FOR VALUES FROM ('{month:%Y-%m-%d}') "
+                        f"TO ('{self.__get_next_month(month):%Y-%m-%d}')"
+                    )
+                )
+                await conn.execute(
+                    text(
+                        f"ALTER TABLE {partition_name} "
+                        f"DROP CONSTRAINT {staging_table_name}_range"
+                    )
+                )
+                logger.info(f"Partition {partition_name} swapped.")
+
+    @staticmethod
+    def __parse_partition_column_name(partition_by: Optional[str]) -> Optional[str]:
+        matched = re.fullmatch(r"RANGE \((\w+)\)", partition_by or "")
+        return matched.group(1) if matched else None
+
+    @staticmethod
+    def __get_next_month(month: date) -> date:
+        return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+    @staticmethod
+    async def __get_partitioned_table_names(conn: AsyncConnection) -> List[str]:
+        # Ordered so that referenced tables come before the tables referencing them.
+        result = await conn.execute(
+            text(
+                """
+                SELECT cls.relname
+                FROM pg_catalog.pg_partitioned_table pt
+                JOIN pg_catalog.pg_class cls ON cls.oid = pt.partrelid
+                JOIN pg_catalog.pg_namespace ns ON ns.oid = cls.relnamespace
+                WHERE ns.nspname = 'public'
+                ORDER BY (
+                    SELECT COUNT(*) FROM pg_catalog.pg_constraint con
+                    WHERE con.conrelid = cls.oid AND con.contype = 'f'
+                ), cls.relname
+                """
+            )
+        )
+        return list(result.scalars().all())
+
+    @staticmethod
+    async def __get_partition_names(conn: AsyncConnection, table_name: str) -> Set[str]:
+        result = await conn.execute(
+            text(
+                """
+                SELECT child.relname
+                FROM pg_catalog.pg_inherits inh
+                JOIN pg_catalog.pg_class parent ON parent.oid = inh.inhparent
+                JOIN pg_catalog.pg_class child ON child.oid = inh.inhrelid
+                WHERE parent.relname = :table_name
+                """
+            ),
+            {"table_name": table_name},
+        )
+        return set(result.scalars().all())
+
+    @staticmethod
+    async def __drop_foreign_keys(conn: AsyncConnection, table_name: str) -> None:
+        result = await conn.execute(
+            text(
+                """
+                SELECT conname FROM pg_catalog.pg_constraint
+                WHERE conrelid = CAST(:table_name AS regclass) AND contype = 'f'
+                """
+            ),
+            {"table_name": table_name},
+        )
+        for constraint_name in result.scalars().all():
+            await conn.execute(
+                text(f'ALTER TABLE {table_name} DROP CONSTRAINT "{constraint_name}"')
+            )
@@ -1,9 +1,30 @@
+import asyncio
+import threading
+import time
 from contextlib import asynccontextmanager
-from typing import Any, AsyncGenerator, Sequence
+from typing import (
+    Any,
+    AsyncGenerator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
-import asyncpg
+import pandas as pd
 from langchain_community.utilities.sql_database import SQLDatabase
-from sqlalchemy import URL, Engine, create_engine
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
+from sqlalchemy import (
+    URL,
+    Engine,
+    create_engine,
+    event,
+    make_url,
+    text,
+)
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -23,19 +44,139 @@ class PostgreSQL(SQLDatabase):
         postgresql_db_settings: PostgreSQLDBSettings,
     ):
         self.postgresql_db_settings = postgresql_db_settings
+        # asyncpg and psycopg connections are bound to the event loop that opened
+        # them, so the async pools are created once per read/write role and owned
+        # by the first loop using them (the app's BackgroundEventLoop).
+        self.__lock = threading.Lock()
+        self.__created_count_by_pool_name: Dict[str, int] = {}
+        self.__loop: Optional[asyncio.AbstractEventLoop] = None
+        self.__async_engine_by_read_only: Dict[bool, AsyncEngine] = {}
+        self.__async_sessionmaker_by_read_only: Dict[
+            bool, async_sessionmaker[AsyncSession]
+        ] = {}
+        self.__checkpointer_pool: Optional[AsyncConnectionPool] = None
+        # SQLDatabase.__init__ connects and reflects every table, so it is never
+        # called here: the SQL tools get this instance, which forwards the public
+        # SQLDatabase methods to one SQLDatabase built when a tool first needs the
+        # metadata, letting the app start while the database is slow or down.
+        self.__reflection_lock = threading.Lock()
+        self.__sql_database: Optional[SQLDatabase] = None
+        # Ingestion writes and analytics reads get their own pools, so a heavy
+        # ingestion run cannot starve dashboard queries. Reads go to the replica
+        # when one is configured and always run in read-only transactions.
         self.sync_engine = self.__create_engine()
-        self.async_engine = self.__create_async_engine()
-        self.async_sessionmaker = async_sessionmaker(
-            autocommit=False,
-            bind=self.async_engine,
-            expire_on_commit=False,
-        )
-        super().__init__(engine=self.sync_engine)
+        self.read_sync_engine = self.__create_engine(read_only=True)
+
+    @property
+    def dialect(self) -> str:
+        return self.read_sync_engine.dialect.name
+
+    def get_usable_table_names(self) -> Iterable[str]:
+        return self.ensure_reflected().get_usable_table_names()
+
+    def get_table_names(self) -> Iterable[str]:
+        return self.ensure_reflected().get_table_names()
+
+    @property
+    def table_info(self) -> str:
+        return self.ensure_reflected().table_info
+
+    def get_table_info(self, table_names: Optional[List[str]] = None) -> str:
+        return self.ensure_reflected().get_table_info(table_names)
+
+    def get_table_info_no_throw(self, table_names: Optional[List[str]] = None) -> str:
+        return self.ensure_reflected().get_table_info_no_throw(table_names)
+
+    def run(self, *args: Any, **kwargs: Any) -> Any:
+        return self.ensure_reflected().run(*args, **kwargs)
+
+    def run_no_throw(self, *args: Any, **kwargs: Any) -> Any:
+        return self.ensure_reflected().run_no_throw(*args, **kwargs)
 
-    def get_conn_string(self, is_async: bool = False) -> str:
+    def get_context(self) -> Dict[str, Any]:
+        return self.ensure_reflected().get_context()
+
+    @property
+    def async_engine(self) -> AsyncEngine:
+        return self.__get_async_engine_and_sessionmaker()[0]
+
+    @property
+    def async_sessionmaker(self) -> "async_sessionmaker[AsyncSession]":
+        return self.__get_async_engine_and_sessionmaker()[1]
+
+    @property
+    def read_async_engine(self) -> AsyncEngine:
+        return self.__get_async_engine_and_sessionmaker(read_only=True)[0]
+
+    @property
+    def read_async_sessionmaker(self) -> "async_sessionmaker[AsyncSession]":
+        return self.__get_async_engine_and_sessionmaker(read_only=True)[1]
+
+    async def get_checkpointer_pool(self) -> AsyncConnectionPool:
+        with self.__lock:
+            self.__bind_running_loop()
+            if self.__checkpointer_pool is None:
+                self.__checkpointer_pool = self.__create_checkpointer_pool()
+            checkpointer_pool = self.__checkpointer_pool
+        await checkpointer_pool.open()
+        return checkpointer_pool
+
+    def get_pool_stats(self) -> Dict[str, Dict[str, int]]:
+        pool_stats = {
+            "sync": self.__get_sqlalchemy_pool_stats(self.sync_engine, "sync"),
+            "read_sync": self.__get_sqlalchemy_pool_stats(
+                self.read_sync_engine, "read_sync"
+            ),
+        }
+        with self.__lock:
+            async_engine = self.__async_engine_by_read_only.get(False)
+            read_async_engine = self.__async_engine_by_read_only.get(True)
+            checkpointer_pool = self.__checkpointer_pool
+        if async_engine is not None:
+            pool_stats["async"] = self.__get_sqlalchemy_pool_stats(
+                async_engine.sync_engine, "async"
+            )
+        if read_async_engine is not None:
+            pool_stats["read_async"] = self.__get_sqlalchemy_pool_stats(
+                read_async_engine.sync_engine, "read_async"
+            )
+        if checkpointer_pool is not None:
+            stats = checkpointer_pool.get_stats()
+            pool_stats["checkpointer"] = {
+                "pool_size": stats.get("pool_size", 0),
+                "checked_out": stats.get("pool_size", 0)
+                - stats.get("pool_available", 0),
+                "waiting": stats.get("requests_waiting", 0),
+                "created": stats.get("connections_num", 0),
+            }
+        return pool_stats
+
+    def ensure_reflected(self) -> SQLDatabase:
+        sql_database = self.__sql_database
+        if sql_database is not None:
+            return sql_database
+        with self.__reflection_lock:
+            if self.__sql_database is None:
+                self.__sql_database = self.__reflect()
+            return self.__sql_database
+
+    def reflect_tables(self) -> None:
+        # Replaces the reflection made on first use, e.g. after a migration added
+        # or altered tables.
+        sql_database = self.__reflect()
+        with self.__reflection_lock:
+            self.__sql_database = sql_database
+
+    def get_conn_string(self, is_async: bool = False, read_only: bool = False) -> str:
         base_driver = self.postgresql_db_settings.driver
         driver_suffix = "+asyncpg" if is_async else ""
         driver = f"{base_driver}{driver_suffix}"
+        if read_only and self.postgresql_db_settings.read_dsn:
+            return (
+                make_url(self.postgresql_db_settings.read_dsn)
+                .set(drivername=driver)
+                .render_as_string(hide_password=False)
+            )
         return URL.create(
             drivername=driver,
             username=self.postgresql_db_settings.user,
@@ -46,29 +187,60 @@ class PostgreSQL(SQLDatabase):
         ).render_as_string(hide_password=False)
 
     async def table_exists(self, table_name: str) -> bool:
-        conn = None
         try:
-            conn = await asyncpg.connect(dsn=self.get_conn_string())
-            query = """
-                SELECT EXISTS (
-                    SELECT FROM pg_tables 
-                    WHERE schemaname = 'public' 
-                    AND tablename = $1
-                );
-                """
-            result = await conn.fetchval(query, table_name)
-            return result
+            async with self.async_engine.connect() as conn:
+                query = text(
+                    """
+                    SELECT EXISTS (
+                        SELECT FROM pg_tables 
+                        WHERE schemaname = 'public' 
+                        AND tablename = :table_name
+                    );
+                    """
+                )
+                result = await conn.scalar(query, {"table_name": table_name})
+                return bool(result)
         except Exception:
             return False
-        finally:
-            if conn:
-                await conn.close()
+
+    async def wait_for_read_replica(self) -> bool:
+        # Reads go to the replica, so the commits made so far are only visible to
+        # them once the replica has replayed the current WAL position of the primary.
+        if not self.postgresql_db_settings.read_dsn:
+            return True
+
+        async with self.async_engine.connect() as conn:
+            primary_lsn = await conn.scalar(
+                text("SELECT CAST(pg_current_wal_lsn() AS text)")
+            )
+        deadline = (
+            time.monotonic() + self.postgresql_db_settings.read_replica_wait_timeout
+        )
+        async with self.read_async_engine.connect() as conn:
+            while True:
+                is_caught_up = await conn.scalar(
+                    text(
+                        "SELECT COALESCE(pg_last_wal_replay_lsn() >= "
+                        "CAST(:primary_lsn AS pg_lsn), NOT pg_is_in_recovery())"
+                    ),
+                    {"primary_lsn": primary_lsn},
+                )
+                if is_caught_up:
+                    return True
+                if time.monotonic() >= deadline:
+                    return False
+                await asyncio.sleep(0.1)
 
     @asynccontextmanager
-    async def async_session(self) -> AsyncGenerator[AsyncSession, None]:
+    async def async_session(
+        self, read_only: bool = False
+    ) -> AsyncGenerator[AsyncSession, None]:
         logger.info("Starting PostgreSQL async session establishment...")
         try:
-            async with self.async_sessionmaker() as async_session:
+            _, session_maker = self.__get_async_engine_and_sessionmaker(
+                read_only=read_only
+            )
+            async with session_maker() as async_session:
                 message = "PostgreSQL async session establishment complete."
                 logger.info(message)
                 yield async_session
@@ -82,11 +254,28 @@ class PostgreSQL(SQLDatabase):
         try:
             self.sync_engine.dispose()
             self.sync_engine = None
-            async with self.async_session() as session:
-                await session.close()
-            await self.async_engine.dispose()
-            self.async_engine = None
-            self.async_sessionmaker = None
+            self.read_sync_engine.dispose()
+            self.read_sync_engine = None
+            with self.__reflection_lock:
+                self.__sql_database = None
+            with self.__lock:
+                loop = self.__loop
+                async_engines = list(self.__async_engine_by_read_only.values())
+                checkpointer_pool = self.__checkpointer_pool
+                self.__loop = None
+                self.__async_engine_by_read_only = {}
+                self.__async_sessionmaker_by_read_only = {}
+                self.__checkpointer_pool = None
+            close_async_pools = self.__close_async_pools(
+                async_engines=async_engines, checkpointer_pool=checkpointer_pool
+            )
+            # The async connections can only be closed on the loop that owns them.
+            if loop is None or loop is self.__get_running_loop():
+                await close_async_pools
+            else:
+                await asyncio.wrap_future(
+                    asyncio.run_coroutine_threadsafe(close_async_pools, loop)
+                )
             message = "PostgreSQL closure complete."
             logger.info(message)
         except Exception as error:
@@ -94,6 +283,26 @@ class PostgreSQL(SQLDatabase):
             logger.error(message)
             raise Exception(message)
 
+    @staticmethod
+    async def copy_records_to_table(
+        async_session: AsyncSession,
+        table_name: str,
+        columns: Sequence[str],
+        records: Iterable[Sequence[Any]],
+    ) -> None:
+        connection = await async_session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            table_name=table_name, records=records, columns=list(columns)
+        )
+
+    async def read_sql_async(self, sql_query: str) -> pd.DataFrame:
+        async with self.read_async_engine.connect() as conn:
+            result = await conn.execute(text(sql_query))
+            return pd.DataFrame.from_records(
+                result.fetchall(), columns=list(result.keys()), coerce_float=True
+            )
+
     async def run_async(
         self, command: str | Any, fetch: str = "all"
     ) -> str | Sequence[dict[str, Any]]:
@@ -105,8 +314,155 @@ class PostgreSQL(SQLDatabase):
                 return dict(result.mappings().first()) if result.rowcount > 0 else {}
             return str(result)
 
-    def __create_engine(self) -> Engine:
-        return create_engine(url=self.get_conn_string())
+    @staticmethod
+    def __get_running_loop() -> Optional[asyncio.AbstractEventLoop]:
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+
+    def __reflect(self) -> SQLDatabase:
+        start_time = time.perf_counter()
+        sql_database = SQLDatabase(
+            engine=self.read_sync_engine,
+            ignore_tables=self.__get_partition_table_names() or None,
+        )
+        logger.info(
+            f"Database reflection of {len(sql_database.get_usable_table_names())} tables took {time.perf_counter() - start_time:.3f}s."
+        )
+        return sql_database
+
+    def __get_partition_table_names(self) -> List[str]:
+        # Partitions are reached through their parent table, so they are kept out
+        # of the tables listed to the SQL tools.
+        with self.read_sync_engine.connect() as conn:
+            return list(
+                conn.scalars(
+                    text(
+                        """
+                        SELECT cls.relname
+                        FROM pg_catalog.pg_class cls
+                        JOIN pg_catalog.pg_namespace ns ON ns.oid = cls.relnamespace
+                        WHERE cls.relispartition AND ns.nspname = 'public'
+                        """
+                    )
+                )
+            )
+
+    def __get_async_engine_and_sessionmaker(
+        self, read_only: bool = False
+    ) -> Tuple[AsyncEngine, "async_sessionmaker[AsyncSession]"]:
+        with self.__lock:
+            self.__bind_running_loop()
+            if read_only not in self.__async_engine_by_read_only:
+                async_engine = self.__create_async_engine(read_only=read_only)
+                self.__async_engine_by_read_only[read_only] = async_engine
+                self.__async_sessionmaker_by_read_only[read_only] = async_sessionmaker(
+                    autocommit=False,
+                    bind=async_engine,
+                    expire_on_commit=False,
+                )
+            return (
+                self.__async_engine_by_read_only[read_only],
+                self.__async_sessionmaker_by_read_only[read_only],
+            )
+
+    def __bind_running_loop(self) -> None:
+        # Called with the lock held. A second loop would get connections it cannot
+        # use, so it is refused instead of silently opening another pool.
+        loop = self.__get_running_loop()
+        if loop is None:
+            return
+        if self.__loop is None:
+            self.__loop = loop
+        elif self.__loop is not loop:
+            raise RuntimeError(
+                "PostgreSQL async pools are owned by another event loop; run "
+                "coroutines through the BackgroundEventLoop."
+            )
 
-    def __create_async_engine(self) -> AsyncEngine:
-        return create_async_engine(url=self.get_conn_string(is_async=True))
+    @staticmethod
+    async def __close_async_pools(
+        async_engines: List[AsyncEngine],
+        checkpointer_pool: Optional[AsyncConnectionPool],
+    ) -> None:
+        for async_engine in async_engines:
+            await async_engine.dispose()
+        if checkpointer_pool is not None:
+            await checkpointer_pool.close()
+
+    def __get_sqlalchemy_pool_stats(
+        self, engine: Engine, pool_name: str
+    ) -> Dict[str, int]:
+        pool = engine.pool
+        return {
+            "pool_size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "created": self.__created_count_by_pool_name.get(pool_name, 0),
+        }
+
+    def __count_created_connections(self, engine: Engine, pool_name: str) -> None:
+        def on_connect(dbapi_connection: Any, connection_record: Any) -> None:
+            with self.__lock:
+                self.__created_count_by_pool_name[pool_name] = (
+                    self.__created_count_by_pool_name.get(pool_name, 0) + 1
+                )
+
+        event.listen(engine, "connect", on_connect)
+
+    def __get_pool_kwargs(self, read_only: bool = False) -> Dict[str, Any]:
+        return {
+            "pool_size": self.postgresql_db_settings.read_pool_size
+            if read_only
+            else self.postgresql_db_settings.pool_size,
+            "max_overflow": self.postgresql_db_settings.read_pool_max_overflow
+            if read_only
+            else self.postgresql_db_settings.pool_max_overflow,
+            "pool_timeout": self.postgresql_db_settings.pool_timeout,
+            "pool_recycle": self.postgresql_db_settings.pool_recycle,
+            "pool_pre_ping": self.postgresql_db_settings.pool_pre_ping,
+        }
+
+    def __create_engine(self, read_only: bool = False) -> Engine:
+        engine = create_engine(
+            url=self.get_conn_string(read_only=read_only),
+            connect_args={"options": "-c default_transaction_read_only=on"}
+            if read_only
+            else {},
+            **self.__get_pool_kwargs(read_only=read_only),
+        )
+        self.__count_created_connections(engine, "read_sync" if read_only else "sync")
+        return engine
+
+    def __create_async_engine(self, read_only: bool = False) -> AsyncEngine:
+        async_engine = create_async_engine(
+            url=self.get_conn_string(is_async=True, read_only=read_only),
+            connect_args={"server_settings": {"default_transaction_read_only": "on"}}
+            if read_only
+            else {},
+            **self.__get_pool_kwargs(read_only=read_only),
+        )
+        self.__count_created_connections(
+            async_engine.sync_engine, "read_async" if read_only else "async"
+        )
+        return async_engine
+
+    def __create_checkpointer_pool(self) -> AsyncConnectionPool:
+        return AsyncConnectionPool(
+            conninfo=self.get_conn_string(),
+            min_size=1,
+            max_size=self.postgresql_db_settings.pool_size,
+            timeout=self.postgresql_db_settings.pool_timeout,
+            max_lifetime=self.postgresql_db_settings.pool_recycle,
+            check=AsyncConnectionPool.check_connection
+            if self.postgresql_db_settings.pool_pre_ping
+            else None,
+            kwargs={
+                "autocommit": True,
+                "prepare_threshold": 0,
+                "row_factory": dict_row,
+            },
+            open=False,
+        )
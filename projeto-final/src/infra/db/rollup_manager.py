@@ -0,0 +1,127 @@
+from datetime import date
+from typing import Dict, Iterable, List
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.logging import logger
+from src.infra.db.models.invoice_item_model import InvoiceItemModel
+from src.infra.db.models.invoice_model import InvoiceModel
+from src.infra.db.models.invoice_product_monthly_rollup_model import (
+    InvoiceProductMonthlyRollupModel,
+)
+from src.infra.db.models.invoice_uf_monthly_rollup_model import (
+    InvoiceUFMonthlyRollupModel,
+)
+
+
+class RollupManager:
+    SOURCE_TABLE_NAMES_BY_ROLLUP_TABLE_NAME: Dict[str, List[str]] = {
+        InvoiceUFMonthlyRollupModel.get_table_name(): [
+            InvoiceModel.get_table_name(),
+            InvoiceItemModel.get_table_name(),
+        ],
+        InvoiceProductMonthlyRollupModel.get_table_name(): [
+            InvoiceItemModel.get_table_name(),
+        ],
+    }
+    REFRESH_QUERY_BY_ROLLUP_TABLE_NAME: Dict[str, str] = {
+        InvoiceUFMonthlyRollupModel.get_table_name(): """
+            INSERT INTO invoice_uf_monthly_rollups (
+                id, year, month, emitter_uf, invoice_count, invoice_total_value_sum,
+                item_count, item_quantity_sum, item_total_value_sum
+            )
+            SELECT
+                gen_random_uuid(), :year, :month,
+                COALESCE(i.emitter_uf, it.emitter_uf),
+                COALESCE(i.invoice_count, 0),
+                COALESCE(i.invoice_total_value_sum, 0),
+                COALESCE(it.item_count, 0),
+                COALESCE(it.item_quantity_sum, 0),
+                COALESCE(it.item_total_value_sum, 0)
+            FROM (
+                SELECT
+                    emitter_uf,
+                    COUNT(*) AS invoice_count,
+                    SUM(total_invoice_value) AS invoice_total_value_sum
+                FROM invoices
+                WHERE issue_date >= :start_date AND issue_date < :end_date
+                GROUP BY emitter_uf
+            ) AS i
+            FULL OUTER JOIN (
+                SELECT
+                    emitter_uf,
+                    COUNT(*) AS item_count,
+                    SUM(quantity) AS item_quantity_sum,
+                    SUM(total_value) AS item_total_value_sum
+                FROM invoice_items
+                WHERE issue_date >= :start_date AND issue_date < :end_date
+                GROUP BY emitter_uf
+            ) AS it ON it.emitter_uf = i.emitter_uf
+        """,
+        InvoiceProductMonthlyRollupModel.get_table_name(): """
+            INSERT INTO invoice_product_monthly_rollups (
+                id, year, month, ncm_sh_code, product_service_description,
+                item_count, item_quantity_sum, item_total_value_sum
+            )
+            SELECT
+                gen_random_uuid(), :year, :month,
+                ncm_sh_code,
+                product_service_description,
+                COUNT(*),
+                SUM(quantity),
+                SUM(total_value)
+            FROM invoice_items
+            WHERE issue_date >= :start_date AND issue_date < :end_date
+            GROUP BY ncm_sh_code, product_service_description
+        """,
+    }
+
+    async def refresh_months(
+        self, async_session: AsyncSession, table_name: str, months: Iterable[date]
+    ) -> None:
+        rollup_table_names = [
+            rollup_table_name
+            for rollup_table_name, source_table_names in (
+                self.SOURCE_TABLE_NAMES_BY_ROLLUP_TABLE_NAME.items()
+            )
+            if table_name in source_table_names
+        ]
+        months = sorted(set(months))
+        if not rollup_table_names or not months:
+            return
+
+        # Each month is recomputed from its partitions inside the load transaction,
+        # so the rollups commit together with the rows they summarize.
+        for month in months:
+            params = {
+                "year": month.year,
+                "month": month.month,
+                "start_date": month,
+                "end_date": date(
+                    month.year + month.month // 12, month.month % 12 + 1, 1
+                ),
+            }
+            # Serializes the loads refreshing the same month, which would otherwise
+            # both insert its rows.
+            await async_session.execute(
+                text("SELECT pg_advisory_xact_lock(hashtext(:lock_key))"),
+                {"lock_key": f"rollups_{month:%Y%m}"},
+            )
+            for rollup_table_name in rollup_table_names:
+                await async_session.execute(
+                    text(
+                        f"DELETE FROM {rollup_table_name} "
+                        "WHERE year = :year AND month = :month"
+                    ),
+                    params,
+                )
+                await async_session.execute(
+                    text(self.REFRESH_QUERY_BY_ROLLUP_TABLE_NAME[rollup_table_name]),
+                    params,
+                )
+
+        logger.info(
+            f"Rollups {rollup_table_names} refreshed for months "
+            f"{[f'{month:%Y-%m}' for month in months]}."
+        )
@@ -0,0 +1,122 @@
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+import pyarrow as pa
+from sqlalchemy import Column, DateTime, Float, Integer, Numeric, String
+
+from src.infra.db.models.base_model import BaseModel
+
+# Values given to missing fields, matched on the exact column type. Primary key
+# columns, such as the issue_date partition key, never get one.
+DEFAULT_FACTORY_BY_TYPE: Dict[type, Callable[[], Any]] = {
+    Integer: lambda: 0,
+    Float: lambda: 0.0,
+    String: lambda: "",
+    DateTime: datetime.now,
+    Numeric: lambda: Decimal("0.00"),
+}
+
+
+class RowBuilder:
+    """Turns Arrow chunks into plain rows for the mapped columns of a model"""
+
+    def __init__(self, model_class: Type[BaseModel], field_names: Tuple[str, ...]):
+        self.model_class = model_class
+        self.field_names = field_names
+        self.__compiled_fields = [
+            self.__compile_field(model_class.__table__.columns[field_name])
+            for field_name in field_names
+        ]
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def get(model_class: Type[BaseModel], field_names: Tuple[str, ...]) -> "RowBuilder":
+        return RowBuilder(model_class=model_class, field_names=field_names)
+
+    def build_tuples(self, table: pa.Table) -> List[Tuple[Any, ...]]:
+        return list(zip(*self.__build_columns(table)))
+
+    def build_dicts(self, table: pa.Table) -> List[Dict[str, Any]]:
+        return [
+            dict(zip(self.field_names, row))
+            for row in zip(*self.__build_columns(table))
+        ]
+
+    def __build_columns(self, table: pa.Table) -> List[List[Any]]:
+        # Coercion runs per column and is skipped when the Arrow type already
+        # yields the Python type of the column.
+        columns = []
+        for field_name, (default_factory, coerce, is_native_type) in zip(
+            self.field_names, self.__compiled_fields
+        ):
+            if field_name not in table.column_names:
+                default = default_factory() if default_factory else None
+                columns.append([default] * table.num_rows)
+                continue
+
+            column = table.column(field_name)
+            values = column.to_pylist()
+            if coerce is not None and not is_native_type(column.type):
+                try:
+                    values = [
+                        None if value is None else coerce(value) for value in values
+                    ]
+                except (ValueError, TypeError, InvalidOperation) as error:
+                    raise ValueError(
+                        f"Invalid {column.type} value for key '{field_name}': {error}"
+                    ) from error
+            if column.null_count and default_factory is not None:
+                default = default_factory()
+                values = [default if value is None else value for value in values]
+            columns.append(values)
+        return columns
+
+    @staticmethod
+    def __compile_field(
+        column: Column,
+    ) -> Tuple[
+        Optional[Callable[[], Any]],
+        Optional[Callable[[Any], Any]],
+        Callable[[pa.DataType], bool],
+    ]:
+        default_factory = (
+            None
+            if column.primary_key
+            else DEFAULT_FACTORY_BY_TYPE.get(type(column.type))
+        )
+        match column.type:
+            case Float():
+                return default_factory, float, pa.types.is_floating
+            case Numeric():
+                return (
+                    default_factory,
+                    lambda value: (
+                        value if isinstance(value, Decimal) else Decimal(str(value))
+                    ),
+                    pa.types.is_decimal,
+                )
+            case Integer():
+                return default_factory, int, pa.types.is_integer
+            case String():
+                return (
+                    default_factory,
+                    lambda value: value if isinstance(value, str) else str(value),
+                    lambda arrow_type: (
+                        pa.types.is_string(arrow_type)
+                        or pa.types.is_large_string(arrow_type)
+                    ),
+                )
+            case DateTime():
+                return (
+                    default_factory,
+                    lambda value: (
+                        datetime.fromisoformat(value)
+                        if isinstance(value, str)
+                        else value
+                    ),
+                    pa.types.is_timestamp,
+                )
+            case _:
+                return default_factory, None, lambda arrow_type: True
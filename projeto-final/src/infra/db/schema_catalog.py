@@ -0,0 +1,182 @@
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+
+from src.core.cache import QueryResultCache
+from src.core.logging import logger
+from src.infra.db.postgresql import PostgreSQL
+
+UNSET_REVISION = object()
+
+
+class SchemaCatalog:
+    def __init__(
+        self,
+        postgresql: PostgreSQL,
+        query_result_cache: Optional[QueryResultCache] = None,
+    ):
+        self.postgresql = postgresql
+        self.query_result_cache = query_result_cache
+        # Entries are keyed by the current Alembic revision, so applying a new
+        # migration drops them, even when it runs from another process.
+        self.__lock = threading.Lock()
+        self.__revision: Any = UNSET_REVISION
+        self.__reflected_revision: Any = UNSET_REVISION
+        self.__detailed_table_schemas: Optional[Dict[str, Dict[str, Any]]] = None
+        self.__formatted_table_schemas: Dict[str, str] = {}
+        self.__table_info_by_key: Dict[Tuple[int, Optional[Tuple[str, ...]]], str] = {}
+
+    async def get_revision(self) -> Optional[str]:
+        try:
+            async with self.postgresql.read_async_engine.connect() as conn:
+                return await conn.scalar(
+                    text("SELECT version_num FROM alembic_version")
+                )
+        except Exception as error:
+            logger.warning(f"Alembic revision not found: {error}")
+            return None
+
+    def get_revision_sync(self) -> Optional[str]:
+        try:
+            with self.postgresql.read_sync_engine.connect() as conn:
+                return conn.scalar(text("SELECT version_num FROM alembic_version"))
+        except Exception as error:
+            logger.warning(f"Alembic revision not found: {error}")
+            return None
+
+    async def get_detailed_table_schemas(
+        self, table_names: List[str]
+    ) -> Tuple[str, Dict[str, Dict[str, Any]]]:
+        revision = await self.get_revision()
+        with self.__lock:
+            self.__set_revision(revision)
+            detailed_table_schemas = self.__detailed_table_schemas
+            formatted_table_schemas = self.__formatted_table_schemas
+
+        if detailed_table_schemas is None:
+            logger.info(f"Loading schema catalog for revision {revision}...")
+            detailed_table_schemas = await self.__load_detailed_table_schemas()
+            formatted_table_schemas = {
+                table_name: self.__format_table_schema(table_name, table_schema)
+                for table_name, table_schema in detailed_table_schemas.items()
+            }
+            with self.__lock:
+                if self.__revision == revision:
+                    self.__detailed_table_schemas = detailed_table_schemas
+                    self.__formatted_table_schemas = formatted_table_schemas
+
+        found_table_names = sorted(
+            table_name
+            for table_name in set(table_names)
+            if table_name in detailed_table_schemas
+        )
+        if not found_table_names:
+            return "", {}
+
+        content = "Detailed Schema Recovered:\n\n" + "\n\n".join(
+            formatted_table_schemas[table_name] for table_name in found_table_names
+        )
+        schema_data = {
+            table_name: detailed_table_schemas[table_name]
+            for table_name in found_table_names
+        }
+        return content, schema_data
+
+    def get_table_info_no_throw(self, table_names: Optional[List[str]] = None) -> str:
+        revision = self.get_revision_sync()
+        # The table info carries sample rows, so it also follows the data version.
+        data_version = (
+            self.query_result_cache.get_data_version()
+            if self.query_result_cache is not None
+            else 0
+        )
+        key = (
+            data_version,
+            tuple(sorted(table_names)) if table_names is not None else None,
+        )
+        with self.__lock:
+            self.__set_revision(revision)
+            if self.__reflected_revision is UNSET_REVISION:
+                self.__reflected_revision = revision
+            elif self.__reflected_revision != revision:
+                logger.info(f"Reflecting tables again for revision {revision}...")
+                self.postgresql.reflect_tables()
+                self.__reflected_revision = revision
+            table_info = self.__table_info_by_key.get(key)
+
+        if table_info is None:
+            table_info = self.postgresql.get_table_info_no_throw(table_names)
+            with self.__lock:
+                if self.__revision == revision:
+                    self.__table_info_by_key[key] = table_info
+        return table_info
+
+    def __set_revision(self, revision: Optional[str]) -> None:
+        if self.__revision is not UNSET_REVISION and self.__revision == revision:
+            return
+        if self.__revision is not UNSET_REVISION:
+            logger.info(
+                f"Schema catalog invalidated: revision changed from {self.__revision} to {revision}."
+            )
+        self.__revision = revision
+        self.__detailed_table_schemas = None
+        self.__formatted_table_schemas = {}
+        self.__table_info_by_key = {}
+
+    async def __load_detailed_table_schemas(self) -> Dict[str, Dict[str, Any]]:
+        query = """
+            SELECT
+                c.table_name,
+                c.column_name,
+                c.data_type,
+                pg_catalog.obj_description(cls.oid, 'pg_class') AS table_comment,
+                pg_catalog.col_description(cls.oid, c.ordinal_position) AS column_comment
+            FROM
+                information_schema.columns c
+            JOIN
+                pg_catalog.pg_namespace ns ON ns.nspname = c.table_schema
+            JOIN
+                pg_catalog.pg_class cls
+                ON cls.relname = c.table_name AND cls.relnamespace = ns.oid
+            WHERE
+                c.table_schema = 'public' AND NOT cls.relispartition
+            ORDER BY
+                c.table_name, c.ordinal_position;
+        """
+        detailed_table_schemas: Dict[str, Dict[str, Any]] = {}
+        async with self.postgresql.read_async_engine.connect() as conn:
+            result = await conn.execute(text(query))
+            for (
+                table_name,
+                column_name,
+                data_type,
+                table_comment,
+                column_comment,
+            ) in result.fetchall():
+                if table_name not in detailed_table_schemas:
+                    detailed_table_schemas[table_name] = {
+                        "table_comment": table_comment if table_comment else "N/A",
+                        "columns": [],
+                    }
+
+                detailed_table_schemas[table_name]["columns"].append(
+                    {
+                        "column_name": column_name,
+                        "data_type": data_type,
+                        "comment": column_comment if column_comment else "N/A",
+                    }
+                )
+        return detailed_table_schemas
+
+    @staticmethod
+    def __format_table_schema(table_name: str, table_schema: Dict[str, Any]) -> str:
+        col_details = [
+            f"  - `{col['column_name']}` ({col['data_type']}): {col['comment']}"
+            for col in table_schema["columns"]
+        ]
+        return (
+            f"### Table: {table_name}\n"
+            f"**Table Description:** {table_schema['table_comment']}\n"
+            f"**Columns:**\n" + "\n".join(col_details)
+        )
@@ -1,19 +1,10 @@
+import time
+
 import streamlit as st
 
-from src.ai.models.invoice_ingestion_config_model import (
-    InvoiceIngestionConfigModel,
-)
-from src.ai.models.invoice_item_ingestion_config_model import (
-    InvoiceItemIngestionConfigModel,
-)
 from src.core.container.container import Container
+from src.core.container.container_factory import build_container
 from src.core.logging import logger
-from src.infra.db.models.invoice_item_model import (
-    InvoiceItemModel as SQLAlchemyInvoiceItemModel,
-)
-from src.infra.db.models.invoice_model import (
-    InvoiceModel as SQLAlchemyInvoiceModel,
-)
 from src.streamlit_app import App
 
 st.set_page_config(
@@ -23,25 +14,28 @@ st.set_page_config(
 )
 
 
+# Streamlit reruns this script on every interaction, so the container and its
+# singletons (connection pools, compiled graphs) are built once per process.
+@st.cache_resource
+def get_container() -> Container:
+    start_time = time.perf_counter()
+    container: Container = build_container()
+    container.wire(modules=["src.streamlit_app"])
+    # The checkpointer tables are created by migrate_postgresql_db.py, and the
+    # workflow runner checks them on its first run, so startup never waits on the
+    # database.
+    logger.info(f"Startup: container built in {time.perf_counter() - start_time:.3f}s.")
+    return container
+
+
 def main() -> None:
     logger.info("Starting application execution...")
     try:
-        container: Container = Container()
-        container.config.ingestion_config_dict.from_value(
-            {
-                0: InvoiceIngestionConfigModel().model_dump(),
-                1: InvoiceItemIngestionConfigModel().model_dump(),
-            }
-        )
-        container.config.sqlalchemy_model_by_table_name.from_value(
-            {
-                SQLAlchemyInvoiceModel.get_table_name(): SQLAlchemyInvoiceModel,
-                SQLAlchemyInvoiceItemModel.get_table_name(): SQLAlchemyInvoiceItemModel,
-            }
-        )
-        container.wire(modules=["src.streamlit_app"])
+        start_time = time.perf_counter()
+        get_container()
         app: App = App()
         app.run()
+        logger.info(f"Script run completed in {time.perf_counter() - start_time:.3f}s.")
         logger.info("Application execution completed.")
     except Exception as error:
         message = f"Failed to run application: {str(error)}"
@@ -1,21 +1,29 @@
-import asyncio
 import json
+import math
+import os
 import re
-from typing import Any
+from typing import Any, Dict, List
 
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import streamlit as st
 from dependency_injector.wiring import Provide, inject
+from langchain_core.messages import BaseMessage, ToolMessage
 
 from src.ai.workflow_runner import WorkflowRunner
 from src.ai.workflows.invoice_mgmt_workflow import (
     InvoiceMgmtWorkflow,
 )
 from src.core.container.container import Container
+from src.core.event_loop import BackgroundEventLoop
 from src.core.logging import logger
 from src.settings.streamlit_app_settings import (
     StreamlitAppSettings,
 )
 
+QUERY_RESULT_PAGE_SIZE = 100
+
 
 class ChatPage:
     @inject
@@ -28,6 +36,9 @@ class ChatPage:
             Container.invoice_mgmt_workflow
         ],
         workflow_runner: WorkflowRunner = Provide[Container.workflow_runner],
+        background_event_loop: BackgroundEventLoop = Provide[
+            Container.background_event_loop
+        ],
     ) -> None:
         if "chat_history" not in st.session_state:
             st.session_state.chat_history = []
@@ -36,6 +47,7 @@ class ChatPage:
         self.streamlit_app_settings = streamlit_app_settings
         self.invoice_mgmt_workflow = invoice_mgmt_workflow
         self.workflow_runner = workflow_runner
+        self.background_event_loop = background_event_loop
 
     def show(self) -> None:
         st.title("💬 Bate-Papo com o Agente de IA")
@@ -54,6 +66,7 @@ class ChatPage:
                 with st.chat_message("assistant"):
                     response_data = self.__extract_json_from_content(message["answer"])
                     self.__display_assistant_response(response_data)
+                    self.__display_query_results(message.get("query_results", []))
 
         prompt = st.chat_input(
             "Digite sua mensagem...",
@@ -80,7 +93,7 @@ class ChatPage:
             CRITICAL RULES:
             - When receive a response, always answer the query in the same language in which it was asked.
             """
-            response = asyncio.run(
+            response = self.background_event_loop.run(
                 self.workflow_runner.run_workflow(
                     self.invoice_mgmt_workflow,
                     input_message,
@@ -90,15 +103,21 @@ class ChatPage:
 
             final_message = response["messages"][-1]
             final_response_str = final_message.content
+            query_results = self.__get_query_results(response["messages"])
 
             status_placeholder.empty()
 
             response_data = self.__extract_json_from_content(final_response_str)
             with st.chat_message("assistant"):
                 self.__display_assistant_response(response_data)
+                self.__display_query_results(query_results)
 
             st.session_state.chat_history.append(
-                {"question": question, "answer": final_response_str}
+                {
+                    "question": question,
+                    "answer": final_response_str,
+                    "query_results": query_results,
+                }
             )
         except Exception as error:
             logger.error(
@@ -145,6 +164,75 @@ class ChatPage:
             st.error("Ocorreu um erro ao exibir a resposta do assistente.")
             st.json(response_data)
 
+    @staticmethod
+    def __get_query_results(messages: List[BaseMessage]) -> List[Dict[str, Any]]:
+        # The thread keeps the messages of earlier questions, so only query results
+        # not attached to a previous answer are returned.
+        known_file_paths = {
+            query_result["file_path"]
+            for message in st.session_state.chat_history
+            for query_result in message.get("query_results", [])
+        }
+        return [
+            message.artifact
+            for message in messages
+            if isinstance(message, ToolMessage)
+            and isinstance(message.artifact, dict)
+            and message.artifact.get("file_path")
+            and message.artifact["file_path"] not in known_file_paths
+        ]
+
+    def __display_query_results(self, query_results: List[Dict[str, Any]]) -> None:
+        for query_result in query_results:
+            file_path = query_result["file_path"]
+            row_count = query_result["row_count"]
+            with st.expander(f"📄 Resultado completo da consulta ({row_count} linhas)"):
+                if not os.path.exists(file_path):
+                    st.warning(
+                        f"O arquivo do resultado da consulta não foi encontrado em: {file_path}"
+                    )
+                    continue
+                num_pages = max(1, math.ceil(row_count / QUERY_RESULT_PAGE_SIZE))
+                page = st.number_input(
+                    "Página",
+                    min_value=1,
+                    max_value=num_pages,
+                    value=1,
+                    key=f"query_result_page_{file_path}",
+                )
+                st.dataframe(
+                    self.__read_query_result_page(file_path=file_path, page=page),
+                    hide_index=True,
+                )
+                st.caption(f"Página {page} de {num_pages}")
+
+    @staticmethod
+    def __read_query_result_page(file_path: str, page: int) -> pd.DataFrame:
+        # Only the row groups overlapping the page are read from the Parquet file.
+        parquet_file = pq.ParquetFile(file_path)
+        page_start = (page - 1) * QUERY_RESULT_PAGE_SIZE
+        page_end = page_start + QUERY_RESULT_PAGE_SIZE
+        tables = []
+        first_row_group_start = None
+        row_group_start = 0
+        for row_group_index in range(parquet_file.num_row_groups):
+            row_group_end = (
+                row_group_start
+                + parquet_file.metadata.row_group(row_group_index).num_rows
+            )
+            if row_group_end > page_start and row_group_start < page_end:
+                if first_row_group_start is None:
+                    first_row_group_start = row_group_start
+                tables.append(parquet_file.read_row_group(row_group_index))
+            row_group_start = row_group_end
+        if not tables:
+            return parquet_file.schema_arrow.empty_table().to_pandas()
+        return (
+            pa.concat_tables(tables)
+            .slice(page_start - first_row_group_start, QUERY_RESULT_PAGE_SIZE)
+            .to_pandas()
+        )
+
     @staticmethod
     def __extract_json_from_content(content_str: str) -> dict | str:
         json_pattern = r"content='(\{.*\})'"
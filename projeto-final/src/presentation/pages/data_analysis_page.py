@@ -1,20 +1,16 @@
-import asyncio
 import json
-import re
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import altair as alt
 import pandas as pd
 import plotly.express as px
 import streamlit as st
 from dependency_injector.wiring import Provide, inject
+from sqlalchemy.exc import SQLAlchemyError
 
-from src.ai.workflow_runner import WorkflowRunner
-from src.ai.workflows.invoice_mgmt_workflow import (
-    InvoiceMgmtWorkflow,
-)
 from src.core.container.container import Container
 from src.core.logging import logger
+from src.infra.db.dashboard_metric_engine import DashboardMetricEngine
 from src.settings.streamlit_app_settings import (
     StreamlitAppSettings,
 )
@@ -29,90 +25,13 @@ class BaseDashboardTab:
     METRIC_TOOLTIP_FORMAT: str = "$,.2f"
     GROUP_BY_COLUMN: str = "emitter_uf"
     DISPLAY_TYPE = "map"
+    # Aggregate over the rollup table of GROUP_BY_COLUMN, and the top groups kept.
+    METRIC_EXPRESSION: str = "SUM(invoice_total_value_sum)"
+    MAX_GROUPS: Optional[int] = None
 
     def __init__(self, parent_page: Any) -> None:
         self.streamlit_app_settings = parent_page.streamlit_app_settings
 
-    def get_agent_format_instructions(self, question: str, year: int) -> Dict[str, Any]:
-        group_by = self.GROUP_BY_COLUMN.replace("_code", "").replace("uf", "state")
-
-        map_schema = {
-            "type": "array",
-            "description": f"List of data aggregated by Brazilian {group_by} for the selected year ({year}). Metric: {self.METRIC_LABEL}.",
-            "items": {
-                "type": "object",
-                "properties": {
-                    self.GROUP_BY_COLUMN: {
-                        "type": "string",
-                        "description": "The grouping column, e.g., 'AC', 'RJ', 'SP' or 'product_name'.",
-                    },
-                    self.METRIC_COLUMN: {
-                        "type": "number",
-                        "description": f"The calculated metric value: {self.METRIC_LABEL}.",
-                    },
-                },
-                "required": [self.GROUP_BY_COLUMN, self.METRIC_COLUMN],
-            },
-        }
-
-        multi_year_schema = {
-            "type": "array",
-            "description": f"List of data aggregated by year and {group_by} for all available years. Metric: {self.METRIC_LABEL}.",
-            "items": {
-                "type": "object",
-                "properties": {
-                    "year": {"type": "integer", "description": "The fiscal year."},
-                    self.GROUP_BY_COLUMN: {
-                        "type": "string",
-                        "description": "The grouping column, e.g., 'AC', 'RJ', 'SP' or 'product_name'.",
-                    },
-                    self.METRIC_COLUMN: {
-                        "type": "number",
-                        "description": f"The calculated metric value: {self.METRIC_LABEL}.",
-                    },
-                },
-                "required": ["year", self.GROUP_BY_COLUMN, self.METRIC_COLUMN],
-            },
-        }
-
-        format_instructions = {
-            "title": f"dashboard_data_{self.TAB_ID.lower()}",
-            "type": "object",
-            "properties": {
-                "data_by_group": map_schema,
-                "multi_year_data": multi_year_schema,
-            },
-            "required": ["data_by_group", "multi_year_data"],
-        }
-        format_instructions_str = json.dumps(format_instructions, indent=2)
-
-        data_payload_for_agent = {
-            "data_by_group": map_schema,
-            "multi_year_data": multi_year_schema,
-        }
-        data_payload_str = json.dumps(data_payload_for_agent, indent=2)
-
-        input_message = f"""
-        INSTRUCTIONS:
-        - Perform a multi-step procedure to analyze data based on the user's question.
-            1. Analyze the user's question accurately: {question}
-            2. Format the final answer to the user's question as a JSON object that strictly adheres to the schema for the **properties** key:
-            ```json
-            {data_payload_str}
-            ```
-        
-        CRITICAL RULES:
-        - **ALL** data is available in the database for analysis.
-        - **ALWAYS** return a JSON object with ONLY the keys 'data_by_group' and 'multi_year_data' at the top level.
-        - DO NOT include 'title', 'type', or 'properties' in the final returned JSON.
-        - DO NOT include any other text or explanations outside of the JSON object itself.
-        """
-
-        return {
-            "input_message": input_message,
-            "format_instructions_str": format_instructions_str,
-        }
-
     def render(
         self,
         selected_year: int,
@@ -569,9 +488,7 @@ class InvoiceCountTab(BaseDashboardTab):
     METRIC_TOOLTIP_FORMAT = ","
     GROUP_BY_COLUMN = "emitter_uf"
     DISPLAY_TYPE = "map"
-
-    def get_agent_format_instructions(self, question: str, year: int) -> Dict[str, Any]:
-        return super().get_agent_format_instructions(question, year)
+    METRIC_EXPRESSION = "SUM(invoice_count)"
 
 
 class InvoiceItemCountTab(BaseDashboardTab):
@@ -583,9 +500,7 @@ class InvoiceItemCountTab(BaseDashboardTab):
     METRIC_TOOLTIP_FORMAT = ","
     GROUP_BY_COLUMN = "emitter_uf"
     DISPLAY_TYPE = "map"
-
-    def get_agent_format_instructions(self, question: str, year: int) -> Dict[str, Any]:
-        return super().get_agent_format_instructions(question, year)
+    METRIC_EXPRESSION = "SUM(item_count)"
 
 
 class InvoiceItemQuantityTab(BaseDashboardTab):
@@ -597,9 +512,7 @@ class InvoiceItemQuantityTab(BaseDashboardTab):
     METRIC_TOOLTIP_FORMAT = ","
     GROUP_BY_COLUMN = "emitter_uf"
     DISPLAY_TYPE = "map"
-
-    def get_agent_format_instructions(self, question: str, year: int) -> Dict[str, Any]:
-        return super().get_agent_format_instructions(question, year)
+    METRIC_EXPRESSION = "SUM(item_quantity_sum)"
 
 
 class InvoiceItemByProductTab(BaseDashboardTab):
@@ -610,9 +523,8 @@ class InvoiceItemByProductTab(BaseDashboardTab):
     METRIC_TYPE = "currency"
     GROUP_BY_COLUMN = "product_service_description"
     DISPLAY_TYPE = "table"
-
-    def get_agent_format_instructions(self, question: str, year: int) -> Dict[str, Any]:
-        return super().get_agent_format_instructions(question, year)
+    METRIC_EXPRESSION = "SUM(item_total_value_sum)"
+    MAX_GROUPS = 10
 
 
 class ProductCountTab(BaseDashboardTab):
@@ -623,9 +535,8 @@ class ProductCountTab(BaseDashboardTab):
     METRIC_TYPE = "count"
     GROUP_BY_COLUMN = "product_service_description"
     DISPLAY_TYPE = "table"
-
-    def get_agent_format_instructions(self, question: str, year: int) -> Dict[str, Any]:
-        return super().get_agent_format_instructions(question, year)
+    METRIC_EXPRESSION = "SUM(item_count)"
+    MAX_GROUPS = 10
 
 
 class InvoiceAverageValueTab(BaseDashboardTab):
@@ -637,9 +548,7 @@ class InvoiceAverageValueTab(BaseDashboardTab):
     METRIC_TOOLTIP_FORMAT = "$,.2f"
     GROUP_BY_COLUMN = "emitter_uf"
     DISPLAY_TYPE = "map"
-
-    def get_agent_format_instructions(self, question: str, year: int) -> Dict[str, Any]:
-        return super().get_agent_format_instructions(question, year)
+    METRIC_EXPRESSION = "SUM(invoice_total_value_sum) / NULLIF(SUM(invoice_count), 0)"
 
 
 class InvoiceTotalValueTab(BaseDashboardTab):
@@ -651,9 +560,7 @@ class InvoiceTotalValueTab(BaseDashboardTab):
     METRIC_TOOLTIP_FORMAT = "$,.2f"
     GROUP_BY_COLUMN = "emitter_uf"
     DISPLAY_TYPE = "map"
-
-    def get_agent_format_instructions(self, question: str, year: int) -> Dict[str, Any]:
-        return super().get_agent_format_instructions(question, year)
+    METRIC_EXPRESSION = "SUM(invoice_total_value_sum)"
 
 
 class InvoiceItemTotalValueTab(BaseDashboardTab):
@@ -664,9 +571,7 @@ class InvoiceItemTotalValueTab(BaseDashboardTab):
     METRIC_TYPE = "currency"
     GROUP_BY_COLUMN = "emitter_uf"
     DISPLAY_TYPE = "map"
-
-    def get_agent_format_instructions(self, question: str, year: int) -> Dict[str, Any]:
-        return super().get_agent_format_instructions(question, year)
+    METRIC_EXPRESSION = "SUM(item_total_value_sum)"
 
 
 class DataAnalysisPage:
@@ -676,14 +581,12 @@ class DataAnalysisPage:
         streamlit_app_settings: StreamlitAppSettings = Provide[
             Container.streamlit_app_settings
         ],
-        invoice_mgmt_workflow: InvoiceMgmtWorkflow = Provide[
-            Container.invoice_mgmt_workflow
+        dashboard_metric_engine: DashboardMetricEngine = Provide[
+            Container.dashboard_metric_engine
         ],
-        workflow_runner: WorkflowRunner = Provide[Container.workflow_runner],
     ) -> None:
         self.streamlit_app_settings = streamlit_app_settings
-        self.invoice_mgmt_workflow = invoice_mgmt_workflow
-        self.workflow_runner = workflow_runner
+        self.dashboard_metric_engine = dashboard_metric_engine
 
         self.tabs = {
             InvoiceCountTab.TAB_TITLE: InvoiceCountTab(self),
@@ -696,9 +599,6 @@ class DataAnalysisPage:
             InvoiceItemTotalValueTab.TAB_TITLE: InvoiceItemTotalValueTab(self),
         }
 
-        if "workflow_cache" not in st.session_state:
-            st.session_state.workflow_cache = {}
-
     def show(self) -> None:
         st.title("📊 Análise de Dados")
         st.markdown(
@@ -709,9 +609,6 @@ class DataAnalysisPage:
         )
         geojson = self.__load_brazil_geojson()
 
-        if "workflow_cache" not in st.session_state:
-            st.session_state.workflow_cache = {}
-
         tab_titles = list(self.tabs.keys())
 
         with st.sidebar:
@@ -736,85 +633,42 @@ class DataAnalysisPage:
 
         tab_instance = self.tabs[selected_tab_title]
 
-        cache_key = f"{tab_instance.TAB_ID}_{selected_year}"
-
-        response = None
-        agent_info = None
-
-        if cache_key not in st.session_state.workflow_cache:
+        # The tab metrics are plain aggregates over the rollup tables, so they are
+        # queried directly instead of through the agent workflow.
+        metric_args = {
+            "metric_column": tab_instance.METRIC_COLUMN,
+            "metric_expression": tab_instance.METRIC_EXPRESSION,
+            "group_by_column": tab_instance.GROUP_BY_COLUMN,
+            "max_groups": tab_instance.MAX_GROUPS,
+        }
+        try:
             with st.spinner(
                 f"🚀 Analisando dados de {selected_tab_title} para o ano {selected_year}..."
             ):
-                group_label = tab_instance.get_group_label()
-                question_template = f"Calculate the {tab_instance.METRIC_LABEL} ({tab_instance.METRIC_COLUMN}) grouped by {group_label} ({tab_instance.GROUP_BY_COLUMN}) for the year {selected_year} and also for all years."
-
-                agent_info = tab_instance.get_agent_format_instructions(
-                    question_template, selected_year
+                frames = self.dashboard_metric_engine.get_metric_frames(
+                    year=selected_year, **metric_args
                 )
-                input_message = agent_info["input_message"]
-
-                response = asyncio.run(
-                    self.workflow_runner.run_workflow(
-                        self.invoice_mgmt_workflow,
-                        input_message,
-                        st.session_state.session_thread_id
-                        if "session_thread_id" in st.session_state
-                        else "dummy_thread_id",
-                    )
-                )
-
-                st.session_state.workflow_cache[cache_key] = {
-                    "response": response,
-                    "agent_info": agent_info,
-                }
-
-        # --- Data Processing and Rendering ---
-        cached_data = st.session_state.workflow_cache.get(cache_key)
-        if not cached_data:
-            st.error("Erro ao carregar ou executar o workflow.")
-            return
-
-        response = cached_data["response"]
-        agent_info = cached_data["agent_info"]
-
-        final_message = response["messages"][-1]
-        final_response_str = final_message.content
-        logger.info(f"final_response_str: {final_response_str}")
-        response_data = self.__extract_json_from_content(final_response_str)
-        logger.info(f"response_data: {response_data}")
-
-        if not isinstance(response_data, dict):
-            st.error(
-                f"❌ Erro de Processamento: O agente não retornou os dados no formato esperado para **{selected_tab_title}**."
+        except (SQLAlchemyError, ValueError) as error:
+            logger.error(
+                f"Error computing dashboard metric {tab_instance.TAB_ID}: {error}"
             )
-            st.warning(
-                "Pode haver um problema na comunicação com o modelo ou a estrutura do JSON está incompleta."
+            st.error(
+                f"❌ Erro de Processamento: Não foi possível calcular os dados de **{selected_tab_title}**."
             )
-            with st.expander("Ver Resposta Bruta do Agente"):
-                st.code(final_response_str, language="markdown")
             return
 
-        source_map_data = response_data.get("data_by_group", [])
-        source_multi_year_data = response_data.get("multi_year_data", [])
-
-        data_for_map = [
-            {
-                tab_instance.GROUP_BY_COLUMN: d.get(tab_instance.GROUP_BY_COLUMN),
-                tab_instance.METRIC_COLUMN: d.get(tab_instance.METRIC_COLUMN),
-            }
-            for d in source_map_data
-            if isinstance(d, dict)
-        ]
-
-        df_multi_year = pd.DataFrame(source_multi_year_data)
+        data_for_map = frames["data_by_group"].to_dict("records")
+        df_multi_year = frames["multi_year_data"]
 
         if st.checkbox(
-            f"Mostrar Instruções do Agente ({selected_tab_title})",
+            f"Mostrar Consultas SQL ({selected_tab_title})",
             value=False,
-            key=f"agent_check_{tab_instance.TAB_ID}",
+            key=f"query_check_{tab_instance.TAB_ID}",
         ):
-            st.code(agent_info["input_message"], language="markdown")
-            st.code(agent_info["format_instructions_str"], language="json")
+            for query in self.dashboard_metric_engine.get_metric_queries(
+                **metric_args
+            ).values():
+                st.code(query, language="sql")
 
         tab_instance.render(
             selected_year,
@@ -841,33 +695,3 @@ class DataAnalysisPage:
             logger.error(f"Error loading GeoJSON: {e}")
             st.error("Erro ao carregar o arquivo GeoJSON.")
             return None
-
-    @staticmethod
-    def __extract_json_from_content(content_str: str) -> dict | str:
-        json_match = re.search(r"(\{[\s\S]*\})", content_str)
-
-        json_str = None
-        if json_match:
-            json_str = json_match.group(0).strip().strip("`").strip()
-        else:
-            json_pattern = r"content='(\{.*\})'"
-            json_match_old = re.search(json_pattern, content_str, re.DOTALL)
-            if json_match_old:
-                json_str = json_match_old.group(1).strip()
-            else:
-                json_str = content_str.strip()
-
-        if json_str:
-            try:
-                json_str = re.sub(r",\s*\}", "}", json_str)
-                json_str = re.sub(r",\s*\]", "]", json_str)
-
-                json_obj = json.loads(json_str)
-                return json_obj
-            except json.JSONDecodeError as error:
-                logger.error(
-                    f"Streamlit Extracted string is not valid JSON. Returning raw string. Error: {error}"
-                )
-                return content_str
-
-        return content_str
@@ -1,16 +1,20 @@
-import asyncio
 import os
-from typing import List
+import zipfile
+from typing import AbstractSet, List
 
 import pandas as pd
 import streamlit as st
 from dependency_injector.wiring import Provide, inject
 
+from src.ai.pipelines.invoice_ingestion_pipeline import (
+    InvoiceIngestionPipeline,
+)
 from src.ai.workflow_runner import WorkflowRunner
 from src.ai.workflows.invoice_mgmt_workflow import (
     InvoiceMgmtWorkflow,
 )
 from src.core.container.container import Container
+from src.core.event_loop import BackgroundEventLoop
 from src.core.logging import logger
 from src.settings.streamlit_app_settings import (
     StreamlitAppSettings,
@@ -28,6 +32,12 @@ class InvoiceIngestionPage:
             Container.invoice_mgmt_workflow
         ],
         workflow_runner: WorkflowRunner = Provide[Container.workflow_runner],
+        background_event_loop: BackgroundEventLoop = Provide[
+            Container.background_event_loop
+        ],
+        invoice_ingestion_pipeline: InvoiceIngestionPipeline = Provide[
+            Container.invoice_ingestion_pipeline
+        ],
     ) -> None:
         if "uploaded_file" not in st.session_state:
             st.session_state.uploaded_file = ""
@@ -39,10 +49,18 @@ class InvoiceIngestionPage:
             st.session_state.mapping_complete = False
         if "inserting_complete" not in st.session_state:
             st.session_state.inserting_complete = False
+        if "already_ingested" not in st.session_state:
+            st.session_state.already_ingested = False
+        if "ingestion_args_list" not in st.session_state:
+            st.session_state.ingestion_args_list = []
+        if "zip_sha256" not in st.session_state:
+            st.session_state.zip_sha256 = None
 
         self.streamlit_app_settings = streamlit_app_settings
         self.invoice_mgmt_workflow = invoice_mgmt_workflow
         self.workflow_runner = workflow_runner
+        self.background_event_loop = background_event_loop
+        self.invoice_ingestion_pipeline = invoice_ingestion_pipeline
 
     def show(self) -> None:
         st.title("🗄️ Ingestão de NF-e")
@@ -60,6 +78,10 @@ class InvoiceIngestionPage:
             st.info(
                 "Por favor, carregue um arquivo **.zip** na barra lateral para iniciar o processamento."
             )
+        elif st.session_state.already_ingested:
+            st.success(
+                "✅ Este arquivo ZIP já foi ingerido anteriormente. Nenhum processamento adicional é necessário."
+            )
         elif not st.session_state.decompress_complete:
             self.__run_decompress_workflow()
         else:
@@ -148,11 +170,22 @@ class InvoiceIngestionPage:
             filename = os.path.basename(csv_path)
 
             try:
-                dataframe = pd.read_csv(
-                    filepath_or_buffer=csv_path,
-                    sep=";",
-                    encoding="cp1252",
-                )
+                if self.streamlit_app_settings.ingestion_stream_zip_members:
+                    with zipfile.ZipFile(
+                        st.session_state.uploaded_file, "r"
+                    ) as zip_ref:
+                        with zip_ref.open(csv_path) as csv_file:
+                            dataframe = pd.read_csv(
+                                filepath_or_buffer=csv_file,
+                                sep=";",
+                                encoding="cp1252",
+                            )
+                else:
+                    dataframe = pd.read_csv(
+                        filepath_or_buffer=csv_path,
+                        sep=";",
+                        encoding="cp1252",
+                    )
 
                 num_records = len(dataframe)
 
@@ -195,6 +228,9 @@ class InvoiceIngestionPage:
         st.session_state.decompress_complete = False
         st.session_state.mapping_complete = False
         st.session_state.inserting_complete = False
+        st.session_state.already_ingested = False
+        st.session_state.ingestion_args_list = []
+        st.session_state.zip_sha256 = None
         st.session_state.extracted_csv_paths = []
 
     def __upload_file(self):
@@ -205,12 +241,6 @@ class InvoiceIngestionPage:
                 self.__delete_non_hidden_files(
                     dir_path=self.streamlit_app_settings.data_input_upload_dir_path
                 )
-                self.__delete_non_hidden_files(
-                    dir_path=self.streamlit_app_settings.data_output_upload_extracted_dir_path
-                )
-                self.__delete_non_hidden_files(
-                    dir_path=self.streamlit_app_settings.data_output_ingestion_dir_path
-                )
 
                 file_path = os.path.join(
                     self.streamlit_app_settings.data_input_upload_dir_path,
@@ -219,10 +249,34 @@ class InvoiceIngestionPage:
                 with open(file_path, "wb") as f:
                     f.write(zip_file.getbuffer())
 
+                # Only the outputs of files missing from this ZIP file are removed, so
+                # the extraction and mapping of unchanged members can be skipped.
+                with zipfile.ZipFile(file_path, "r") as zip_ref:
+                    member_file_names = {
+                        os.path.basename(name)
+                        for name in zip_ref.namelist()
+                        if name.endswith(".csv")
+                    }
+                self.__delete_non_hidden_files(
+                    dir_path=self.streamlit_app_settings.data_output_upload_extracted_dir_path,
+                    keep_file_names=member_file_names,
+                )
+                self.__delete_non_hidden_files(
+                    dir_path=self.streamlit_app_settings.data_output_ingestion_dir_path,
+                    keep_file_names=member_file_names
+                    | {
+                        f"{os.path.splitext(file_name)[0]}.parquet"
+                        for file_name in member_file_names
+                    },
+                )
+
                 st.session_state.uploaded_file = file_path
                 st.session_state.decompress_complete = False
                 st.session_state.mapping_complete = False
                 st.session_state.inserting_complete = False
+                st.session_state.already_ingested = False
+                st.session_state.ingestion_args_list = []
+                st.session_state.zip_sha256 = None
                 st.session_state.extracted_csv_paths = []
                 st.success(f"Successfully submitted .zip file!: {zip_file.name}")
                 st.rerun()
@@ -244,20 +298,59 @@ class InvoiceIngestionPage:
         )
 
         try:
-            input_message = f"""
-            INSTRUCTIONS:
-            - Unzip the ZIP file located in {file_path} to the directory '{data_output_upload_extracted_dir_path}.
-            """
-
-            asyncio.run(
-                self.workflow_runner.run_workflow(
-                    self.invoice_mgmt_workflow,
-                    input_message,
-                    st.session_state.session_thread_id
-                    if "session_thread_id" in st.session_state
-                    else "dummy_thread_id",
-                )
+            st.session_state.zip_sha256 = self.background_event_loop.run(
+                self.invoice_ingestion_pipeline.compute_sha256(zip_file_path=file_path)
             )
+            if self.background_event_loop.run(
+                self.invoice_ingestion_pipeline.is_ingested(
+                    zip_sha256=st.session_state.zip_sha256
+                )
+            ):
+                logger.info(f"Skipping {file_path}: it was already ingested.")
+                st.session_state.already_ingested = True
+                st.session_state.decompress_complete = True
+                st.session_state.mapping_complete = True
+                st.session_state.inserting_complete = True
+                status_placeholder.empty()
+                st.rerun()
+
+            if self.streamlit_app_settings.ingestion_stream_zip_members:
+                # The CSV files are read straight from the ZIP file by the mapping step.
+                with zipfile.ZipFile(file_path, "r") as zip_ref:
+                    extracted_files = [
+                        name for name in zip_ref.namelist() if name.endswith(".csv")
+                    ]
+                if not extracted_files:
+                    raise FileNotFoundError(
+                        "Nenhum arquivo CSV encontrado no arquivo ZIP. Certifique-se de que o ZIP contém arquivos CSV."
+                    )
+                st.session_state.extracted_csv_paths = extracted_files
+                st.session_state.decompress_complete = True
+                status_placeholder.empty()
+                st.rerun()
+
+            if self.streamlit_app_settings.ingestion_use_direct_pipeline:
+                self.background_event_loop.run(
+                    self.invoice_ingestion_pipeline.decompress(
+                        zip_file_path=file_path,
+                        zip_sha256=st.session_state.zip_sha256,
+                    )
+                )
+            else:
+                input_message = f"""
+                INSTRUCTIONS:
+                - Unzip the ZIP file located in {file_path} to the directory '{data_output_upload_extracted_dir_path}.
+                """
+
+                self.background_event_loop.run(
+                    self.workflow_runner.run_workflow(
+                        self.invoice_mgmt_workflow,
+                        input_message,
+                        st.session_state.session_thread_id
+                        if "session_thread_id" in st.session_state
+                        else "dummy_thread_id",
+                    )
+                )
 
             extracted_files = [
                 os.path.join(data_output_upload_extracted_dir_path, f)
@@ -288,7 +381,9 @@ class InvoiceIngestionPage:
 
     def __run_mapping_workflow(self):
         data_output_upload_extracted_dir_path = (
-            self.streamlit_app_settings.data_output_upload_extracted_dir_path
+            st.session_state.uploaded_file
+            if self.streamlit_app_settings.ingestion_stream_zip_members
+            else self.streamlit_app_settings.data_output_upload_extracted_dir_path
         )
         data_output_ingestion_dir_path = (
             self.streamlit_app_settings.data_output_ingestion_dir_path
@@ -299,20 +394,28 @@ class InvoiceIngestionPage:
         )
 
         try:
-            input_message = f"""
-            INSTRUCTIONS:
-            - Map the extracted CSV files located in '{data_output_upload_extracted_dir_path}' to ingestion arguments and save the mapping results to the directory '{data_output_ingestion_dir_path}'. DO NOT perform the database insertion yet.
-            """
-
-            asyncio.run(
-                self.workflow_runner.run_workflow(
-                    self.invoice_mgmt_workflow,
-                    input_message,
-                    st.session_state.session_thread_id
-                    if "session_thread_id" in st.session_state
-                    else "dummy_thread_id",
+            if self.streamlit_app_settings.ingestion_use_direct_pipeline:
+                st.session_state.ingestion_args_list = self.background_event_loop.run(
+                    self.invoice_ingestion_pipeline.map(
+                        source_path=data_output_upload_extracted_dir_path,
+                        zip_sha256=st.session_state.zip_sha256,
+                    )
+                )
+            else:
+                input_message = f"""
+                INSTRUCTIONS:
+                - Map the extracted CSV files located in '{data_output_upload_extracted_dir_path}' to ingestion arguments and save the mapping results to the directory '{data_output_ingestion_dir_path}'. DO NOT perform the database insertion yet.
+                """
+
+                self.background_event_loop.run(
+                    self.workflow_runner.run_workflow(
+                        self.invoice_mgmt_workflow,
+                        input_message,
+                        st.session_state.session_thread_id
+                        if "session_thread_id" in st.session_state
+                        else "dummy_thread_id",
+                    )
                 )
-            )
 
             st.session_state.mapping_complete = True
             st.session_state.decompress_complete = True
@@ -338,20 +441,27 @@ class InvoiceIngestionPage:
         )
 
         try:
-            input_message = f"""
-            INSTRUCTIONS:
-            - Insert records into the database using the mapped ingestion arguments found in the directory '{data_output_ingestion_dir_path}'.
-            """
-
-            asyncio.run(
-                self.workflow_runner.run_workflow(
-                    self.invoice_mgmt_workflow,
-                    input_message,
-                    st.session_state.session_thread_id
-                    if "session_thread_id" in st.session_state
-                    else "dummy_thread_id",
+            if self.streamlit_app_settings.ingestion_use_direct_pipeline:
+                self.background_event_loop.run(
+                    self.invoice_ingestion_pipeline.insert(
+                        ingestion_args_list=st.session_state.ingestion_args_list
+                    )
+                )
+            else:
+                input_message = f"""
+                INSTRUCTIONS:
+                - Insert records into the database using the mapped ingestion arguments found in the directory '{data_output_ingestion_dir_path}'.
+                """
+
+                self.background_event_loop.run(
+                    self.workflow_runner.run_workflow(
+                        self.invoice_mgmt_workflow,
+                        input_message,
+                        st.session_state.session_thread_id
+                        if "session_thread_id" in st.session_state
+                        else "dummy_thread_id",
+                    )
                 )
-            )
 
             st.session_state.inserting_complete = True
             st.session_state.mapping_complete = True
@@ -368,11 +478,15 @@ class InvoiceIngestionPage:
             st.error(message)
 
     @staticmethod
-    def __delete_non_hidden_files(dir_path: str) -> None:
+    def __delete_non_hidden_files(
+        dir_path: str, keep_file_names: AbstractSet[str] = frozenset()
+    ) -> None:
         try:
             for file_name in os.listdir(dir_path):
-                if not file_name.startswith(".") and os.path.isfile(
-                    os.path.join(dir_path, file_name)
+                if (
+                    not file_name.startswith(".")
+                    and file_name not in keep_file_names
+                    and os.path.isfile(os.path.join(dir_path, file_name))
                 ):
                     os.remove(os.path.join(dir_path, file_name))
         except Exception as error:
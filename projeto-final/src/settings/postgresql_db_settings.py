@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -17,3 +19,12 @@ class PostgreSQLDBSettings(BaseSettings):
     host: str = Field(default="localhost")
     port: int = Field(default=5432)
     db: str = Field(default="invoices_db")
+    pool_size: int = Field(default=5)
+    pool_max_overflow: int = Field(default=10)
+    pool_timeout: int = Field(default=30)
+    pool_recycle: int = Field(default=1800)
+    pool_pre_ping: bool = Field(default=True)
+    read_dsn: Optional[str] = Field(default=None)
+    read_pool_size: int = Field(default=5)
+    read_pool_max_overflow: int = Field(default=10)
+    read_replica_wait_timeout: float = Field(default=10)
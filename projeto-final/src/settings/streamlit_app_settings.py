@@ -1,4 +1,5 @@
-from typing import List
+import os
+from typing import List, Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -21,7 +22,27 @@ class StreamlitAppSettings(BaseSettings):
         default="data/output/upload/extracted"
     )
     data_output_ingestion_dir_path: str = Field(default="data/output/ingestion")
+    data_output_query_dir_path: str = Field(default="data/output/query")
     assets_dir_path: str = Field(default="assets")
+    ingestion_load_strategy: Literal["copy", "orm"] = Field(default="copy")
+    ingestion_insert_batch_size: int = Field(default=1000)
+    ingestion_streaming_enabled: bool = Field(default=False)
+    ingestion_chunk_size: int = Field(default=100_000)
+    ingestion_write_debug_csv: bool = Field(default=False)
+    ingestion_max_workers: int = Field(default=os.cpu_count() or 1)
+    ingestion_max_concurrent_loads: int = Field(default=4)
+    ingestion_stream_zip_members: bool = Field(default=False)
+    ingestion_use_direct_pipeline: bool = Field(default=True)
+    plot_max_workers: int = Field(default=4)
+    query_cache_max_entries: int = Field(default=256)
+    query_cache_ttl_seconds: float = Field(default=600)
+    query_cache_max_bytes: int = Field(default=64 * 1024 * 1024)
+    query_max_rows: int = Field(default=100)
+    query_max_chars: int = Field(default=10_000)
+    query_fetch_size: int = Field(default=10_000)
+    query_statement_timeout_ms: int = Field(default=30_000)
+    query_result_file_ttl_seconds: float = Field(default=24 * 60 * 60)
+    query_result_file_max_count: int = Field(default=100)
 
     @staticmethod
     def get_year_list() -> List[int]: